@@ -0,0 +1,475 @@
+"""
+Card Database - One shared, indexed copy of the MarvelCDB card database.
+The full /api/public/cards/ payload is several MB, so it is downloaded once per
+process, kept as a gzip snapshot on disk and revalidated with a conditional
+request (If-None-Match / If-Modified-Since) once the revalidation interval has
+passed. An unchanged database costs a 304 and no re-parse; a stale copy keeps
+being served while the check runs in the background.
+
+Every page shares the same CardDatabase through st.cache_resource. It behaves
+like the old {code: card} dict and adds indexes by card_set_code, pack_code,
+type_code and lower-cased name, plus hero lookups (identity card by hero or
+alter-ego name, signature cards by identity code) so the card viewer never has
+to scan the whole database. Cards are shared between sessions and must be
+treated as read-only.
+
+Hero obligation and nemesis cards are not in the bulk payload, only in the
+per-pack endpoint. Once the database is loaded, every hero pack is fetched
+in one background batch (a thread pool over a pooled session) and stored in
+a second snapshot next to the first, so those lookups are memory reads too.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import streamlit as st
+
+
+CARDS_URL = "https://marvelcdb.com/api/public/cards/"
+HTTP_TIMEOUT = 30
+CARD_DB_DIR = os.path.join(".cache", "marvelcdb")
+SNAPSHOT_PATH = os.path.join(CARD_DB_DIR, "cards.json.gz")
+SNAPSHOT_META_PATH = os.path.join(CARD_DB_DIR, "cards.meta.json")
+REVALIDATE_INTERVAL = 3600  # seconds between conditional requests
+
+PACK_CARDS_URL = "https://marvelcdb.com/api/public/cards/{pack_code}"
+PACK_SNAPSHOT_PATH = os.path.join(CARD_DB_DIR, "hero_packs.json.gz")
+PACK_REFRESH_INTERVAL = 7 * 24 * 3600  # encounter cards almost never change
+PACK_RETRY_INTERVAL = 600  # before retrying a pack whose download failed
+PREFETCH_WORKERS = 8
+
+
+def normalize_name(name):
+    """Case- and whitespace-insensitive key for card and hero names."""
+    return " ".join((name or "").lower().split())
+
+
+def alter_ego_code(hero_code):
+    """Code of the alter-ego side of a hero identity ("01001a" -> "01001b"), or ""."""
+    return hero_code[:-1] + "b" if hero_code.endswith("a") else ""
+
+
+def _revalidate_interval():
+    try:
+        return int(st.secrets["marvelcdb"]["revalidate_seconds"])
+    except (KeyError, FileNotFoundError, TypeError, ValueError):
+        return REVALIDATE_INTERVAL
+
+
+class CardDatabase(Mapping):
+    """Read-only {code: card} mapping with secondary indexes."""
+
+    def __init__(self, cards, etag="", last_modified="", fetched_at=0.0):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self._by_code = {}
+        self.by_set = {}
+        self.by_pack = {}
+        self.by_type = {}
+        self.by_name = {}
+        for card in cards:
+            code = card.get("code")
+            if not code:
+                continue
+            self._by_code[code] = card
+            for index, key in (
+                (self.by_set, card.get("card_set_code")),
+                (self.by_pack, card.get("pack_code")),
+                (self.by_type, card.get("type_code")),
+                (self.by_name, card.get("name", "").lower()),
+            ):
+                if key:
+                    index.setdefault(key, []).append(card)
+        for index in (self.by_set, self.by_pack, self.by_type, self.by_name):
+            for key, group in index.items():
+                group.sort(key=lambda c: c["code"])
+                index[key] = tuple(group)
+        self._build_hero_index()
+
+    def _build_hero_index(self):
+        """Index hero identities by hero and alter-ego name, and their signature cards."""
+        self._heroes_by_name = {}
+        self._heroes_by_alter_ego = {}
+        self._signature_cards = {}
+        self._hero_lookups = {}
+        for hero in self.cards_of_type("hero"):
+            code = hero["code"]
+            self._heroes_by_name.setdefault(normalize_name(hero.get("name")), []).append(code)
+            alter = self._by_code.get(alter_ego_code(code))
+            if alter:
+                self._heroes_by_alter_ego.setdefault(normalize_name(alter.get("name")), set()).add(code)
+            skip = {code, alter_ego_code(code)}
+            self._signature_cards[code] = tuple(
+                c for c in self.cards_in_set(hero.get("card_set_code", "")) if c["code"] not in skip
+            )
+
+    def __getitem__(self, code):
+        return self._by_code[code]
+
+    def __iter__(self):
+        return iter(self._by_code)
+
+    def __len__(self):
+        return len(self._by_code)
+
+    def cards_in_set(self, set_code):
+        """Cards with this card_set_code, sorted by code."""
+        return self.by_set.get(set_code, ())
+
+    def cards_in_pack(self, pack_code):
+        """Cards (in the bulk payload) from this pack, sorted by code."""
+        return self.by_pack.get(pack_code, ())
+
+    def cards_of_type(self, type_code):
+        """Cards of this type_code (e.g. "hero", "alter_ego"), sorted by code."""
+        return self.by_type.get(type_code, ())
+
+    def cards_named(self, name):
+        """Cards whose name matches case-insensitively, sorted by code."""
+        return self.by_name.get(name.lower(), ())
+
+    def find_hero(self, hero_name, alter_ego_hint=""):
+        """
+        Identity ("hero" type) card for a hero name, or None.
+        Falls back to a substring match over hero names only, and uses
+        alter_ego_hint to pick between heroes that share a name. Results are
+        memoized per (name, hint).
+        """
+        key = (normalize_name(hero_name), normalize_name(alter_ego_hint))
+        if key in self._hero_lookups:
+            return self._hero_lookups[key]
+        name, hint = key
+        codes = self._heroes_by_name.get(name)
+        if not codes and name:
+            codes = [
+                code for hero, hero_codes in self._heroes_by_name.items()
+                if name in hero for code in hero_codes
+            ]
+            codes.sort()
+        hero_code = None
+        if codes:
+            hero_code = codes[0]
+            if len(codes) > 1 and hint:
+                hinted = self._heroes_by_alter_ego.get(hint, set())
+                hero_code = next((c for c in codes if c in hinted), hero_code)
+        hero_card = self._by_code.get(hero_code) if hero_code else None
+        self._hero_lookups[key] = hero_card
+        return hero_card
+
+    def hero_packs(self):
+        """{pack_code: card_set_codes} of every pack that contains a hero identity."""
+        packs = {}
+        for hero in self.cards_of_type("hero"):
+            if hero.get("pack_code") and hero.get("card_set_code"):
+                packs.setdefault(hero["pack_code"], set()).add(hero["card_set_code"])
+        return packs
+
+    def signature_cards(self, hero_code):
+        """Cards in the hero's card_set_code other than its identity and alter-ego, sorted by code."""
+        return self._signature_cards.get(hero_code, ())
+
+
+# ─── Disk snapshot ───
+
+def _read_snapshot():
+    """Return the CardDatabase stored on disk, or None if there is no usable snapshot."""
+    try:
+        with gzip.open(SNAPSHOT_PATH, "rt", encoding="utf-8") as f:
+            cards = json.load(f)
+        meta = {}
+        if os.path.exists(SNAPSHOT_META_PATH):
+            with open(SNAPSHOT_META_PATH, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return CardDatabase(
+        cards,
+        etag=meta.get("etag", ""),
+        last_modified=meta.get("last_modified", ""),
+        fetched_at=meta.get("fetched_at", 0.0),
+    )
+
+
+def _write_snapshot(raw_json, db):
+    """Persist the raw payload and its validators. Best-effort."""
+    try:
+        os.makedirs(CARD_DB_DIR, exist_ok=True)
+        with gzip.open(SNAPSHOT_PATH + ".tmp", "wb", compresslevel=6) as f:
+            f.write(raw_json)
+        os.replace(SNAPSHOT_PATH + ".tmp", SNAPSHOT_PATH)
+        _write_meta(db)
+    except OSError:
+        pass
+
+
+def _write_meta(db):
+    try:
+        os.makedirs(CARD_DB_DIR, exist_ok=True)
+        with open(SNAPSHOT_META_PATH + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {"etag": db.etag, "last_modified": db.last_modified, "fetched_at": db.fetched_at},
+                f,
+            )
+        os.replace(SNAPSHOT_META_PATH + ".tmp", SNAPSHOT_META_PATH)
+    except OSError:
+        pass
+
+
+def _read_pack_snapshot():
+    """Return (fetched_at, {pack_code: [cards]}) from disk, or (0.0, {})."""
+    try:
+        with gzip.open(PACK_SNAPSHOT_PATH, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("fetched_at", 0.0), data.get("packs", {})
+    except (OSError, ValueError, AttributeError):
+        return 0.0, {}
+
+
+def _write_pack_snapshot(fetched_at, packs):
+    try:
+        os.makedirs(CARD_DB_DIR, exist_ok=True)
+        with gzip.open(PACK_SNAPSHOT_PATH + ".tmp", "wt", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "packs": packs}, f, separators=(",", ":"))
+        os.replace(PACK_SNAPSHOT_PATH + ".tmp", PACK_SNAPSHOT_PATH)
+    except OSError:
+        pass
+
+
+def _group_by_set(cards):
+    """{card_set_code: tuple of cards sorted by code}."""
+    by_set = {}
+    for card in sorted(cards, key=lambda c: c.get("code", "")):
+        by_set.setdefault(card.get("card_set_code", ""), []).append(card)
+    return {set_code: tuple(group) for set_code, group in by_set.items()}
+
+
+# ─── Network ───
+
+def _fetch(current=None):
+    """
+    Download the card list, conditionally if current has validators.
+    Returns a new CardDatabase, or current (with a fresh fetched_at) on 304.
+    """
+    headers = {}
+    if current is not None and current.etag:
+        headers["If-None-Match"] = current.etag
+    if current is not None and current.last_modified:
+        headers["If-Modified-Since"] = current.last_modified
+    resp = requests.get(CARDS_URL, headers=headers, timeout=HTTP_TIMEOUT)
+    if resp.status_code == 304 and current is not None:
+        current.fetched_at = time.time()
+        _write_meta(current)
+        return current
+    resp.raise_for_status()
+    db = CardDatabase(
+        resp.json(),
+        etag=resp.headers.get("ETag", ""),
+        last_modified=resp.headers.get("Last-Modified", ""),
+        fetched_at=time.time(),
+    )
+    _write_snapshot(resp.content, db)
+    return db
+
+
+def _pooled_session(pool_size):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch_hero_packs(hero_packs, on_pack=None):
+    """
+    Download the encounter cards of each pack in hero_packs ({pack_code:
+    hero card_set_codes}) concurrently over one pooled session.
+    Keeps each hero set's encounter cards and its "<set>_nemesis" set.
+    on_pack(pack_code, cards) is called as each pack arrives.
+    Returns ({pack_code: [cards]}, [pack codes that failed]).
+    """
+    session = _pooled_session(PREFETCH_WORKERS)
+
+    def fetch(pack_code):
+        resp = session.get(PACK_CARDS_URL.format(pack_code=pack_code), timeout=HTTP_TIMEOUT)
+        resp.raise_for_status()
+        hero_sets = set(hero_packs[pack_code])
+        nemesis_sets = {f"{set_code}_nemesis" for set_code in hero_sets}
+        return [
+            c for c in resp.json()
+            if c.get("card_set_code") in nemesis_sets
+            or (c.get("card_set_code") in hero_sets and c.get("faction_code") == "encounter")
+        ]
+
+    packs, failed = {}, []
+    with session, ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="card-pack") as pool:
+        futures = {pool.submit(fetch, pack_code): pack_code for pack_code in sorted(hero_packs)}
+        for future in as_completed(futures):
+            pack_code = futures[future]
+            try:
+                packs[pack_code] = future.result()
+            except (requests.RequestException, ValueError):
+                failed.append(pack_code)
+                continue
+            if on_pack is not None:
+                on_pack(pack_code, packs[pack_code])
+    return packs, failed
+
+
+class _CardDatabaseStore:
+    """
+    Holds the current CardDatabase and the hero-pack encounter cards, and
+    refreshes each at most once at a time in the background.
+    """
+
+    def __init__(self):
+        self._db = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._packs = None  # {pack_code: {card_set_code: (cards, ...)}}
+        self._packs_raw = {}
+        self._packs_fetched_at = 0.0
+        self._pack_failures = {}  # pack_code -> time of the failed attempt
+        self._prefetching = False
+        self._pending_packs = set()  # pack codes the running prefetch has yet to deliver
+        self._pack_arrived = threading.Condition(self._lock)
+
+    def _is_stale(self, db):
+        return time.time() - db.fetched_at >= _revalidate_interval()
+
+    def _refresh_in_background(self):
+        try:
+            db = _fetch(self._db)
+        except (requests.RequestException, ValueError):
+            db = None  # Keep serving the copy we have; retry on a later call
+        with self._lock:
+            if db is not None:
+                self._db = db
+            self._refreshing = False
+            self._start_pack_prefetch()
+
+    def _start_pack_prefetch(self):
+        """Fetch missing, failed-long-enough-ago or expired hero packs. Caller holds the lock."""
+        if self._db is None or self._prefetching:
+            return
+        if self._packs is None:
+            self._packs_fetched_at, self._packs_raw = _read_pack_snapshot()
+            self._packs = {code: _group_by_set(cards) for code, cards in self._packs_raw.items()}
+        now = time.time()
+        hero_packs = self._db.hero_packs()
+        full_refresh = now - self._packs_fetched_at >= PACK_REFRESH_INTERVAL
+        if full_refresh:
+            wanted = set(hero_packs)
+        else:
+            wanted = set(hero_packs) - set(self._packs)
+        wanted = {
+            code for code in wanted
+            if now - self._pack_failures.get(code, 0.0) >= PACK_RETRY_INTERVAL
+        }
+        if not wanted:
+            return
+        self._prefetching = True
+        self._pending_packs = set(wanted)
+        threading.Thread(
+            target=self._prefetch_in_background,
+            args=({code: hero_packs[code] for code in wanted}, full_refresh),
+            name="card-pack-prefetch",
+            daemon=True,
+        ).start()
+
+    def _pack_fetched(self, pack_code, cards):
+        """Serve one prefetched pack right away and wake anyone waiting for it."""
+        grouped = _group_by_set(cards)
+        with self._lock:
+            self._packs = {**self._packs, pack_code: grouped}
+            self._pending_packs.discard(pack_code)
+            self._pack_arrived.notify_all()
+
+    def _prefetch_in_background(self, hero_packs, full_refresh):
+        try:
+            packs, failed = _fetch_hero_packs(hero_packs, on_pack=self._pack_fetched)
+        except Exception:
+            packs, failed = {}, list(hero_packs)
+        with self._lock:
+            now = time.time()
+            for code in failed:
+                self._pack_failures[code] = now
+            if full_refresh:
+                self._packs_fetched_at = now
+            if packs:
+                self._packs_raw = {**self._packs_raw, **packs}
+                _write_pack_snapshot(self._packs_fetched_at, self._packs_raw)
+            self._prefetching = False
+            self._pending_packs = set()
+            self._pack_arrived.notify_all()
+
+    def get(self):
+        with self._lock:
+            if self._db is None:
+                self._db = _read_snapshot()
+            if self._db is None:
+                # Nothing to serve yet: this first download has to block
+                self._db = _fetch()
+            elif self._is_stale(self._db) and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(
+                    target=self._refresh_in_background, name="card-db-refresh", daemon=True
+                ).start()
+            self._start_pack_prefetch()
+            return self._db
+
+    def encounter_cards(self, pack_code, set_code, wait=0.0):
+        """
+        Prefetched cards of set_code in pack_code, or None if the pack isn't
+        loaded yet. If the running prefetch is fetching the pack, waits up to
+        wait seconds for it.
+        """
+        deadline = time.monotonic() + wait
+        with self._lock:
+            while self._packs is None or pack_code not in self._packs:
+                remaining = deadline - time.monotonic()
+                if pack_code not in self._pending_packs or remaining <= 0:
+                    break
+                self._pack_arrived.wait(remaining)
+            pack = self._packs.get(pack_code) if self._packs is not None else None
+        if pack is None:
+            return None
+        return pack.get(set_code, ())
+
+
+@st.cache_resource(show_spinner=False)
+def _get_store():
+    return _CardDatabaseStore()
+
+
+def get_card_database():
+    """
+    Return the shared CardDatabase.
+    Raises requests.RequestException only if there is no snapshot yet and the
+    download fails.
+    """
+    store = _get_store()
+    if store._db is None:
+        with st.spinner("Loading card database…"):
+            return store.get()
+    return store.get()
+
+
+def get_encounter_cards(pack_code, set_code, wait=0.0):
+    """
+    Encounter cards of set_code from a hero pack, sorted by code, from the
+    background prefetch. Returns None if the pack has not been fetched yet;
+    never starts a download itself, but waits up to wait seconds for the
+    prefetch to deliver the pack if it is on its way.
+    """
+    store = _get_store()
+    if store._db is None:
+        return None
+    return store.encounter_cards(pack_code, set_code, wait=wait)
@@ -0,0 +1,114 @@
+"""
+Community Aggregates - Running per-subject score totals for community tier lists.
+Each submission bucket (tier-list type x player count) keeps, next to its
+submissions list, an aggregate of
+
+    {"submissions": <number folded in>,
+     "subjects": {subject: [count, sum, sum_of_squares]}}
+
+that is updated once when a submission is saved. Rendering the community list
+then reads one average per subject instead of re-scoring every submission.
+Aggregates missing from older data files are rebuilt from the submissions.
+"""
+
+import math
+
+from components.scoring import TIERS
+
+TIER_POINTS = {"S": 6, "A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
+
+# Lower bound of each community tier in std devs from the mean, S to D (F is the rest)
+COMMUNITY_TIER_STD_BOUNDS = [1.0, 0.3, -0.3, -1.0, -1.5]
+
+
+def interpolate_scores(submission):
+    """Given a submission {tier: [ordered heroes]}, return {hero: float score}.
+
+    Within each tier the top hero gets tier_base + 0.4 and the bottom gets
+    tier_base - 0.4, linearly interpolated. A single hero in a tier gets the
+    base value exactly.
+    """
+    hero_scores = {}
+    for tier in TIERS:
+        heroes = submission.get(tier, [])
+        base = TIER_POINTS[tier]
+        n = len(heroes)
+        for i, hero in enumerate(heroes):
+            if n == 1:
+                hero_scores[hero] = float(base)
+            else:
+                # i=0 is the best in the tier, i=n-1 is the worst
+                hero_scores[hero] = base + 0.4 - 0.8 * (i / (n - 1))
+    return hero_scores
+
+
+def submission_scores(submission):
+    """{subject: score} for a submission in either the {tier: [subjects]} or legacy {subject: tier} format."""
+    if isinstance(submission, dict) and any(isinstance(v, list) for v in submission.values()):
+        return interpolate_scores(submission)
+    scores = {}
+    for subj, tier in submission.items():
+        if tier in TIER_POINTS:
+            scores[subj] = float(TIER_POINTS[tier])
+    return scores
+
+
+def empty_aggregate():
+    return {"submissions": 0, "subjects": {}}
+
+
+def add_submission(aggregate, submission):
+    """Fold one submission into aggregate in place and return it."""
+    subjects = aggregate.setdefault("subjects", {})
+    for subj, score in submission_scores(submission).items():
+        totals = subjects.setdefault(subj, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += score
+        totals[2] += score * score
+    aggregate["submissions"] = aggregate.get("submissions", 0) + 1
+    return aggregate
+
+
+def build_aggregate(submissions):
+    """Aggregate a whole submissions list from scratch."""
+    aggregate = empty_aggregate()
+    for submission in submissions:
+        add_submission(aggregate, submission)
+    return aggregate
+
+
+def subject_averages(aggregate, subjects=None):
+    """{subject: mean score} for rated subjects, optionally restricted to subjects."""
+    totals = aggregate.get("subjects", {})
+    if subjects is not None:
+        totals = {s: totals[s] for s in subjects if s in totals}
+    return {s: t[1] / t[0] for s, t in totals.items() if t[0]}
+
+
+def subject_std(aggregate, subject):
+    """Population std of a subject's scores, from the running sums (0.0 if unrated)."""
+    count, total, total_sq = aggregate.get("subjects", {}).get(subject, (0, 0.0, 0.0))
+    if not count:
+        return 0.0
+    mean = total / count
+    return math.sqrt(max(total_sq / count - mean * mean, 0.0))
+
+
+def community_tiers(subject_avg):
+    """
+    Split {subject: average} into {tier: [(subject, average), ...]} by standard
+    deviations from the mean average, each tier sorted best first.
+    """
+    tiers = {t: [] for t in TIERS}
+    if not subject_avg:
+        return tiers
+    n = len(subject_avg)
+    mean = sum(subject_avg.values()) / n
+    std = max(math.sqrt(sum((v - mean) ** 2 for v in subject_avg.values()) / n), 1e-6)
+    thresholds = [mean + b * std for b in COMMUNITY_TIER_STD_BOUNDS]
+    for subj, avg in subject_avg.items():
+        tier = next((t for t, lo in zip(TIERS, thresholds) if avg >= lo), TIERS[-1])
+        tiers[tier].append((subj, avg))
+    for tier in TIERS:
+        tiers[tier].sort(key=lambda x: x[1], reverse=True)
+    return tiers
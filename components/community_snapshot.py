@@ -0,0 +1,97 @@
+"""
+Community Snapshot - Process-wide, versioned community aggregates.
+Instead of every session loading and merging its own copy of the community
+data on each render, all sessions share one immutable snapshot per
+(tier-list type, player count). Snapshots carry the store's version number,
+which is bumped whenever the submission writer lands a batch (or a
+revalidation finds that another process changed the data), so a snapshot is
+only rebuilt when its version is out of date or it has not been checked
+against storage for SNAPSHOT_REVALIDATE_SECONDS.
+
+Snapshot aggregates are read-only mappings; callers that need to add to one
+copy it first with merge_aggregates([aggregate]).
+"""
+
+import threading
+import time
+from types import MappingProxyType
+
+import streamlit as st
+from components.submission_store import load_community_aggregate
+
+SNAPSHOT_REVALIDATE_SECONDS = 30
+
+
+def _freeze(aggregate):
+    return MappingProxyType({
+        "submissions": aggregate.get("submissions", 0),
+        "subjects": MappingProxyType(
+            {subj: tuple(totals) for subj, totals in aggregate.get("subjects", {}).items()}
+        ),
+    })
+
+
+class CommunitySnapshot:
+    """One immutable aggregate and the store version it was built at."""
+
+    __slots__ = ("version", "tl_type", "player_count", "aggregate")
+
+    def __init__(self, version, tl_type, player_count, aggregate):
+        self.version = version
+        self.tl_type = tl_type
+        self.player_count = player_count
+        self.aggregate = aggregate
+
+
+class CommunitySnapshotStore:
+    """Thread-safe map of (tl_type, player_count) -> latest CommunitySnapshot."""
+
+    def __init__(self, revalidate_seconds=SNAPSHOT_REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self.version = 0
+        self._snapshots = {}  # key -> (snapshot, monotonic time last checked)
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Mark every snapshot out of date (called after a write lands)."""
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    def get(self, tl_type, player_count="Any"):
+        key = (tl_type, player_count)
+        with self._lock:
+            entry = self._snapshots.get(key)
+            version = self.version
+            if entry and entry[0].version == version and time.monotonic() - entry[1] < self.revalidate_seconds:
+                return entry[0]
+
+        aggregate = _freeze(load_community_aggregate(tl_type, player_count))
+
+        with self._lock:
+            if self.version != version:
+                # A write landed while loading: serve this read, but don't keep it
+                return CommunitySnapshot(version, tl_type, player_count, aggregate)
+            current = self._snapshots.get(key)
+            if current and current[0].version == version and current[0].aggregate == aggregate:
+                snapshot = current[0]  # Unchanged: keep sharing the same object
+            else:
+                if current and current[0].version == version:
+                    self.version += 1  # Changed by another process
+                snapshot = CommunitySnapshot(self.version, tl_type, player_count, aggregate)
+            self._snapshots[key] = (snapshot, time.monotonic())
+            return snapshot
+
+
+@st.cache_resource(show_spinner=False)
+def get_community_snapshot_store():
+    """The process-wide CommunitySnapshotStore."""
+    return CommunitySnapshotStore()
+
+
+def get_community_snapshot(tl_type, player_count="Any"):
+    """
+    The shared snapshot for a tier-list type and player count. Sessions get
+    the same object back until the version changes.
+    """
+    return get_community_snapshot_store().get(tl_type, player_count)
@@ -11,11 +11,19 @@ Required Streamlit secrets (only for cloud deployment):
     repo  = "alechoward-lab/beta-LT-v3"       # owner/repo
     path  = "beta-LT-v3/community_tier_lists.json"   # path inside repo
     branch = "main"
+    cache_seconds = 30                                # optional, see below
+
+Reads go through a process-wide cache shared by every session: the parsed
+data and its sha are kept in memory and revalidated with If-None-Match at
+most once every cache_seconds (a 304 costs no rate limit and no re-parse).
+The cached object is shared, so callers must copy it before mutating.
 """
 
 import json
 import os
 import base64
+import threading
+import time
 import streamlit as st
 
 try:
@@ -33,17 +41,38 @@ def _github_cfg():
         return None
 
 
-def _gh_read(token, repo, path, branch):
-    """Fetch a file from GitHub and return (content_str, sha)."""
+DEFAULT_CACHE_SECONDS = 30
+
+
+def _cache_seconds():
+    """How long a cached read is served before it is revalidated."""
+    try:
+        return float(st.secrets["github"]["cache_seconds"])
+    except (KeyError, FileNotFoundError, TypeError, ValueError):
+        return DEFAULT_CACHE_SECONDS
+
+
+_NOT_MODIFIED = object()
+
+
+def _gh_read(token, repo, path, branch, etag=None):
+    """
+    Fetch a file from GitHub and return (content_str, sha, etag).
+    With etag, returns _NOT_MODIFIED if the file is unchanged.
+    """
     url = f"https://api.github.com/repos/{repo}/contents/{path}"
     headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json"}
+    if etag:
+        headers["If-None-Match"] = etag
     r = _requests.get(url, headers=headers, params={"ref": branch}, timeout=15)
+    if r.status_code == 304:
+        return _NOT_MODIFIED
     if r.status_code == 404:
-        return None, None
+        return None, None, None
     r.raise_for_status()
     data = r.json()
     content = base64.b64decode(data["content"]).decode("utf-8")
-    return content, data["sha"]
+    return content, data["sha"], r.headers.get("ETag")
 
 
 def _gh_write(token, repo, path, branch, content_str, sha=None):
@@ -59,38 +88,99 @@ def _gh_write(token, repo, path, branch, content_str, sha=None):
         body["sha"] = sha
     r = _requests.put(url, headers=headers, json=body, timeout=15)
     r.raise_for_status()
+    try:
+        return r.json()["content"]["sha"]
+    except (ValueError, KeyError, TypeError):
+        return None
 
 
-# ── Public API ──
+# ── Read cache ──
+
+class _JsonCache:
+    """Process-wide {key: (value, sha, etag, checked_at)} of parsed data files."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, data, sha, etag=None):
+        with self._lock:
+            self._entries[key] = (data, sha, etag, time.monotonic())
+
+    def touch(self, key):
+        """Mark an entry as just revalidated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries[key] = entry[:3] + (time.monotonic(),)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_json_cache():
+    return _JsonCache()
+
+
+def _repo_path(cfg_path, local_path):
+    """Repo path for a data file other than the configured one: local_path next to it."""
+    base = os.path.dirname(cfg_path)
+    return "/".join(p for p in (base, local_path.replace(os.sep, "/")) if p)
 
-def load_json(local_path, default=None):
-    """Load JSON data — from GitHub if secrets are configured, else local file."""
-    if default is None:
-        default = {}
+
+_PARSERS = {"json": json.loads, "text": str}
+
+
+def _read(local_path, kind, default, revalidate, repo_path=None):
+    """Cached read shared by load_json and load_text. Returns (value, sha)."""
+    parse = _PARSERS[kind]
+    cache = _get_json_cache()
 
     cfg = _github_cfg()
     if cfg and _requests:
         token, repo, path, branch = cfg
+        path = repo_path or path
+        key = ("github", kind, repo, path, branch)
+        cached = cache.get(key)
+        if cached and not revalidate and time.monotonic() - cached[3] < _cache_seconds():
+            return cached[0], cached[1]
         try:
-            content, sha = _gh_read(token, repo, path, branch)
+            result = _gh_read(token, repo, path, branch, etag=cached[2] if cached else None)
+            if result is _NOT_MODIFIED:
+                cache.touch(key)
+                return cached[0], cached[1]
+            content, sha, etag = result
             if content is None:
+                cache.put(key, default, None)  # Missing file; re-checked after the interval
                 return default, None
-            return json.loads(content), sha
+            value = parse(content)
+            cache.put(key, value, sha, etag)
+            return value, sha
         except Exception as e:
             st.warning(f"Could not load from GitHub: {e}")
+            if cached:
+                return cached[0], cached[1]
             return default, None
 
-    # Local fallback
+    # Local fallback (re-parsed only when the file changes; mtime stands in for the ETag)
     if os.path.exists(local_path):
+        key = ("local", kind, os.path.abspath(local_path))
+        mtime = os.stat(local_path).st_mtime_ns
+        cached = cache.get(key)
+        if cached and cached[2] == mtime:
+            return cached[0], None
         with open(local_path, "r") as f:
-            return json.load(f), None
+            value = parse(f.read())
+        cache.put(key, value, None, mtime)
+        return value, None
     return default, None
 
 
-def save_json(data, local_path, sha=None):
-    """Save JSON data and return (ok, error_message, retryable)."""
-    MAX_SIZE = 5 * 1024 * 1024  # 5 MB guard
-    content_str = json.dumps(data)
+def _write(content_str, local_path, kind, sha=None, repo_path=None):
+    """Write shared by save_json and save_text. Returns (ok, error_message, retryable)."""
+    MAX_SIZE = 5 * 1024 * 1024  # 5 MB guard (per file)
     if len(content_str) > MAX_SIZE:
         return False, "Data too large to save.", False
 
@@ -100,8 +190,12 @@ def save_json(data, local_path, sha=None):
             return False, "Could not save to GitHub: requests is not installed.", False
 
         token, repo, path, branch = cfg
+        path = repo_path or path
         try:
-            _gh_write(token, repo, path, branch, content_str, sha=sha)
+            new_sha = _gh_write(token, repo, path, branch, content_str, sha=sha)
+            if new_sha:
+                # Serve what we just wrote; the next revalidation fetches its ETag
+                _get_json_cache().put(("github", kind, repo, path, branch), _PARSERS[kind](content_str), new_sha)
             return True, None, False
         except Exception as e:
             response = getattr(e, "response", None)
@@ -118,8 +212,50 @@ def save_json(data, local_path, sha=None):
 
     # Local fallback
     try:
+        if os.path.dirname(local_path):
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
         with open(local_path, "w") as f:
-            json.dump(data, f)
+            f.write(content_str)
         return True, None, False
     except Exception as e:
         return False, f"Could not save locally: {e}", False
+
+
+# ── Public API ──
+
+def load_json(local_path, default=None, revalidate=False):
+    """
+    Load JSON data — from GitHub if secrets are configured, else local file.
+    Returns (data, sha). data is shared between sessions: copy before mutating.
+    revalidate=True skips the cache interval (still a cheap conditional request),
+    e.g. to get the latest sha before a write.
+    """
+    if default is None:
+        default = {}
+    return _read(local_path, "json", default, revalidate)
+
+
+def save_json(data, local_path, sha=None):
+    """Save JSON data and return (ok, error_message, retryable)."""
+    return _write(json.dumps(data), local_path, "json", sha=sha)
+
+
+def load_text(local_path, revalidate=False):
+    """
+    Load any data file by its path relative to the configured data file's
+    folder (on GitHub) or the working directory (locally).
+    Returns (text or None if missing, sha). Cached like load_json.
+    """
+    cfg = _github_cfg()
+    repo_path = _repo_path(cfg[2], local_path) if cfg else None
+    return _read(local_path, "text", None, revalidate, repo_path=repo_path)
+
+
+def save_text(content_str, local_path, sha=None):
+    """
+    Create (sha=None) or update a data file addressed like load_text.
+    Returns (ok, error_message, retryable).
+    """
+    cfg = _github_cfg()
+    repo_path = _repo_path(cfg[2], local_path) if cfg else None
+    return _write(content_str, local_path, "text", sha=sha, repo_path=repo_path)
@@ -6,39 +6,30 @@ Uses card_set_code to correctly group each hero's signature cards.
 
 import re
 import streamlit as st
-import requests
 from html import escape as html_escape
+from components.card_database import get_card_database, get_encounter_cards, alter_ego_code
 
 
-# ─── API helpers (cached) ───
+# Seconds a viewer waits for its hero's pack when the background prefetch is still fetching it
+ENCOUNTER_WAIT = 3.0
+# get_obligation_nemesis result while the hero's encounter pack is not loaded yet
+ENCOUNTER_LOADING = (None, None)
+ENCOUNTER_LOADING_TEXT = "⏳ Obligation and nemesis cards are still loading from MarvelCDB. Check back in a moment."
 
-@st.cache_data(ttl=3600, show_spinner="Loading card database…")
-def _fetch_all_cards():
-    """Fetch every card from MarvelCDB, indexed by code."""
-    resp = requests.get("https://marvelcdb.com/api/public/cards/", timeout=30)
-    resp.raise_for_status()
-    return {card["code"]: card for card in resp.json()}
 
+# ─── API helpers (cached) ───
 
 def _card_image_url(card):
     src = card.get("imagesrc", "")
     return f"https://marvelcdb.com{src}" if src else ""
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_pack_cards(pack_code):
-    """Fetch all cards from a specific pack (includes encounter cards)."""
-    resp = requests.get(
-        f"https://marvelcdb.com/api/public/cards/{pack_code}", timeout=30
-    )
-    resp.raise_for_status()
-    return {card["code"]: card for card in resp.json()}
-
-
-def get_obligation_nemesis(hero_code, card_db):
+def get_obligation_nemesis(hero_code, card_db, wait=ENCOUNTER_WAIT):
     """Return (obligation_cards, nemesis_cards) for a hero.
 
-    Fetches the hero's pack to find encounter cards not in the bulk API.
+    Encounter cards are not in the bulk API; they come from the background
+    hero-pack prefetch. If the hero's pack is still on its way this waits up
+    to *wait* seconds for it (behind a spinner), then returns ENCOUNTER_LOADING.
     """
     hero_card = card_db.get(hero_code)
     if not hero_card:
@@ -47,22 +38,14 @@ def get_obligation_nemesis(hero_code, card_db):
     set_code = hero_card.get("card_set_code", "")
     if not pack_code or not set_code:
         return [], []
-    try:
-        pack_db = fetch_pack_cards(pack_code)
-    except Exception:
-        return [], []
-    obligation = sorted(
-        [c for c in pack_db.values()
-         if c.get("card_set_code") == set_code
-         and c.get("faction_code") == "encounter"],
-        key=lambda c: c.get("code", ""),
-    )
-    nemesis = sorted(
-        [c for c in pack_db.values()
-         if c.get("card_set_code") == f"{set_code}_nemesis"],
-        key=lambda c: c.get("code", ""),
-    )
-    return obligation, nemesis
+    obligation = get_encounter_cards(pack_code, set_code)
+    if obligation is None and wait > 0:
+        with st.spinner("Loading obligation and nemesis cards…"):
+            obligation = get_encounter_cards(pack_code, set_code, wait=wait)
+    if obligation is None:
+        return ENCOUNTER_LOADING
+    nemesis = get_encounter_cards(pack_code, f"{set_code}_nemesis")
+    return list(obligation), list(nemesis or ())
 
 
 def _find_hero_cards(hero_name, card_db, alter_ego_hint=""):
@@ -74,50 +57,14 @@ def _find_hero_cards(hero_name, card_db, alter_ego_hint=""):
     """
     base_name = re.sub(r"\s*\(.*?\)\s*", "", hero_name).strip()
 
-    # Collect all hero-identity cards whose name matches
-    candidates = [
-        c for c in card_db.values()
-        if c.get("type_code") == "hero"
-        and c.get("name", "").lower() == base_name.lower()
-    ]
-    if not candidates:
-        candidates = [
-            c for c in card_db.values()
-            if c.get("type_code") == "hero"
-            and base_name.lower() in c.get("name", "").lower()
-        ]
-    if not candidates:
+    hero_card = card_db.find_hero(base_name, alter_ego_hint)
+    if not hero_card:
         return None, None, []
 
-    # Disambiguate with alter-ego name when there are duplicates
-    hero_card = candidates[0]
-    if len(candidates) > 1 and alter_ego_hint:
-        for c in candidates:
-            alter_code = c["code"][:-1] + "b" if c["code"].endswith("a") else ""
-            ac = card_db.get(alter_code)
-            if ac and ac.get("name", "").lower() == alter_ego_hint.lower():
-                hero_card = c
-                break
-
     hero_code = hero_card["code"]
-    set_code = hero_card.get("card_set_code", "")
-
-    # Alter-ego is the "b" variant
-    alter_code = hero_code[:-1] + "b" if hero_code.endswith("a") else ""
+    alter_code = alter_ego_code(hero_code)
     alter_card = card_db.get(alter_code) if alter_code else None
-
-    # Signature cards: same card_set_code, excluding identity / alter-ego
-    skip = {hero_code, alter_code}
-    sig_cards = sorted(
-        [
-            c for c in card_db.values()
-            if c.get("card_set_code") == set_code
-            and c["code"] not in skip
-        ],
-        key=lambda c: c.get("code", ""),
-    )
-
-    return hero_card, alter_card, sig_cards
+    return hero_card, alter_card, list(card_db.signature_cards(hero_code))
 
 
 # ─── Dialog popup ───
@@ -152,7 +99,7 @@ def _render_card_grid(cards, cols_per_row=4, show_qty=True):
 def _hero_cards_dialog(hero_name, alter_ego_hint=""):
     """Render a dialog showing the hero's MarvelCDB cards."""
     try:
-        card_db = _fetch_all_cards()
+        card_db = get_card_database()
     except Exception as e:
         st.error(f"Could not load card database: {e}")
         return
@@ -207,7 +154,10 @@ def _hero_cards_dialog(hero_name, alter_ego_hint=""):
 
     # Obligation & Nemesis
     obligation, nemesis = get_obligation_nemesis(hero_card["code"], card_db)
-    if obligation or nemesis:
+    if obligation is None:
+        st.markdown("---")
+        st.caption(ENCOUNTER_LOADING_TEXT)
+    elif obligation or nemesis:
         st.markdown("---")
         if obligation:
             st.markdown("**Obligation**")
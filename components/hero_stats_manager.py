@@ -2,11 +2,18 @@
 Hero Stats Manager - Handles shared hero stats across pages using Streamlit session state.
 This module provides functions to initialize, access, and modify hero stats that persist
 across all pages in the Streamlit app.
+
+The default stats are stored once per process as read-only rows of one
+(n_heroes x 15) array. Each session only keeps an overlay of the heroes it
+has edited, so an unedited session holds no stat arrays of its own and a
+reset just drops overlay entries.
 """
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 import streamlit as st
 import numpy as np
-import copy
 from data.default_heroes import default_heroes
 from data.help_tips import help_tips
 from data.constants import STAT_NAMES
@@ -16,20 +23,83 @@ from data.constants import STAT_NAMES
 # (imported from data.constants)
 
 
+@st.cache_resource(show_spinner=False)
+def get_default_hero_stats():
+    """
+    The process-wide default stats: a read-only {hero: stats} mapping whose
+    values are read-only rows of a single contiguous array.
+    """
+    names = list(default_heroes)
+    matrix = np.ascontiguousarray(np.array([default_heroes[name] for name in names]))
+    matrix.setflags(write=False)
+    return MappingProxyType({name: matrix[i] for i, name in enumerate(names)})
+
+
+class HeroStats(Mapping):
+    """
+    {hero: stats} view of shared defaults plus a sparse per-session overlay.
+    Assigning a hero's stats records a read-only copy in the overlay (or drops
+    the entry if they equal the default); reading falls back to the shared defaults.
+    """
+
+    def __init__(self, defaults, overlay=None):
+        self.defaults = defaults
+        self.overlay = {}
+        for name, stats in (overlay or {}).items():
+            self[name] = stats
+
+    def __getitem__(self, name):
+        if name in self.overlay:
+            return self.overlay[name]
+        return self.defaults[name]
+
+    def __setitem__(self, name, stats):
+        stats = np.array(stats)
+        stats.setflags(write=False)
+        default = self.defaults.get(name)
+        if default is not None and np.array_equal(stats, default):
+            self.overlay.pop(name, None)
+        else:
+            self.overlay[name] = stats
+
+    def __iter__(self):
+        yield from self.defaults
+        yield from (name for name in self.overlay if name not in self.defaults)
+
+    def __len__(self):
+        return len(self.defaults) + sum(1 for name in self.overlay if name not in self.defaults)
+
+    def __contains__(self, name):
+        return name in self.overlay or name in self.defaults
+
+    def edited(self):
+        """Names of heroes whose stats differ from the defaults."""
+        return list(self.overlay)
+
+    def reset(self, name=None):
+        """Drop the overlay entry of one hero, or of every hero."""
+        if name is None:
+            self.overlay.clear()
+        else:
+            self.overlay.pop(name, None)
+
+
 def initialize_hero_stats():
     """
     Initialize hero stats in session state if not already present.
     This should be called once at the start of the app.
     """
     if "heroes" not in st.session_state:
-        st.session_state.heroes = copy.deepcopy(default_heroes)
-        st.session_state.default_heroes = copy.deepcopy(default_heroes)
+        st.session_state.default_heroes = get_default_hero_stats()
+        st.session_state.heroes = HeroStats(st.session_state.default_heroes)
 
 
 def get_heroes():
     """
     Get the current hero stats from session state.
-    Returns a dictionary of hero names to numpy arrays of stats.
+    Returns the session's HeroStats mapping of hero names to numpy arrays of
+    stats. Assigning a hero's stats stores them in the session overlay; the
+    arrays themselves are read-only, so replace them rather than editing in place.
     """
     initialize_hero_stats()
     return st.session_state.heroes
@@ -53,11 +123,27 @@ def update_hero_stats(hero_name, stats_array):
     st.session_state.heroes[hero_name] = np.array(stats_array)
 
 
-def reset_hero_stats():
+def reset_hero_stats(hero_name=None):
     """
-    Reset all hero stats to defaults.
+    Reset one hero (or all heroes) to defaults.
     """
-    st.session_state.heroes = copy.deepcopy(st.session_state.default_heroes)
+    initialize_hero_stats()
+    st.session_state.heroes.reset(hero_name)
+
+
+def load_hero_stats(heroes=None, defaults=None):
+    """
+    Replace the session's hero stats from plain {hero: stats} dicts (e.g. an
+    uploaded file). defaults, if given, replaces this session's defaults.
+    """
+    initialize_hero_stats()
+    if defaults is not None:
+        st.session_state.default_heroes = MappingProxyType(
+            {hero: np.array(stats) for hero, stats in defaults.items()}
+        )
+    if heroes is None:
+        heroes = dict(st.session_state.heroes)
+    st.session_state.heroes = HeroStats(st.session_state.default_heroes, heroes)
 
 
 def render_hero_stats_editor(key_prefix=""):
@@ -120,12 +206,10 @@ For example, if you think two heroes are both "good" at Economy but one is clear
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Reset This Hero to Default", key=f"{key_prefix}_reset_hero"):
-                st.session_state.heroes[hero_to_modify] = copy.deepcopy(
-                    st.session_state.default_heroes[hero_to_modify]
-                )
+                reset_hero_stats(hero_to_modify)
                 st.rerun()
         
         with col2:
             if st.button("Reset All Heroes to Default", key=f"{key_prefix}_reset_all"):
-                st.session_state.heroes = copy.deepcopy(st.session_state.default_heroes)
+                reset_hero_stats()
                 st.rerun()
@@ -0,0 +1,137 @@
+"""
+Image Cache - Process-wide cache of decoded, resized card tiles.
+The PNG exporters paste the same resized card images on every export, so the
+decode + LANCZOS resize is done once per (path, mtime, size, crop) and shared
+by all sessions. Tiles live in an LRU bounded by a memory budget and are also
+persisted to disk as small pre-resized PNGs, so a cold container can warm up
+without decoding the original ~400 KB JPEGs again.
+
+Tiles are read-only: callers only paste them onto their own canvas.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+
+TILE_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes of decoded RGB pixels
+TILE_CACHE_DIR = os.path.join(".cache", "card_tiles")
+
+
+def _tile_bytes(tile):
+    return tile.width * tile.height * len(tile.getbands())
+
+
+class TileCache:
+    """Thread-safe LRU of resized PIL tiles with an optional on-disk tier."""
+
+    def __init__(self, memory_budget=TILE_MEMORY_BUDGET, disk_dir=TILE_CACHE_DIR):
+        self.memory_budget = memory_budget
+        self.disk_dir = disk_dir
+        self._tiles = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _disk_path(self, key):
+        path, mtime_ns, size, crop = key
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+        return os.path.join(self.disk_dir, f"{stem}_{size[0]}x{size[1]}_{digest}.png")
+
+    def _load_from_disk(self, key):
+        from PIL import Image
+
+        disk_path = self._disk_path(key)
+        if not os.path.exists(disk_path):
+            return None
+        try:
+            with Image.open(disk_path) as img:
+                return img.convert("RGB")
+        except Exception:
+            return None
+
+    def _save_to_disk(self, key, tile):
+        disk_path = self._disk_path(key)
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = disk_path + ".tmp"
+            tile.save(tmp_path, format="PNG")
+            os.replace(tmp_path, disk_path)
+        except OSError:
+            pass  # Disk persistence is best-effort (e.g. read-only filesystem)
+
+    def _put(self, key, tile):
+        with self._lock:
+            if key in self._tiles:
+                return
+            self._tiles[key] = tile
+            self._bytes += _tile_bytes(tile)
+            while self._bytes > self.memory_budget and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= _tile_bytes(evicted)
+
+    def get(self, path, size, crop=None):
+        """
+        Return the image at *path* resized to *size* (w, h) and, if given,
+        cropped to the *crop* box (left, top, right, bottom), or None if it
+        can't be read.
+        """
+        from PIL import Image
+
+        if not path or not os.path.exists(path):
+            return None
+        key = (path, os.stat(path).st_mtime_ns, tuple(size), tuple(crop) if crop else None)
+
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+
+        tile = self._load_from_disk(key) if self.disk_dir else None
+        if tile is not None:
+            self.disk_hits += 1
+        else:
+            try:
+                with Image.open(path) as src:
+                    tile = src.convert("RGB").resize(key[2], Image.LANCZOS)
+                if crop:
+                    tile = tile.crop(key[3])
+            except Exception:
+                return None
+            self.misses += 1
+            if self.disk_dir:
+                self._save_to_disk(key, tile)
+
+        self._put(key, tile)
+        return tile
+
+    def stats(self):
+        """Return a dict of cache counters and current memory use."""
+        with self._lock:
+            return {
+                "tiles": len(self._tiles),
+                "bytes": self._bytes,
+                "budget": self.memory_budget,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_tile_cache():
+    """The process-wide TileCache shared by every session and exporter."""
+    return TileCache()
+
+
+def get_card_tile(path, size, crop=None):
+    """
+    Return the shared, resized tile for a card image (see TileCache.get).
+    """
+    return get_tile_cache().get(path, size, crop)
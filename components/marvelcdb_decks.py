@@ -1,9 +1,30 @@
-"""Helpers for MarvelCDB deck metadata and display."""
+"""Helpers for MarvelCDB deck metadata and display.
 
+Deck links only need each deck's edit dates, so the metadata of every deck in
+data.hero_decks is fetched in one concurrent batch (thread pool over a pooled
+session) and persisted to a small local store keyed by deck id, with the
+deck's date_update. Links render straight from that store; when it goes
+stale it is refreshed in the background and the old labels are served until
+the refresh lands. Nothing in the render path waits on MarvelCDB.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import requests
 import streamlit as st
+from components.card_database import CARD_DB_DIR
+
+
+DECK_STORE_PATH = os.path.join(CARD_DB_DIR, "decks.json")
+DECK_STORE_REFRESH_INTERVAL = 3600  # seconds
+DECK_FETCH_WORKERS = 8
+HTTP_TIMEOUT = 30
 
 
 def _parse_iso_datetime(value):
@@ -55,25 +76,174 @@ def format_relative_edit_time(timestamp):
     return _pluralize(years, "year") + " ago"
 
 
-@st.cache_data(ttl=3600, show_spinner="Loading MarvelCDB deck info...")
-def fetch_deck_info(deck_id, api_type):
-    """Fetch a public MarvelCDB deck or decklist payload."""
+def _deck_url(deck_id, api_type):
     if api_type == "decklist":
-        url = f"https://marvelcdb.com/api/public/decklist/{deck_id}"
-    else:
-        url = f"https://marvelcdb.com/api/public/deck/{deck_id}"
+        return f"https://marvelcdb.com/api/public/decklist/{deck_id}"
+    return f"https://marvelcdb.com/api/public/deck/{deck_id}"
+
+
+def _store_key(deck_id, api_type):
+    return f"{api_type or 'deck'}/{deck_id}"
+
 
-    response = requests.get(url, timeout=30)
+def fetch_deck_info(deck_id, api_type, session=None):
+    """Fetch a public MarvelCDB deck or decklist payload."""
+    response = (session or requests).get(_deck_url(deck_id, api_type), timeout=HTTP_TIMEOUT)
     response.raise_for_status()
     return response.json()
 
 
-@st.cache_data(ttl=3600)
+def _deck_metadata(deck_info):
+    """The fields of a deck payload the store keeps."""
+    return {
+        "id": deck_info.get("id"),
+        "name": deck_info.get("name", ""),
+        "date_creation": deck_info.get("date_creation"),
+        "date_update": deck_info.get("date_update"),
+    }
+
+
+@lru_cache(maxsize=1)
+def _all_deck_entries():
+    from data.hero_decks import hero_decks
+    entries = {}
+    for deck_entries in hero_decks.values():
+        for entry in deck_entries:
+            if entry.get("deck_id"):
+                api_type = entry.get("api_type", "deck")
+                entries[_store_key(entry["deck_id"], api_type)] = (entry["deck_id"], api_type)
+    return entries
+
+
+def _fetch_deck_metadata(entries):
+    """
+    Fetch {store key: metadata} for entries ({store key: (deck_id, api_type)})
+    concurrently over one pooled session. Failed decks are left out.
+    """
+    session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=DECK_FETCH_WORKERS))
+    results = {}
+    with session, ThreadPoolExecutor(max_workers=DECK_FETCH_WORKERS, thread_name_prefix="deck-info") as pool:
+        futures = {
+            key: pool.submit(fetch_deck_info, deck_id, api_type, session)
+            for key, (deck_id, api_type) in entries.items()
+        }
+        for key, future in futures.items():
+            try:
+                results[key] = _deck_metadata(future.result())
+            except (requests.RequestException, ValueError):
+                pass
+    return results
+
+
+class _DeckStore:
+    """Deck metadata for every known deck, loaded from disk and refreshed in the background."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._decks = {}
+        self._fetched_at = 0.0
+        self._attempted = set()  # keys requested by the last refresh
+        self._dirty = False  # in-memory changes not yet written to DECK_STORE_PATH
+        self._saving = False
+        try:
+            with open(DECK_STORE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._decks = data.get("decks", {})
+            self._fetched_at = data.get("fetched_at", 0.0)
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def _write(fetched_at, decks):
+        try:
+            os.makedirs(os.path.dirname(DECK_STORE_PATH), exist_ok=True)
+            with open(DECK_STORE_PATH + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at, "decks": decks}, f, indent=1)
+            os.replace(DECK_STORE_PATH + ".tmp", DECK_STORE_PATH)
+        except OSError:
+            pass  # The in-memory store still works on a read-only filesystem
+
+    def _save_later(self):
+        """
+        Write the store on a background thread; changes made while a write is
+        running are coalesced into one more write. Caller holds the lock.
+        """
+        self._dirty = True
+        if not self._saving:
+            self._saving = True
+            threading.Thread(target=self._save_pending, name="deck-store-save", daemon=True).start()
+
+    def _save_pending(self):
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._saving = False
+                    return
+                self._dirty = False
+                fetched_at, decks = self._fetched_at, dict(self._decks)
+            self._write(fetched_at, decks)
+
+    def _refresh(self, entries):
+        try:
+            fetched = _fetch_deck_metadata(entries)
+        except Exception:
+            fetched = {}
+        with self._lock:
+            self._decks = {**self._decks, **fetched}
+            self._attempted = set(entries)
+            self._fetched_at = time.time()
+            self._save_later()
+            self._refreshing = False
+
+    def refresh_if_stale(self):
+        """Start a background refresh if the store is stale or missing known decks."""
+        entries = _all_deck_entries()
+        with self._lock:
+            stale = time.time() - self._fetched_at >= DECK_STORE_REFRESH_INTERVAL
+            missing = set(entries) - set(self._decks) - self._attempted
+            if self._refreshing or not (stale or missing):
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, args=(entries,), name="deck-store-refresh", daemon=True).start()
+
+    def get(self, deck_id, api_type):
+        with self._lock:
+            return self._decks.get(_store_key(deck_id, api_type))
+
+    def put(self, deck_id, api_type, deck_info):
+        """
+        Record a payload fetched elsewhere (e.g. the deck-list page). Nothing
+        is written unless the deck's metadata changed, and never on the
+        calling (render) thread.
+        """
+        meta = _deck_metadata(deck_info)
+        key = _store_key(deck_id, api_type)
+        with self._lock:
+            if self._decks.get(key) == meta:
+                return
+            self._decks[key] = meta
+            self._save_later()
+
+
+@st.cache_resource(show_spinner=False)
+def get_deck_store():
+    """The process-wide deck metadata store (warmed up on first use)."""
+    store = _DeckStore()
+    store.refresh_if_stale()
+    return store
+
+
 def get_deck_age_label(deck_id, api_type):
-    """Return a compact age label like '3 days ago'."""
-    try:
-        deck_info = fetch_deck_info(deck_id, api_type)
-    except Exception:
+    """
+    Return a compact age label like '3 days ago' from the deck store,
+    or "" if the deck has not been fetched yet.
+    """
+    store = get_deck_store()
+    store.refresh_if_stale()
+    deck_info = store.get(deck_id, api_type or "deck")
+    if not deck_info:
         return ""
 
     age = format_relative_edit_time(deck_info.get("date_update") or deck_info.get("date_creation"))
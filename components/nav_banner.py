@@ -6,6 +6,7 @@ Import and call render_nav_banner("page-id") and render_page_header("Title") fro
 import streamlit as st
 import streamlit.components.v1 as components
 from html import escape as html_escape
+from components.startup import page_imported, page_finished
 
 LOGO_URL = "https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/logo/Daring_Lime_Logo.png?raw=true"
 
@@ -26,6 +27,7 @@ NAV_PAGES = [
 
 def render_nav_banner(current_page=""):
     """Render a coloured navigation banner with page links at the top of the page."""
+    page_imported()
     links_html = ""
     for label, href, page_id in NAV_PAGES:
         active = "nav-active" if page_id == current_page else ""
@@ -860,3 +862,4 @@ def render_footer(show_card_credits=False):
         f'border-top: 2px solid rgba(237,28,36,0.3);">{credits}</div>',
         unsafe_allow_html=True,
     )
+    page_finished()
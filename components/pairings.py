@@ -0,0 +1,160 @@
+"""
+Hero Pairings - Directional synergy between every ordered pair of heroes.
+Entry [a, b] of each matrix is hero b's value as a partner for hero a: how
+well b covers a's weak base stats, plus tempo, late-game and blocking
+bonuses, damped when both heroes are strong or both are weak. All pairs are
+computed at once with array operations over the (n_heroes x 15) stat matrix
+and shared across sessions per fingerprint of the stats and weights.
+"""
+
+import numpy as np
+from components.scoring import shared_by_fingerprint
+
+
+# ----------------------------------------
+# Tuning Variables
+# ----------------------------------------
+TARGET = 2
+BASE_STAT_COUNT = 8
+
+PRIMARY_WEIGHT = 0.6
+SECONDARY_WEIGHT = 0.4
+
+MIN_RECIPROCITY_RATIO = 0.35
+S_TIER_RECIPROCITY_BOOST = 0.15
+
+# Baseline indices
+ECONOMY_INDEX = 0
+TEMPO_INDEX = 1
+CARD_VALUE_INDEX = 2
+SURVIVABILITY_INDEX = 3
+VILLAIN_DAMAGE_INDEX = 4
+THWART_INDEX = 5
+RELIABILITY_INDEX = 6
+MINION_CONTROL_INDEX = 7
+
+# Boon indices
+CONTROL_INDEX = 8
+SUPPORT_INDEX = 9
+LATE_GAME_INDEX = 11
+
+LATE_GAME_TRIGGER = 1.0
+
+TEMPO_PAIR_BONUS = 0.25
+LATE_GAME_THWART_BONUS = 0.20
+BLOCKING_SUPPORT_BONUS = 0.25
+
+POWER_DISINCENTIVE = 0.3
+WEAK_PAIR_DISINCENTIVE = 0.5
+
+
+# ----------------------------------------
+# General Power
+# ----------------------------------------
+def power_thresholds(power):
+    """
+    (weak, strong) general-power thresholds: mean -/+ half a std. Unlike the
+    tier thresholds the std is not floored, so when every hero has the same
+    power (e.g. all weights zero) every hero counts as both weak and strong.
+    """
+    power = np.asarray(power, dtype=float)
+    mean, std = power.mean(), power.std()
+    return float(mean - 0.5 * std), float(mean + 0.5 * std)
+
+
+# ----------------------------------------
+# Directional Synergy
+# ----------------------------------------
+def directional_synergy_matrix(stats, power, strong_threshold, weak_threshold):
+    """
+    Synergy of every ordered pair at once: entry [a, b] is how much hero b
+    helps hero a, from the (n_heroes x 15) stats and each hero's general power.
+    """
+    base = stats[:, :BASE_STAT_COUNT]
+
+    # Weakness coverage
+    needs = np.maximum(0, TARGET - base)
+    usable = np.minimum(np.maximum(0, base)[None, :, :], needs[:, None, :])
+    need_totals = needs.sum(axis=1)
+    coverage = np.einsum("ak,abk->ab", needs, usable)
+    score = np.divide(
+        coverage, need_totals[:, None],
+        out=np.zeros_like(coverage), where=need_totals[:, None] > 0,
+    )
+
+    # Tempo contrast
+    tempo = base[:, TEMPO_INDEX]
+    score += TEMPO_PAIR_BONUS * np.abs(tempo[:, None] - tempo[None, :])
+
+    # Late game + thwart
+    thwart = base[:, THWART_INDEX]
+    late_game = stats[:, LATE_GAME_INDEX] >= LATE_GAME_TRIGGER
+    score += np.outer(late_game, np.where(thwart > TARGET, LATE_GAME_THWART_BONUS * thwart, 0.0))
+
+    # Survivability + support
+    blocking = base[:, SURVIVABILITY_INDEX] < TARGET
+    support = np.maximum(0, base[:, SURVIVABILITY_INDEX]) + np.maximum(0, stats[:, SUPPORT_INDEX])
+    score += np.outer(blocking, BLOCKING_SUPPORT_BONUS * support)
+
+    # Power disincentives
+    strong = power >= strong_threshold
+    weak = power <= weak_threshold
+    score *= np.where(np.outer(strong, strong), POWER_DISINCENTIVE, 1.0)
+    score *= np.where(np.outer(weak, weak), WEAK_PAIR_DISINCENTIVE, 1.0)
+
+    return score
+
+
+# ----------------------------------------
+# Pairing Classification
+# ----------------------------------------
+def classify_pairings(directional):
+    """Pairing type of every ordered pair [a, b] from the directional matrix."""
+    a_to_b, b_to_a = directional, directional.T
+    best = np.maximum(a_to_b, b_to_a)
+    ratio = np.divide(np.minimum(a_to_b, b_to_a), best, out=np.zeros_like(best), where=best != 0)
+    return np.select(
+        [best == 0, ratio >= MIN_RECIPROCITY_RATIO, a_to_b > b_to_a],
+        ["neutral", "mutual", "b_helps_a"],
+        "a_helps_b",
+    )
+
+
+class PairingMatrices:
+    """Directional, blended and pair-type matrices for every ordered pair of heroes."""
+
+    def __init__(self, stats, weights):
+        power = stats @ weights
+        weak, strong = power_thresholds(power)
+        self.directional = directional_synergy_matrix(stats, power, strong, weak)
+        self.types = classify_pairings(self.directional)
+        # Entry [a, b]: partner b's score from hero a's point of view
+        self.blended = PRIMARY_WEIGHT * self.directional + SECONDARY_WEIGHT * self.directional.T
+        self.blended *= np.where(self.types == "mutual", 1 + S_TIER_RECIPROCITY_BOOST, 1.0)
+        for arr in (self.directional, self.types, self.blended):
+            arr.setflags(write=False)
+
+    def best_pairs(self, rows, limit):
+        """
+        The top limit unordered pairs among hero rows, ranked by the mean of
+        both directions' blended score. Returns [(row_a, row_b, score)].
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        if len(rows) < 2:
+            return []
+        pair_scores = (self.blended + self.blended.T) / 2
+        i, j = np.triu_indices(len(rows), 1)
+        a, b = rows[i], rows[j]
+        scores = pair_scores[a, b]
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(a[k]), int(b[k]), float(scores[k])) for k in top]
+
+
+@shared_by_fingerprint(max_entries=16)
+def _build_pairing_matrices(stats, weights):
+    return PairingMatrices(stats, weights)
+
+
+def get_pairing_matrices(stats, weights):
+    """Shared, read-only PairingMatrices for these hero stats and general weights."""
+    return _build_pairing_matrices(np.asarray(stats, dtype=float), np.asarray(weights, dtype=float))
@@ -0,0 +1,160 @@
+"""
+Scoring - Shared hero-matrix scoring engine.
+The roster is held as one contiguous, read-only (n_heroes x 15) float array
+with a name <-> row index map. A weight vector scores every hero with a
+single matrix-vector product, and a (k x 15) batch of weight vectors scores
+the roster k ways with one matrix product. Tiers are assigned by bucketing
+scores against std-based thresholds with np.digitize, so every page shares
+one scoring and tiering path instead of its own dot-product loop and
+if/elif chain.
+
+Results derived from the matrix (team distributions, pairing and villain
+matrices) depend only on their array inputs, so shared_by_fingerprint caches
+them once per sha1 fingerprint of those inputs for every session.
+"""
+
+import functools
+import hashlib
+
+import streamlit as st
+import numpy as np
+
+
+TIERS = ["S", "A", "B", "C", "D", "F"]
+TIERS_WORST_FIRST = TIERS[::-1]
+
+# Lower bound of each tier in standard deviations from the mean, worst to best
+# (D, C, B, A, S); anything below the first bound is F. Used for heroes and teams.
+HERO_TIER_STD_BOUNDS = [-1.5, -1.0, -0.5, 0.5, 1.5]
+
+
+class HeroMatrix:
+    """Read-only hero stat matrix with a name <-> row index map."""
+
+    def __init__(self, heroes, names=None):
+        """heroes: {name: 15 stats}; names picks (and orders) the rows, default all."""
+        self.names = tuple(heroes if names is None else names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.matrix = np.ascontiguousarray(
+            np.array([heroes[name] for name in self.names], dtype=float).reshape(len(self.names), -1)
+        )
+        self.matrix.setflags(write=False)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def rows(self, names):
+        """Row indices of names, as an int array."""
+        return np.array([self.index[name] for name in names], dtype=np.intp)
+
+    def stats(self, name):
+        """The (read-only) stat row of one hero."""
+        return self.matrix[self.index[name]]
+
+    def scores(self, weights, names=None):
+        """
+        Weighted score of every hero (or only names, in that order).
+        weights of shape (15,) gives shape (n,); a (k, 15) batch gives (k, n).
+        """
+        matrix = self.matrix if names is None else self.matrix[self.rows(names)]
+        return np.asarray(weights, dtype=float) @ matrix.T
+
+    def score_dict(self, weights, names=None):
+        """{hero: score} for one weight vector."""
+        names = self.names if names is None else list(names)
+        return dict(zip(names, self.scores(weights, names).tolist()))
+
+
+def tier_thresholds(scores, std_bounds=HERO_TIER_STD_BOUNDS, min_std=1e-6):
+    """
+    Score thresholds mean + bound * std for each bound (std floored at min_std).
+    For a (k, n) batch of scores, returns one row of thresholds per batch row.
+    """
+    scores = np.asarray(scores, dtype=float)
+    if scores.shape[-1] == 0:
+        return np.zeros(scores.shape[:-1] + (len(std_bounds),))
+    mean = scores.mean(axis=-1, keepdims=True)
+    std = np.maximum(scores.std(axis=-1, keepdims=True), min_std)
+    return mean + np.asarray(std_bounds, dtype=float) * std
+
+
+def tier_indices(scores, std_bounds=HERO_TIER_STD_BOUNDS, min_std=1e-6):
+    """
+    Tier of each score as an index into TIERS_WORST_FIRST (0 = F). A score
+    on a threshold belongs to the higher tier. Accepts (n,) or (k, n) scores.
+    """
+    scores = np.asarray(scores, dtype=float)
+    thresholds = tier_thresholds(scores, std_bounds, min_std)
+    if scores.ndim == 1:
+        return np.digitize(scores, thresholds)
+    return np.stack([np.digitize(row, thr) for row, thr in zip(scores, thresholds)])
+
+
+def tier_labels(scores, std_bounds=HERO_TIER_STD_BOUNDS, min_std=1e-6):
+    """Tier letter of each score, in the shape of scores."""
+    return np.array(TIERS_WORST_FIRST)[tier_indices(scores, std_bounds, min_std)]
+
+
+def tier_lists(scores, std_bounds=HERO_TIER_STD_BOUNDS, min_std=1e-6):
+    """
+    Split {name: score} into {tier: [(name, score), ...]}, each tier sorted
+    best first (ties by name).
+    """
+    tiers = {t: [] for t in TIERS}
+    if not scores:
+        return tiers
+    names = list(scores)
+    values = np.fromiter(scores.values(), dtype=float, count=len(names))
+    for name, score, tier in zip(names, values.tolist(), tier_labels(values, std_bounds, min_std).tolist()):
+        tiers[tier].append((name, score))
+    for tier in TIERS:
+        tiers[tier].sort(key=lambda x: (-x[1], x[0]))
+    return tiers
+
+
+def fingerprint(*parts):
+    """
+    Stable sha1 hex digest of parts: arrays (and HeroMatrix) by dtype, shape
+    and raw bytes, anything else by its repr.
+    """
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, HeroMatrix):
+            h.update("|".join(part.names).encode("utf-8"))
+            part = part.matrix
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part)
+            h.update(f"{part.dtype.str}{part.shape}".encode("utf-8"))
+            h.update(part.tobytes())
+        else:
+            h.update(repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def shared_by_fingerprint(max_entries=16):
+    """
+    Decorator: share build(*args) across sessions through st.cache_resource
+    (LRU-evicted past max_entries), keyed on fingerprint(*args) instead of
+    Streamlit hashing the arguments. Results must be treated as read-only.
+    """
+    def decorate(build):
+        def cached(key, _args):
+            return build(*_args)
+
+        # One cache per build function (cache_resource keys on module + qualname)
+        cached.__module__ = build.__module__
+        cached.__qualname__ = f"{build.__qualname__}.<shared>"
+        cached = st.cache_resource(max_entries=max_entries, show_spinner=False)(cached)
+
+        @functools.wraps(build)
+        def get(*args):
+            return cached(fingerprint(*args), args)
+
+        get.clear = cached.clear
+        return get
+
+    return decorate
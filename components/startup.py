@@ -0,0 +1,171 @@
+"""
+Startup - Lazy loading of heavy dependencies and a cold-start timing report.
+Pages that only need matplotlib, pandas or yt-dlp on some runs (the Team
+Builder and Team Generator charts behind a button, the YouTube page's video
+list) import them through lazy_import, so those runs are the only ones that
+pay for the import; pages that always draw a chart import matplotlib as
+usual. Every lazy import that really loads a module is timed and attributed
+to the page running at the time, and each page's first full render in this
+process is timed as well: from page_started on the first line of the page
+script, so the page's own module imports are included (and reported apart
+up to the nav banner), to the footer. The numbers are kept in a
+process-wide StartupReport, logged as each page first renders and written to
+STARTUP_REPORT_PATH, so cold-start regressions show up in numbers.
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+
+import streamlit as st
+
+
+STARTUP_REPORT_PATH = os.path.join(".cache", "startup_report.json")
+
+_log = logging.getLogger(__name__)
+
+_page_run = threading.local()  # The page being rendered on this script thread
+
+
+class StartupReport:
+    """Thread-safe record of lazy-import and first-render timings."""
+
+    def __init__(self, path=STARTUP_REPORT_PATH):
+        self.path = path
+        self.process_started = time.time()
+        self.imports = {}  # module -> {"seconds", "page"}
+        # page -> {"first_render_seconds", "module_import_seconds", "import_seconds", "rendered_at"}
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def record_import(self, module, seconds, page):
+        with self._lock:
+            self.imports.setdefault(module, {"seconds": round(seconds, 4), "page": page})
+
+    def record_render(self, page, seconds, module_import_seconds=None):
+        """
+        Record a page's first render; later renders of the page are ignored.
+        module_import_seconds is the part spent in the page's top-level imports.
+        """
+        with self._lock:
+            if page in self.pages:
+                return
+            self.pages[page] = {
+                "first_render_seconds": round(seconds, 4),
+                "module_import_seconds": (
+                    None if module_import_seconds is None else round(module_import_seconds, 4)
+                ),
+                "import_seconds": round(sum(
+                    entry["seconds"] for entry in self.imports.values() if entry["page"] == page
+                ), 4),
+                "rendered_at": round(time.time() - self.process_started, 2),
+            }
+            entry = self.pages[page]
+            snapshot = self._as_dict()
+        _log.info(
+            "First render of %s: %.2fs (%.2fs in module imports, %.2fs in lazy imports), "
+            "%.1fs after process start",
+            page, entry["first_render_seconds"], entry["module_import_seconds"] or 0.0,
+            entry["import_seconds"], entry["rendered_at"],
+        )
+        self._save(snapshot)
+
+    def _as_dict(self):
+        return {
+            "process_started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.process_started)),
+            "imports": {module: dict(entry) for module, entry in self.imports.items()},
+            "pages": {page: dict(entry) for page, entry in self.pages.items()},
+        }
+
+    def _save(self, snapshot):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # The report is best-effort (e.g. read-only filesystem)
+
+
+@st.cache_resource(show_spinner=False)
+def get_startup_report():
+    """The process-wide StartupReport."""
+    return StartupReport()
+
+
+class _LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            loaded = self.__name__ in sys.modules
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            if not loaded:
+                get_startup_report().record_import(
+                    self.__name__, time.perf_counter() - start, getattr(_page_run, "page", None)
+                )
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name, optional=False):
+    """
+    Return a stand-in for module name that is imported on first use. With
+    optional=True, returns None if the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if optional and importlib.util.find_spec(name.split(".")[0]) is None:
+        return None
+    return _LazyModule(name)
+
+
+def page_started(page):
+    """
+    Mark the start of a page's script run. Call it on the first line of the
+    page, before its other imports, so their cost counts towards the render.
+    """
+    _page_run.page = page
+    _page_run.started = time.perf_counter()
+    _page_run.imported = None
+
+
+def page_imported():
+    """Mark the end of the page's top-level imports (called by the nav banner)."""
+    if getattr(_page_run, "page", None) is not None and _page_run.imported is None:
+        _page_run.imported = time.perf_counter()
+
+
+def page_finished():
+    """Mark the end of a page's script run (called by the footer)."""
+    page = getattr(_page_run, "page", None)
+    if page is None:
+        return
+    imported = _page_run.imported
+    get_startup_report().record_render(
+        page,
+        time.perf_counter() - _page_run.started,
+        None if imported is None else imported - _page_run.started,
+    )
+    _page_run.page = None
@@ -0,0 +1,358 @@
+"""
+Submission Store - Sharded, append-only storage for community tier-list submissions.
+Every (tier-list type, player-count bucket) pair is its own shard folder:
+
+    community_shards/<type>/<bucket>/snapshot.json   aggregate of every folded record
+    community_shards/<type>/<bucket>/log.jsonl       recent submissions, one JSON record per line
+    community_shards/<type>/<bucket>/seg-*.jsonl     immutable, already-folded records
+    community_shards/<type>/manifest.json            buckets whose shard has been written
+
+A submission is appended to its bucket's small log. Once the log holds
+COMPACT_THRESHOLD records it is compacted: the records are written out as a
+new segment and folded into the snapshot aggregate. Every write therefore
+touches files of bounded size however long the history gets, and each
+submission is stored once (the "Any" view of a player-count type is the sum
+of its bucket aggregates).
+
+Records carry increasing ids and the snapshot remembers the last id it
+folded, so a log that still holds folded records (e.g. a compaction that
+stopped half-way) is never double counted. Shards that do not exist yet are
+seeded from the legacy single-file community_tier_lists.json.
+
+Readers only fetch the shards listed in their type's manifest; every other
+bucket is served from its legacy seed without a request, so views of
+buckets nobody has submitted to cost no GitHub reads (nor cached 404s).
+A writer adds its bucket to the manifest after its first append. Until a
+type has a manifest (data written before it existed), every bucket is read.
+Locally the shards live under community_shards/ next to the legacy file.
+"""
+
+import copy
+import json
+import random
+import re
+import time
+
+from components.github_storage import load_json, load_text, save_text
+from components.community_aggregates import add_submission, build_aggregate, empty_aggregate
+
+# Player count options (hero_power and villain_difficulty only)
+PLAYER_COUNTS = ["Any", "Solo", "2-Player", "3-4 Player"]
+PLAYER_COUNT_TYPES = {"hero_power", "villain_difficulty"}  # types that support player count
+
+SHARD_ROOT = "community_shards"
+LEGACY_FILE = "community_tier_lists.json"
+COMPACT_THRESHOLD = 50  # log records folded into one segment
+WRITE_ATTEMPTS = 5
+MANIFEST = "manifest.json"
+
+
+def submissions_key(player_count):
+    """Return the submissions key for a player count (e.g. 'submissions_solo')."""
+    if player_count == "Any":
+        return "submissions"
+    return f"submissions_{player_count.lower().replace('-', '')}"
+
+
+def bucket_id(subs_key):
+    """Shard folder name for a submissions key ('submissions_2player' -> '2player', 'submissions' -> 'any')."""
+    suffix = subs_key[len("submissions"):].lstrip("_")
+    return re.sub(r"[^a-z0-9]+", "", suffix.lower()) or "any"
+
+
+def _shard_path(tl_type, subs_key, name):
+    return "/".join((SHARD_ROOT, tl_type, bucket_id(subs_key), name))
+
+
+def _manifest_path(tl_type):
+    return "/".join((SHARD_ROOT, tl_type, MANIFEST))
+
+
+def _type_buckets(tl_type):
+    """Every submissions key of a tier-list type."""
+    if tl_type not in PLAYER_COUNT_TYPES:
+        return ["submissions"]
+    return [submissions_key(pc) for pc in PLAYER_COUNTS]
+
+
+def listed_buckets(tl_type, revalidate=False):
+    """Bucket ids the type's manifest lists as written, or None if it has no manifest yet."""
+    text, _ = load_text(_manifest_path(tl_type), revalidate=revalidate)
+    if text is None:
+        return None
+    try:
+        return set(json.loads(text).get("buckets", []))
+    except ValueError:
+        return None
+
+
+# ─── Legacy single-file data ───
+
+def _legacy_records(tl_type, subs_key):
+    """
+    Submissions of one bucket in the legacy file. The legacy "submissions"
+    list also repeated every player-count submission, so for the "any" bucket
+    those duplicates are removed.
+    """
+    legacy, _ = load_json(LEGACY_FILE, default={})
+    if not isinstance(legacy, dict):
+        return []
+    if "submissions" in legacy and tl_type not in legacy:
+        # Oldest format: a single top-level list of hero_power submissions
+        type_data = {"submissions": legacy["submissions"]} if tl_type == "hero_power" else {}
+    else:
+        type_data = legacy.get(tl_type, {})
+    records = list(type_data.get(subs_key, []))
+    if subs_key == "submissions":
+        repeated = {}
+        for key, subs in type_data.items():
+            if key.startswith("submissions_"):
+                for sub in subs:
+                    dump = json.dumps(sub, sort_keys=True)
+                    repeated[dump] = repeated.get(dump, 0) + 1
+        unique = []
+        for sub in records:
+            dump = json.dumps(sub, sort_keys=True)
+            if repeated.get(dump):
+                repeated[dump] -= 1
+            else:
+                unique.append(sub)
+        records = unique
+    return records
+
+
+_seed_cache = {}  # (tl_type, subs_key) -> (legacy data object, (snapshot, records))
+
+
+def _seed_snapshot(tl_type, subs_key):
+    """Snapshot (and records) for a shard that has not been written yet, from the legacy file."""
+    legacy, _ = load_json(LEGACY_FILE, default={})
+    cached = _seed_cache.get((tl_type, subs_key))
+    if cached and cached[0] is legacy:
+        return copy.deepcopy(cached[1])
+    records = _legacy_records(tl_type, subs_key)
+    seed = {
+        "last_id": 0,
+        "segments": ["seg-legacy.jsonl"] if records else [],
+        "aggregate": build_aggregate(records),
+    }, records
+    _seed_cache[(tl_type, subs_key)] = (legacy, seed)
+    return copy.deepcopy(seed)
+
+
+# ─── Reading ───
+
+def _parse_log(text):
+    records = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if line:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # A torn line is skipped rather than failing the shard
+    return records
+
+
+def _read_shard(tl_type, subs_key, revalidate=False):
+    """
+    Return (snapshot, snapshot_sha, exists, log_text, log_records, log_sha).
+    The log is read before the snapshot: a compaction landing in between then
+    pairs a newer snapshot with the old log, whose records it already folded
+    (and whose sha no longer matches, so an append against it is retried),
+    never an older snapshot with a log it has already truncated.
+    """
+    log_text, log_sha = load_text(_shard_path(tl_type, subs_key, "log.jsonl"), revalidate=revalidate)
+    snap_text, snap_sha = load_text(_shard_path(tl_type, subs_key, "snapshot.json"), revalidate=revalidate)
+    if snap_text is None:
+        snapshot, exists = _seed_snapshot(tl_type, subs_key)[0], False
+    else:
+        snapshot, exists = json.loads(snap_text), True
+    return snapshot, snap_sha, exists, log_text or "", _parse_log(log_text), log_sha
+
+
+def load_aggregate(tl_type, subs_key, revalidate=False, listed=None):
+    """
+    Aggregate of every submission in one shard (snapshot plus pending log records).
+    listed is the type's listed_buckets(); a bucket it does not list is
+    served from its seed without reading the shard.
+    """
+    if listed is not None and bucket_id(subs_key) not in listed:
+        return copy.deepcopy(_seed_snapshot(tl_type, subs_key)[0]["aggregate"])
+    snapshot, _, _, _, records, _ = _read_shard(tl_type, subs_key, revalidate=revalidate)
+    aggregate = copy.deepcopy(snapshot.get("aggregate") or empty_aggregate())
+    last_id = snapshot.get("last_id", 0)
+    for record in records:
+        if record.get("id", 0) > last_id:
+            add_submission(aggregate, record.get("submission", {}))
+    return aggregate
+
+
+def merge_aggregates(aggregates):
+    """Sum several aggregates into a new one."""
+    merged = empty_aggregate()
+    for aggregate in aggregates:
+        merged["submissions"] += aggregate.get("submissions", 0)
+        for subj, (count, total, total_sq) in aggregate.get("subjects", {}).items():
+            totals = merged["subjects"].setdefault(subj, [0, 0.0, 0.0])
+            totals[0] += count
+            totals[1] += total
+            totals[2] += total_sq
+    return merged
+
+
+def load_community_aggregate(tl_type, player_count="Any"):
+    """Score aggregate for a tier-list type and player count ("Any" sums every bucket)."""
+    listed = listed_buckets(tl_type)
+    if tl_type not in PLAYER_COUNT_TYPES:
+        return load_aggregate(tl_type, "submissions", listed=listed)
+    if player_count != "Any":
+        return load_aggregate(tl_type, submissions_key(player_count), listed=listed)
+    return merge_aggregates(load_aggregate(tl_type, key, listed=listed) for key in _type_buckets(tl_type))
+
+
+# ─── Writing ───
+
+def _put(content_str, path, replace=True):
+    """
+    Write a file that may already exist from an earlier, interrupted seed or
+    compaction. Its current sha is loaded first so the write replaces it
+    instead of being rejected; with replace=False an existing file is kept.
+    Returns (ok, error_message).
+    """
+    existing, sha = load_text(path, revalidate=True)
+    if existing == content_str or (existing is not None and not replace):
+        return True, None
+    ok, error_message, _ = save_text(content_str, path, sha=sha)
+    return ok, error_message
+
+
+def _write_seed(tl_type, subs_key):
+    """Persist a shard's seeded snapshot (and its legacy records) the first time it is written."""
+    snapshot, records = _seed_snapshot(tl_type, subs_key)
+    if records:
+        ok, error_message = _put(
+            "".join(json.dumps({"id": 0, "submission": r}) + "\n" for r in records),
+            _shard_path(tl_type, subs_key, "seg-legacy.jsonl"),
+        )
+        if not ok:
+            return False, error_message
+    # Another process may have seeded (and since written) the snapshot first
+    return _put(json.dumps(snapshot), _shard_path(tl_type, subs_key, "snapshot.json"), replace=False)
+
+
+def _register_bucket(tl_type, subs_key):
+    """
+    Add a written shard's bucket to its type's manifest. A type without a
+    manifest gets one listing every bucket whose snapshot exists. Best-effort:
+    a bucket left out is added by its next append.
+    """
+    bucket = bucket_id(subs_key)
+    listed = listed_buckets(tl_type)
+    if listed is not None and bucket in listed:
+        return True
+    path = _manifest_path(tl_type)
+    for attempt in range(WRITE_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0.1, 0.5) * attempt)
+        text, sha = load_text(path, revalidate=True)
+        listed = listed_buckets(tl_type) if text is not None else {
+            bucket_id(key) for key in _type_buckets(tl_type)
+            if load_text(_shard_path(tl_type, key, "snapshot.json"), revalidate=True)[0] is not None
+        }
+        if listed is None:
+            listed = set()
+        if text is not None and bucket in listed:
+            return True
+        listed.add(bucket)
+        ok, _, retryable = save_text(json.dumps({"buckets": sorted(listed)}), path, sha=sha)
+        if ok:
+            return True
+        if not retryable:
+            break
+    return False
+
+
+def append_submissions(tl_type, subs_key, submissions):
+    """
+    Append submissions to their shard's log in a single write. Compacts the
+    shard once the log is long enough. Conflicting writes (another process
+    wrote the log first) are retried after a short jittered backoff.
+    Returns (ok, error_message).
+    """
+    last_error = "Could not save your submission."
+    for attempt in range(WRITE_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0.1, 0.5) * attempt)
+        snapshot, _, exists, log_text, records, log_sha = _read_shard(tl_type, subs_key, revalidate=True)
+        if not exists:
+            ok, error_message = _write_seed(tl_type, subs_key)
+            if not ok:
+                last_error = error_message or last_error
+                continue
+        next_id = max([snapshot.get("last_id", 0)] + [r.get("id", 0) for r in records]) + 1
+        if log_text and not log_text.endswith("\n"):
+            log_text += "\n"
+        new_lines = "".join(
+            json.dumps({"id": next_id + i, "submission": submission}) + "\n"
+            for i, submission in enumerate(submissions)
+        )
+        saved, error_message, retryable = save_text(
+            log_text + new_lines, _shard_path(tl_type, subs_key, "log.jsonl"), sha=log_sha
+        )
+        if saved:
+            _register_bucket(tl_type, subs_key)
+            pending = sum(1 for r in records if r.get("id", 0) > snapshot.get("last_id", 0)) + len(submissions)
+            if pending >= COMPACT_THRESHOLD:
+                compact_shard(tl_type, subs_key)
+            return True, None
+        last_error = error_message or last_error
+        if not retryable:
+            break
+    return False, last_error
+
+
+def append_submission(tl_type, subs_key, submission):
+    """Append one submission to its shard's log. Returns (ok, error_message)."""
+    return append_submissions(tl_type, subs_key, [submission])
+
+
+def compact_shard(tl_type, subs_key):
+    """
+    Fold the shard's pending log records into a new segment and the snapshot,
+    then drop them from the log. Best-effort: returns True if records were folded.
+    """
+    snapshot, snap_sha, exists, _, records, log_sha = _read_shard(tl_type, subs_key, revalidate=True)
+    if not exists:
+        return False
+    last_id = snapshot.get("last_id", 0)
+    pending = [r for r in records if r.get("id", 0) > last_id]
+    if not pending:
+        return False
+
+    first, last = pending[0]["id"], pending[-1]["id"]
+    segment = f"seg-{first:08d}-{last:08d}.jsonl"
+    # A segment left behind by an earlier failed compaction holds the same
+    # records, so it is replaced rather than conflicting with the new write.
+    ok, _ = _put("".join(json.dumps(r) + "\n" for r in pending), _shard_path(tl_type, subs_key, segment))
+    if not ok:
+        return False
+
+    aggregate = snapshot.get("aggregate") or empty_aggregate()
+    for record in pending:
+        add_submission(aggregate, record.get("submission", {}))
+    snapshot = {
+        "last_id": last,
+        "segments": snapshot.get("segments", []) + [segment],
+        "aggregate": aggregate,
+    }
+    ok, _, _ = save_text(json.dumps(snapshot), _shard_path(tl_type, subs_key, "snapshot.json"), sha=snap_sha)
+    if not ok:
+        return False
+
+    # Records appended since we read the log stay; if this loses a race, the
+    # folded records are skipped by id until the next compaction trims them.
+    _, _, _, _, records, log_sha = _read_shard(tl_type, subs_key, revalidate=True)
+    remaining = [r for r in records if r.get("id", 0) > last]
+    save_text("".join(json.dumps(r) + "\n" for r in remaining), _shard_path(tl_type, subs_key, "log.jsonl"), sha=log_sha)
+    return True
@@ -0,0 +1,103 @@
+"""
+Submission Writer - One process-wide background writer for community submissions.
+Sessions no longer write to storage themselves (and race each other on the
+file sha). They hand their submission to the writer and get a ticket back.
+The writer thread waits BATCH_WINDOW seconds after the first submission of a
+burst, groups everything that arrived by shard, appends each group to its
+shard's log in a single write, then resolves every ticket in the group with
+the outcome. Each successful write bumps the shared community snapshot
+version so every session picks up the new results.
+"""
+
+import queue
+import threading
+import time
+
+import streamlit as st
+from components.submission_store import append_submissions
+from components.community_snapshot import get_community_snapshot_store
+
+BATCH_WINDOW = 0.5  # seconds to collect a burst before writing it
+MAX_BATCH = 200  # submissions per write at most
+
+
+class SubmissionTicket:
+    """Handle for one queued submission; resolved when its batch is written."""
+
+    def __init__(self, tl_type, subs_key, submission):
+        self.tl_type = tl_type
+        self.subs_key = subs_key
+        self.submission = submission
+        self.ok = None
+        self.error = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the batch lands (or timeout). Returns (ok, error_message); ok is None if still pending."""
+        self._done.wait(timeout)
+        return self.ok, self.error
+
+    def _resolve(self, ok, error):
+        self.ok, self.error = ok, error
+        self._done.set()
+
+
+class SubmissionWriter:
+    """Queue plus daemon thread that coalesces submissions into batched shard writes."""
+
+    def __init__(self, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, tl_type, subs_key, submission):
+        """Queue a submission and return its SubmissionTicket."""
+        ticket = SubmissionTicket(tl_type, subs_key, submission)
+        self._queue.put(ticket)
+        return ticket
+
+    def pending(self):
+        """Approximate number of submissions waiting to be written."""
+        return self._queue.qsize()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        by_shard = {}
+        for ticket in batch:
+            by_shard.setdefault((ticket.tl_type, ticket.subs_key), []).append(ticket)
+        for (tl_type, subs_key), tickets in by_shard.items():
+            try:
+                ok, error = append_submissions(tl_type, subs_key, [t.submission for t in tickets])
+            except Exception as e:
+                ok, error = False, f"Could not save your submission: {e}"
+            if ok:
+                get_community_snapshot_store().bump()
+            for ticket in tickets:
+                ticket._resolve(ok, error)
+
+    def _run(self):
+        while True:
+            self._write_batch(self._collect_batch())
+
+
+@st.cache_resource(show_spinner=False)
+def get_submission_writer():
+    """The process-wide SubmissionWriter (its thread starts on first use)."""
+    return SubmissionWriter()
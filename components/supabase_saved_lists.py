@@ -13,14 +13,30 @@ Required Streamlit secrets:
     url = "https://<project-ref>.supabase.co"
     service_role_key = "..."
     feature_enabled = true
+
+View counts are buffered in-process and flushed every VIEW_FLUSH_INTERVAL
+seconds through one atomic increment RPC, increment_saved_list_views, defined
+in supabase/migrations/20261016000000_increment_saved_list_views.sql. Until
+that migration is applied, each slug's batched delta is written with a
+compare-and-set PATCH (matching the view_count it read) that re-reads and
+retries on conflict, so concurrent replicas still never lose views. Pending
+counts are flushed once more at interpreter exit. Delivery is at most once:
+a write that fails in a way that leaves it unknown whether the server applied
+it (a read timeout or dropped connection) is counted as sent rather than
+retried, so a view can be lost but is never counted twice.
 """
 
 from __future__ import annotations
 
+import atexit
 import hashlib
+import logging
+import random
 import secrets as _secrets
 import re
+import threading
 import time
+from collections import OrderedDict, deque
 from typing import Any
 
 import streamlit as st
@@ -39,6 +55,21 @@ SLUG_RE = re.compile(r"^[A-Za-z0-9_-]{6,16}$")
 SLUG_LEN = 8
 SLUG_RETRIES = 5
 HTTP_TIMEOUT = 15
+HTTP_POOL_SIZE = 10  # keep-alive connections shared by every session
+HTTP_ATTEMPTS = 3
+HTTP_BACKOFF = 0.25  # seconds, scaled by attempt number and jittered
+RETRY_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "PATCH", "DELETE"}
+LATENCY_SAMPLES = 200  # recent requests kept per operation
+HTTP_STATS_LOG_INTERVAL = 300  # seconds between logged http_stats() summaries
+ROW_CACHE_TTL = 60  # seconds a fetched saved list is served from memory
+ROW_CACHE_MISS_TTL = 15  # seconds an unknown slug is remembered as missing
+ROW_CACHE_MAX = 2048  # slugs kept at most
+VIEW_FLUSH_INTERVAL = 10  # seconds between view-count flushes
+VIEW_RPC = "increment_saved_list_views"
+VIEW_CAS_ATTEMPTS = 5  # compare-and-set tries per slug in the fallback
+
+_log = logging.getLogger(__name__)
 
 
 # ─── Config / client ─────────────────────────────────────────────────────────
@@ -145,10 +176,180 @@ def _payload_size_ok(payload: dict) -> bool:
 
 # ─── HTTP helpers ────────────────────────────────────────────────────────────
 
-def _http(method: str, url: str, cfg: dict, **kwargs):
+def _percentile_ms(sorted_seconds, q):
+    if not sorted_seconds:
+        return None
+    return round(sorted_seconds[min(int(q * len(sorted_seconds)), len(sorted_seconds) - 1)] * 1000, 1)
+
+
+class _HttpMetrics:
+    """Thread-safe per-operation request counters and recent latencies."""
+
+    def __init__(self, samples=LATENCY_SAMPLES, log_interval=HTTP_STATS_LOG_INTERVAL):
+        self._samples = samples
+        self._log_interval = log_interval
+        self._last_logged = time.monotonic()
+        self._lock = threading.Lock()
+        self._ops = {}
+
+    def record(self, op, seconds, ok, retries):
+        """Record one request. Returns True when a stats summary is due to be logged."""
+        with self._lock:
+            entry = self._ops.setdefault(
+                op, {"requests": 0, "errors": 0, "retries": 0, "latencies": deque(maxlen=self._samples)}
+            )
+            entry["requests"] += 1
+            entry["errors"] += 0 if ok else 1
+            entry["retries"] += retries
+            entry["latencies"].append(seconds)
+            now = time.monotonic()
+            if now - self._last_logged < self._log_interval:
+                return False
+            self._last_logged = now
+            return True
+
+    def stats(self):
+        """{op: {requests, errors, retries, p50_ms, p95_ms, max_ms}} over recent requests."""
+        out = {}
+        with self._lock:
+            for op, entry in self._ops.items():
+                lat = sorted(entry["latencies"])
+                out[op] = {
+                    "requests": entry["requests"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "p50_ms": _percentile_ms(lat, 0.5),
+                    "p95_ms": _percentile_ms(lat, 0.95),
+                    "max_ms": _percentile_ms(lat, 1.0),
+                }
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+def _get_http_client():
+    """Process-wide (session, metrics): one keep-alive pool for every Supabase call."""
+    session = _requests.Session()
+    adapter = _requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, pool_block=True
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session, _HttpMetrics()
+
+
+def http_stats() -> dict:
+    """Per-operation request counts, retries and latency percentiles for this process."""
+    if _requests is None:
+        return {}
+    return _get_http_client()[1].stats()
+
+
+def _log_http_stats() -> None:
+    for op, stats in sorted(http_stats().items()):
+        _log.info(
+            "Supabase %s: %d requests, %d errors, %d retries, p50 %s ms, p95 %s ms, max %s ms",
+            op, stats["requests"], stats["errors"], stats["retries"],
+            stats["p50_ms"], stats["p95_ms"], stats["max_ms"],
+        )
+
+
+def _never_sent(error: Exception) -> bool:
+    """
+    Whether a request failed provably before it was sent. Only a connect
+    timeout qualifies: other connection errors (aborted or dropped
+    connections) and read timeouts may follow a request the server handled.
+    """
+    return isinstance(error, _requests.ConnectTimeout)
+
+
+def _should_retry(idempotent: bool, response=None, error: Exception | None = None) -> bool:
+    if error is not None:
+        if _never_sent(error):
+            return True
+        return idempotent and isinstance(error, (_requests.ConnectionError, _requests.Timeout))
+    return idempotent and response.status_code in RETRY_STATUSES
+
+
+def _http(method: str, url: str, cfg: dict, op: str | None = None, idempotent: bool | None = None, **kwargs):
+    """
+    Send a request over the shared session. Connect timeouts, and connection
+    errors, timeouts or 5xx answers to idempotent requests (by default the
+    IDEMPOTENT_METHODS), are retried with jittered backoff. Request metrics
+    are logged every HTTP_STATS_LOG_INTERVAL. The final response is returned
+    (or the final exception raised).
+    """
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    session, metrics = _get_http_client()
     headers = dict(cfg["headers"])
     headers.update(kwargs.pop("headers", {}))
-    return _requests.request(method, url, headers=headers, timeout=HTTP_TIMEOUT, **kwargs)
+    op = op or method.lower()
+    start = time.monotonic()
+    for attempt in range(HTTP_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0.5, 1.5) * HTTP_BACKOFF * attempt)
+        last_try = attempt == HTTP_ATTEMPTS - 1
+        try:
+            r = session.request(method, url, headers=headers, timeout=HTTP_TIMEOUT, **kwargs)
+        except _requests.RequestException as e:
+            if last_try or not _should_retry(idempotent, error=e):
+                if metrics.record(op, time.monotonic() - start, False, attempt):
+                    _log_http_stats()
+                raise
+            continue
+        if last_try or not _should_retry(idempotent, response=r):
+            if metrics.record(op, time.monotonic() - start, r.status_code < 500, attempt):
+                _log_http_stats()
+            return r
+
+
+# ─── Row cache ───────────────────────────────────────────────────────────────
+
+class _RowCache:
+    """
+    Thread-safe LRU of saved-list rows by slug with a TTL. Unknown slugs are
+    cached as None for a shorter time. Writes made by this process replace
+    their entry immediately; other processes see them once the TTL lapses.
+    Cached rows are shared between sessions and must not be mutated.
+    """
+
+    def __init__(self, ttl=ROW_CACHE_TTL, miss_ttl=ROW_CACHE_MISS_TTL, max_entries=ROW_CACHE_MAX):
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, slug):
+        """Return (hit, row); row is None for a cached miss."""
+        with self._lock:
+            entry = self._rows.get(slug)
+            if entry is None:
+                return False, None
+            expires, row = entry
+            if expires <= time.monotonic():
+                del self._rows[slug]
+                return False, None
+            self._rows.move_to_end(slug)
+            return True, row
+
+    def put(self, slug, row):
+        ttl = self.ttl if row is not None else self.miss_ttl
+        with self._lock:
+            self._rows[slug] = (time.monotonic() + ttl, row)
+            self._rows.move_to_end(slug)
+            while len(self._rows) > self.max_entries:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, slug):
+        with self._lock:
+            self._rows.pop(slug, None)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_row_cache():
+    """The process-wide _RowCache."""
+    return _RowCache()
 
 
 # ─── Public API ──────────────────────────────────────────────────────────────
@@ -191,6 +392,7 @@ def create_saved_list(
                 "POST",
                 _endpoint(cfg),
                 cfg,
+                op="create",
                 json=row,
                 headers={"Prefer": "return=representation"},
             )
@@ -198,6 +400,7 @@ def create_saved_list(
             return False, None, f"Network error contacting database: {e}"
 
         if r.status_code in (200, 201):
+            _get_row_cache().invalidate(slug)
             return True, {"slug": slug, "edit_token": edit_token}, None
 
         # 409/23505 = unique violation on slug → retry with new slug
@@ -213,18 +416,26 @@ def create_saved_list(
 
 
 def get_saved_list_by_slug(slug: str) -> tuple[bool, dict | None, str | None]:
-    """Fetch a saved list. Returns (ok, row_dict | None, error)."""
+    """
+    Fetch a saved list, served from the process-wide cache when fresh.
+    Returns (ok, row_dict | None, error); the row is shared and read-only.
+    """
     cfg = _cfg()
     if not cfg or not _requests:
         return False, None, "Saved-list feature is not configured."
     if not is_valid_slug(slug):
         return False, None, "Invalid share link."
+    cache = _get_row_cache()
+    hit, row = cache.get(slug)
+    if hit:
+        return True, row, None
 
     try:
         r = _http(
             "GET",
             _endpoint(cfg),
             cfg,
+            op="read",
             params={"slug": f"eq.{slug}", "select": "*", "limit": 1},
         )
     except Exception as e:
@@ -233,9 +444,9 @@ def get_saved_list_by_slug(slug: str) -> tuple[bool, dict | None, str | None]:
     if r.status_code != 200:
         return False, None, f"Database error ({r.status_code})."
     rows = r.json() or []
-    if not rows:
-        return True, None, None
-    return True, rows[0], None
+    row = rows[0] if rows else None
+    cache.put(slug, row)
+    return True, row, None
 
 
 def update_saved_list_with_token(
@@ -270,11 +481,13 @@ def update_saved_list_with_token(
     if title is not None:
         update_row["title"] = title or None
 
+    _get_row_cache().invalidate(slug)  # Even a failed request may have reached the database
     try:
         r = _http(
             "PATCH",
             _endpoint(cfg),
             cfg,
+            op="update",
             params={
                 "slug": f"eq.{slug}",
                 "edit_token_hash": f"eq.{_hash_token(edit_token)}",
@@ -294,6 +507,7 @@ def update_saved_list_with_token(
         rows = []
     if not rows:
         return False, "Edit code did not match this saved list."
+    _get_row_cache().put(slug, rows[0])
     return True, None
 
 
@@ -309,11 +523,13 @@ def delete_saved_list_with_token(
     if not edit_token:
         return False, "Edit code is required."
 
+    _get_row_cache().invalidate(slug)  # Even a failed request may have reached the database
     try:
         r = _http(
             "DELETE",
             _endpoint(cfg),
             cfg,
+            op="delete",
             params={
                 "slug": f"eq.{slug}",
                 "edit_token_hash": f"eq.{_hash_token(edit_token)}",
@@ -332,36 +548,179 @@ def delete_saved_list_with_token(
         rows = []
     if not rows:
         return False, "Edit code did not match this saved list."
+    _get_row_cache().put(slug, None)
     return True, None
 
 
+# ─── View counts ─────────────────────────────────────────────────────────────
+
+class _ViewCounter:
+    """
+    Per-slug view increments buffered in memory and flushed by a daemon
+    thread as one batched RPC, so opening a share link never waits on a write.
+    Counts from a flush that provably did not reach the database are put back
+    and retried on the next one; counts whose write may have been applied
+    (see _never_sent) are dropped instead, so views are never counted twice.
+    """
+
+    def __init__(self, interval=VIEW_FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending = {}
+        self._cfg = None
+        self._rpc_available = True
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def add(self, slug, cfg):
+        with self._lock:
+            self._pending[slug] = self._pending.get(slug, 0) + 1
+            self._cfg = cfg
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="saved-list-views", daemon=True)
+                self._thread.start()
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def _requeue(self, counts):
+        with self._lock:
+            for slug, n in counts.items():
+                self._pending[slug] = self._pending.get(slug, 0) + n
+
+    def _unknown_outcome(self, error, counts):
+        """Log counts whose write may or may not have been applied; they are not retried."""
+        _log.warning(
+            "View count write for %d slug(s) failed with an unknown outcome (%s); "
+            "dropping %d view(s) rather than risk counting them twice.",
+            len(counts), type(error).__name__, sum(counts.values()),
+        )
+
+    def _increment_rpc(self, cfg, counts):
+        try:
+            r = _http(
+                "POST",
+                f"{cfg['url']}/rest/v1/rpc/{VIEW_RPC}",
+                cfg,
+                op="view_count_flush",
+                json={"slugs": list(counts), "counts": list(counts.values())},
+            )
+        except _requests.RequestException as e:
+            if _never_sent(e):
+                raise
+            self._unknown_outcome(e, counts)
+            return True
+        if r.status_code == 404:
+            self._rpc_available = False  # Function not deployed; use the fallback from now on
+            _log.warning(
+                "%s RPC not found; falling back to per-slug compare-and-set view counts. "
+                "Apply supabase/migrations/20261016000000_increment_saved_list_views.sql.",
+                VIEW_RPC,
+            )
+            return False
+        return r.status_code in (200, 204)
+
+    def _increment_one(self, cfg, slug, n):
+        """
+        Add n to one slug's view_count with a PATCH conditioned on the value
+        just read; a conflict (no row matched) re-reads and tries again.
+        Returns True once written (or the list is gone, or the PATCH may have
+        been applied). The PATCH is not retried by _http: a resend after a
+        committed attempt would match no row and look like a conflict.
+        """
+        for _ in range(VIEW_CAS_ATTEMPTS):
+            r = _http(
+                "GET",
+                _endpoint(cfg),
+                cfg,
+                op="view_count_read",
+                params={"slug": f"eq.{slug}", "select": "view_count", "limit": 1},
+            )
+            if r.status_code != 200:
+                return False
+            rows = r.json() or []
+            if not rows:
+                return True  # Deleted since it was viewed
+            cur = rows[0].get("view_count")
+            try:
+                r = _http(
+                    "PATCH",
+                    _endpoint(cfg),
+                    cfg,
+                    op="view_count_write",
+                    idempotent=False,
+                    params={
+                        "slug": f"eq.{slug}",
+                        "view_count": "is.null" if cur is None else f"eq.{int(cur)}",
+                    },
+                    json={
+                        "view_count": int(cur or 0) + n,
+                        "last_viewed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    },
+                    headers={"Prefer": "return=representation"},
+                )
+            except _requests.RequestException as e:
+                if _never_sent(e):
+                    raise
+                self._unknown_outcome(e, {slug: n})
+                return True
+            if r.status_code != 200:
+                return False
+            if r.json():
+                return True
+            # No row matched: another writer changed view_count since the read
+        return False
+
+    def _increment_each(self, cfg, counts):
+        """Fallback without the RPC: compare-and-set each slug's delta. Returns the failed counts."""
+        failed = {}
+        for slug, n in counts.items():
+            try:
+                if not self._increment_one(cfg, slug, n):
+                    failed[slug] = n
+            except Exception:
+                failed[slug] = n
+        return failed
+
+    def flush(self):
+        """Write every buffered increment now. Returns the number of views flushed."""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._pending = self._pending, {}
+                cfg = self._cfg
+            if not counts or not cfg:
+                return 0
+            try:
+                if self._rpc_available and self._increment_rpc(cfg, counts):
+                    failed = {}
+                elif self._rpc_available:
+                    failed = counts
+                else:
+                    failed = self._increment_each(cfg, counts)
+            except Exception:
+                failed = counts
+            self._requeue(failed)
+            return sum(counts.values()) - sum(failed.values())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_view_counter():
+    """The process-wide _ViewCounter, flushed once more when the process exits."""
+    counter = _ViewCounter()
+    atexit.register(counter.flush)
+    return counter
+
+
 def increment_view_count(slug: str) -> None:
-    """Best-effort: bump view_count and last_viewed_at. Silently ignores errors."""
+    """Best-effort: buffer a view of slug; it is written on the next periodic flush."""
     cfg = _cfg()
     if not cfg or not _requests or not is_valid_slug(slug):
         return
-    try:
-        r = _http(
-            "GET",
-            _endpoint(cfg),
-            cfg,
-            params={"slug": f"eq.{slug}", "select": "view_count", "limit": 1},
-        )
-        if r.status_code != 200:
-            return
-        rows = r.json() or []
-        if not rows:
-            return
-        cur = int(rows[0].get("view_count") or 0)
-        _http(
-            "PATCH",
-            _endpoint(cfg),
-            cfg,
-            params={"slug": f"eq.{slug}"},
-            json={
-                "view_count": cur + 1,
-                "last_viewed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            },
-        )
-    except Exception:
-        return
+    _get_view_counter().add(slug, cfg)
+
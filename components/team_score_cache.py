@@ -0,0 +1,111 @@
+"""
+Team Score Cache - Shared, precomputed team-score distributions.
+The score of every same-size team depends only on the hero stat matrix, the
+weight vector, the team size and whether synergy is applied, so the sorted
+population is computed once per fingerprint and shared across all sessions
+(scoring.shared_by_fingerprint, LRU-evicted). Tier thresholds and rank lookups are
+binary searches over the sorted scores, and random teams are sampled straight
+from a tier band without building any list of teams.
+"""
+
+import numpy as np
+from components.scoring import HERO_TIER_STD_BOUNDS, TIERS_WORST_FIRST, shared_by_fingerprint, tier_thresholds
+from components.team_scoring import combination_indices, score_all_teams, score_teams, rank_team
+
+
+# Each 4-player distribution holds ~677k scores plus their sort order (~8 MB)
+_MAX_CACHED_DISTRIBUTIONS = 16
+
+
+class TeamScoreDistribution:
+    """Sorted scores of every possible team of one size, with tier lookups."""
+
+    def __init__(self, hero_matrix, weighting, team_size, synergy=True):
+        """hero_matrix is a scoring.HeroMatrix; teams are rows of its indices."""
+        self.hero_matrix = hero_matrix
+        self.weighting = np.array(weighting, dtype=float)
+        self.team_size = team_size
+        self.synergy = synergy
+        scores = score_all_teams(self.hero_matrix, self.weighting, team_size, synergy=synergy)
+        self.order = np.argsort(scores, kind="stable").astype(np.int32)
+        self.sorted_scores = scores[self.order]
+        self.thresholds = tier_thresholds(scores, HERO_TIER_STD_BOUNDS)
+        for arr in (self.weighting, self.order, self.sorted_scores, self.thresholds):
+            arr.setflags(write=False)
+
+    def __len__(self):
+        return len(self.sorted_scores)
+
+    def tier_of(self, score):
+        """Tier letter for a score (a score on a threshold belongs to the higher tier)."""
+        return TIERS_WORST_FIRST[int(np.searchsorted(self.thresholds, score, side="right"))]
+
+    def rank(self, score):
+        """Return (rank, total_teams, percentile) of score within the population."""
+        return rank_team(self.sorted_scores, score)
+
+    def tier_bounds(self, tier):
+        """Return the half-open score interval [lo, hi) covered by tier."""
+        i = TIERS_WORST_FIRST.index(tier)
+        lo = -np.inf if i == 0 else float(self.thresholds[i - 1])
+        hi = np.inf if i == len(TIERS_WORST_FIRST) - 1 else float(self.thresholds[i])
+        return lo, hi
+
+    def tier_band(self, tier):
+        """
+        Return the [start, stop) slice of sorted_scores that falls in tier.
+        self.order[start:stop] are the matching rows of combination_indices.
+        """
+        lo, hi = self.tier_bounds(tier)
+        start = int(np.searchsorted(self.sorted_scores, lo, side="left"))
+        stop = int(np.searchsorted(self.sorted_scores, hi, side="left"))
+        return start, stop
+
+    def sample_team(self, tier, locked_idx=(), rng=None):
+        """
+        Uniformly pick one team in tier that contains every hero in locked_idx
+        (hero_matrix row indices).
+
+        Without locks the pick is a single index into the tier band. With locks
+        only the remaining slots are scored, over the cached combination index
+        of the unlocked heroes, and one match is drawn from the score mask.
+
+        Returns: (team row indices or None, number of matching teams)
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n_heroes = len(self.hero_matrix)
+        locked_idx = np.asarray(locked_idx, dtype=np.intp)
+
+        if len(locked_idx) == 0:
+            start, stop = self.tier_band(tier)
+            if stop == start:
+                return None, 0
+            row = self.order[start + int(rng.integers(stop - start))]
+            return combination_indices(n_heroes, self.team_size)[row].astype(np.intp), stop - start
+
+        free_idx = np.setdiff1d(np.arange(n_heroes), locked_idx)
+        slots = self.team_size - len(locked_idx)
+        rest = free_idx[combination_indices(len(free_idx), slots)]
+        combos = np.hstack([np.broadcast_to(locked_idx, (len(rest), len(locked_idx))), rest])
+        scores = score_teams(
+            self.hero_matrix, combos, self.weighting, self.team_size, synergy=self.synergy
+        )[2]
+        lo, hi = self.tier_bounds(tier)
+        matches = np.flatnonzero((scores >= lo) & (scores < hi))
+        if len(matches) == 0:
+            return None, 0
+        return combos[matches[int(rng.integers(len(matches)))]], len(matches)
+
+
+@shared_by_fingerprint(max_entries=_MAX_CACHED_DISTRIBUTIONS)
+def _build_distribution(hero_matrix, weighting, team_size, synergy):
+    return TeamScoreDistribution(hero_matrix, weighting, team_size, synergy=synergy)
+
+
+def get_team_score_distribution(hero_matrix, weighting, team_size, synergy=True):
+    """
+    Get the (shared, read-only) distribution of scores for every team of team_size.
+    Sessions using the same stats and weights reuse a single computation.
+    """
+    weighting = np.asarray(weighting, dtype=float)
+    return _build_distribution(hero_matrix, weighting, int(team_size), bool(synergy))
@@ -0,0 +1,137 @@
+"""
+Team Scoring - Vectorized scoring of every possible team of a given size.
+Builds the combination index once as an integer array and computes the base
+score and all synergy terms for every team with array operations over a
+scoring.HeroMatrix, instead of looping over itertools.combinations. Teams
+are rows of hero indices into that matrix.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from data.preset_options import preset_options
+
+
+# Stat indices used by the synergy terms (see data.constants.STAT_NAMES)
+RELIABILITY_IDX = 6
+SUPPORT_BOON_IDX = 9
+LATE_GAME_IDX = 11
+MULTIPLAYER_IDX = 14
+CORE_STAT_COUNT = 8  # Economy .. Minion Control
+
+
+def get_preset_for_team_size(team_size):
+    """Get the appropriate preset based on team size."""
+    if team_size == 1:
+        return np.array(preset_options["Solo (No Rush)"])
+    elif team_size == 2:
+        return np.array(preset_options["General Power: 2 Player"])
+    elif team_size == 3:
+        return np.array(preset_options["Multiplayer: 3 Player"])
+    else:  # 4 player
+        return np.array(preset_options["Multiplayer: 4 Player"])
+
+
+@lru_cache(maxsize=8)
+def combination_indices(n_heroes, team_size):
+    """
+    Return every team_size-combination of range(n_heroes) as an int16 array
+    of shape (C(n_heroes, team_size), team_size), in the same lexicographic
+    order as itertools.combinations. The result is cached and read-only.
+    """
+    combos = np.arange(n_heroes, dtype=np.int16)[:, None]
+    for _ in range(team_size - 1):
+        last = combos[:, -1].astype(np.intp)
+        counts = n_heroes - 1 - last
+        total = int(counts.sum())
+        # For each row, the next member runs from last + 1 up to n_heroes - 1
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        nxt = np.repeat(last + 1, counts) + (np.arange(total) - starts)
+        combos = np.hstack([
+            np.repeat(combos, counts, axis=0),
+            nxt.astype(np.int16)[:, None],
+        ])
+    combos.setflags(write=False)
+    return combos
+
+
+def team_synergy(hero_matrix, combos, team_size):
+    """
+    Calculate the team synergy bonus (0-40% multiplier) for every row of combos.
+    Synergy is based on how well heroes complement each other's strengths and weaknesses.
+
+    Returns: float array of synergy multipliers (0.0 to 0.4), one per team
+    """
+    if team_size == 1:
+        return np.zeros(len(combos))  # No synergy for solo teams
+    stats = hero_matrix.matrix
+
+    def team_mean(per_hero):
+        return per_hero[combos].sum(axis=1) / team_size
+
+    # 1. Support synergy: Support heroes pair well with late game heroes
+    support_late = stats[:, SUPPORT_BOON_IDX] + stats[:, LATE_GAME_IDX]
+    support_synergy = np.minimum(team_mean(support_late) / 100 * 0.12, 0.12)  # Cap at 12%
+
+    # 2. Reliability synergy: Consistent heroes boost team stability
+    reliability_synergy = (team_mean(stats[:, RELIABILITY_IDX]) / 6.0) * 0.08  # Up to 8%
+
+    # 3. Multiplayer consistency synergy: Bonus for teams designed for multi-player
+    if team_size >= 3:
+        multiplayer_synergy = np.minimum(team_mean(stats[:, MULTIPLAYER_IDX]) * 0.01, 0.12)
+    else:
+        multiplayer_synergy = 0.0
+
+    # 4. Balance synergy: std over every core stat of every member, from running sums
+    core = stats[:, :CORE_STAT_COUNT]
+    n_values = team_size * CORE_STAT_COUNT
+    mean_core = core.sum(axis=1)[combos].sum(axis=1) / n_values
+    mean_sq_core = (core ** 2).sum(axis=1)[combos].sum(axis=1) / n_values
+    stat_std = np.sqrt(np.maximum(mean_sq_core - mean_core ** 2, 0.0))
+    balance_synergy = np.minimum((stat_std / 3.0) * 0.08, 0.08)  # Up to 8%
+
+    # Combine all synergies (cap at 40%)
+    return np.minimum(
+        support_synergy + reliability_synergy + multiplayer_synergy + balance_synergy,
+        0.40,
+    )
+
+
+def score_teams(hero_matrix, combos, weighting, team_size, synergy=True):
+    """
+    Score every team in combos (an integer array of HeroMatrix row indices).
+
+    Returns: (base_scores, synergy_multipliers, final_scores) float arrays
+    """
+    combos = np.asarray(combos)
+    hero_scores = hero_matrix.scores(weighting)
+    base_scores = hero_scores[combos].sum(axis=1) / team_size
+    if synergy:
+        multipliers = team_synergy(hero_matrix, combos, team_size)
+    else:
+        multipliers = np.zeros(len(combos))
+    return base_scores, multipliers, base_scores * (1.0 + multipliers)
+
+
+def score_all_teams(hero_matrix, weighting, team_size, synergy=True):
+    """
+    Final score of every possible team of team_size, aligned with
+    combination_indices(len(hero_matrix), team_size).
+    """
+    combos = combination_indices(len(hero_matrix), team_size)
+    return score_teams(hero_matrix, combos, weighting, team_size, synergy)[2]
+
+
+def rank_team(sorted_scores, team_score):
+    """
+    Rank team_score against a population of team scores sorted ascending,
+    using a binary search.
+
+    Returns: (rank, total_teams, percentile) where rank 1 is best and
+    percentile is the share of teams that do not score higher (0-100).
+    """
+    total = len(sorted_scores)
+    if total == 0:
+        return 1, 1, 100.0
+    higher = total - int(np.searchsorted(sorted_scores, team_score, side="right"))
+    return higher + 1, total, 100.0 * (total - higher) / total
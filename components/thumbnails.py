@@ -0,0 +1,330 @@
+"""
+Card Thumbnails - Pre-scaled card images and sprite sheets for the HTML tier-list views.
+The full-size card JPEGs under images/ are ~400 KB each. The HTML tier views
+only ever show them 120 px tall (or the top 74 px in compact mode), so this
+module writes WebP thumbnails at exactly those sizes (plus 2x for high-DPI
+screens) under static/thumbs/, then packs them into one sprite sheet per
+subject type (heroes, villains) and variant with a JSON offset index.
+Streamlit serves that directory at app/static/ ([server] enableStaticServing),
+so a tier view is one cacheable image request plus a few KB of markup that
+slices it with CSS background-position.
+
+The generated files are committed, since Streamlit Cloud runs no build
+step. After adding or changing card images, rebuild them with:
+
+    python -m components.thumbnails
+
+and commit static/thumbs/ with the images.
+
+Missing or stale assets are also (re)built once per process by a background
+thread, never on a page render. Until a sheet is ready (or if it cannot be
+built, e.g. on a read-only filesystem) cards fall back to a plain <img> of
+the existing single thumbnail, or of the source image as a data URI.
+"""
+
+import base64
+import json
+import os
+import re
+import sys
+import threading
+from html import escape as html_escape
+
+import streamlit as st
+
+
+STATIC_DIR = "static"
+THUMBS_SUBDIR = "thumbs"
+STATIC_URL_PREFIX = "./app/static"
+
+# variant -> (display height of the full card, visible crop height or None)
+THUMB_VARIANTS = {
+    "card": (120, None),
+    "compact": (120, 74),
+}
+THUMB_SCALES = (1, 2)
+THUMB_FORMAT = "webp"
+THUMB_QUALITY = 80
+THUMB_METHOD = 4  # WebP encoder effort (0-6); 6 is several times slower for ~2% smaller files
+
+SPRITES_SUBDIR = "sprites"
+SPRITE_COLUMNS = 10
+SPRITE_KINDS = ("heroes", "villains")
+SPRITE_KINDS_VARIANTS = tuple((kind, variant) for kind in SPRITE_KINDS for variant in THUMB_VARIANTS)
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", text).strip("_")
+
+
+def thumbnail_path(src_path, variant="card", scale=1):
+    """Filesystem path of the thumbnail for a source image, variant and scale."""
+    folder = _slug(os.path.basename(os.path.dirname(src_path))).lower()
+    stem = _slug(os.path.splitext(os.path.basename(src_path))[0])
+    height, crop = THUMB_VARIANTS[variant]
+    size_tag = f"{variant}{(crop or height) * scale}"
+    return os.path.join(STATIC_DIR, THUMBS_SUBDIR, folder, f"{stem}_{size_tag}.{THUMB_FORMAT}")
+
+
+def _is_stale(src_path, out_path):
+    return not os.path.exists(out_path) or os.path.getmtime(out_path) < os.path.getmtime(src_path)
+
+
+def build_thumbnail(src_path, variant="card", scale=1, force=False):
+    """
+    Write one thumbnail if it is missing or older than its source.
+    Returns True if a file was written.
+    """
+    from PIL import Image
+
+    out_path = thumbnail_path(src_path, variant, scale)
+    if not force and not _is_stale(src_path, out_path):
+        return False
+
+    height, crop = THUMB_VARIANTS[variant]
+    target_h = height * scale
+    with Image.open(src_path) as src:
+        img = src.convert("RGB")
+    target_w = max(1, round(img.width * target_h / img.height))
+    img = img.resize((target_w, target_h), Image.LANCZOS)
+    if crop:
+        img = img.crop((0, 0, target_w, crop * scale))
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    img.save(tmp_path, format=THUMB_FORMAT.upper(), quality=THUMB_QUALITY, method=THUMB_METHOD)
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def _subject_images(kind):
+    """Return {subject name: source image path} for a sprite kind."""
+    if kind == "heroes":
+        from data.hero_image_urls import hero_image_urls
+        return hero_image_urls
+    from data.villain_image_urls import villain_image_urls
+    return villain_image_urls
+
+
+def _all_card_images():
+    paths = [p for kind in SPRITE_KINDS for p in _subject_images(kind).values()]
+    return [p for p in dict.fromkeys(paths) if p and os.path.exists(p)]
+
+
+def build_thumbnails(src_paths=None, force=False):
+    """Build every variant and scale for each source image. Returns the number written."""
+    written = 0
+    for src_path in (src_paths if src_paths is not None else _all_card_images()):
+        for variant in THUMB_VARIANTS:
+            for scale in THUMB_SCALES:
+                written += build_thumbnail(src_path, variant, scale, force=force)
+    return written
+
+
+def _static_url(out_path):
+    """Static URL of a generated file, with its mtime as a cache-busting version."""
+    rel = os.path.relpath(out_path, STATIC_DIR).replace(os.sep, "/")
+    return f"{STATIC_URL_PREFIX}/{rel}?v={int(os.path.getmtime(out_path))}"
+
+
+# ─── Sprite sheets ───
+
+def sprite_paths(kind, variant="card"):
+    """Return (1x sheet, 2x sheet, JSON index) filesystem paths for a sprite kind/variant."""
+    height, crop = THUMB_VARIANTS[variant]
+    base = os.path.join(STATIC_DIR, THUMBS_SUBDIR, SPRITES_SUBDIR, f"{kind}_{variant}{crop or height}")
+    return f"{base}.{THUMB_FORMAT}", f"{base}@2x.{THUMB_FORMAT}", f"{base}.json"
+
+
+def build_sprite_sheet(kind, variant="card", force=False):
+    """
+    Pack the 1x and 2x thumbnails of every subject of kind into a grid sheet
+    and write the offset index {"size": [w, h], "cells": {name: [x, y, w, h]},
+    "sources": {name: [source file, bytes]}} in 1x CSS pixels. The sheet is
+    rebuilt when a thumbnail was rewritten or the sources differ from the
+    index, not by file times, so a checked-out sheet is reused as it is.
+    Returns True if the sheet was (re)built.
+    """
+    from PIL import Image
+
+    sheet_path, sheet_2x_path, index_path = sprite_paths(kind, variant)
+    subjects = {
+        name: path for name, path in _subject_images(kind).items()
+        if path and os.path.exists(path)
+    }
+    sources = {
+        name: [os.path.basename(path), os.path.getsize(path)] for name, path in subjects.items()
+    }
+    written = 0
+    for path in subjects.values():
+        for scale in THUMB_SCALES:
+            written += build_thumbnail(path, variant, scale)
+
+    thumbs = {name: [thumbnail_path(path, variant, s) for s in THUMB_SCALES] for name, path in subjects.items()}
+    if not force and not written and all(os.path.exists(p) for p in (sheet_path, sheet_2x_path, index_path)):
+        with open(index_path, "r", encoding="utf-8") as f:
+            if json.load(f).get("sources") == sources:
+                return False
+
+    tiles = {}
+    for name, (path_1x, path_2x) in thumbs.items():
+        with Image.open(path_1x) as t1, Image.open(path_2x) as t2:
+            tiles[name] = (t1.convert("RGB"), t2.convert("RGB"))
+
+    cell_w = max((t1.width for t1, _ in tiles.values()), default=1)
+    cell_h = max((t1.height for t1, _ in tiles.values()), default=1)
+    n_rows = max(1, -(-len(tiles) // SPRITE_COLUMNS))
+    size = (SPRITE_COLUMNS * cell_w, n_rows * cell_h)
+    sheet = Image.new("RGB", size)
+    sheet_2x = Image.new("RGB", (size[0] * 2, size[1] * 2))
+
+    cells = {}
+    for i, (name, (t1, t2)) in enumerate(sorted(tiles.items())):
+        x, y = (i % SPRITE_COLUMNS) * cell_w, (i // SPRITE_COLUMNS) * cell_h
+        sheet.paste(t1, (x, y))
+        if t2.size != (t1.width * 2, t1.height * 2):
+            t2 = t2.resize((t1.width * 2, t1.height * 2), Image.LANCZOS)
+        sheet_2x.paste(t2, (x * 2, y * 2))
+        cells[name] = [x, y, t1.width, t1.height]
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    for img, out_path in ((sheet, sheet_path), (sheet_2x, sheet_2x_path)):
+        tmp_path = out_path + ".tmp"
+        img.save(tmp_path, format=THUMB_FORMAT.upper(), quality=THUMB_QUALITY, method=THUMB_METHOD)
+        os.replace(tmp_path, out_path)
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"size": list(size), "cells": cells, "sources": sources}, f, separators=(",", ":"))
+    os.replace(index_path + ".tmp", index_path)
+    return True
+
+
+def build_sprite_sheets(force=False):
+    """Build every sprite sheet (and the thumbnails behind it). Returns the number rebuilt."""
+    return sum(build_sprite_sheet(kind, variant, force=force) for kind, variant in SPRITE_KINDS_VARIANTS)
+
+
+class _SpriteSheets:
+    """
+    Process-wide sprite sheet indexes. A daemon thread (re)builds any missing
+    or stale sheet; meanwhile an existing sheet is served as it is, and its
+    index is re-read whenever the file changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {}  # (kind, variant) -> (index mtime, index)
+        threading.Thread(target=self._build, name="sprite-sheets", daemon=True).start()
+
+    def _build(self):
+        for kind, variant in SPRITE_KINDS_VARIANTS:
+            try:
+                build_sprite_sheet(kind, variant)
+            except Exception:
+                pass  # Cards keep using the <img> fallback
+
+    def get(self, kind, variant):
+        sheet_path, sheet_2x_path, index_path = sprite_paths(kind, variant)
+        try:
+            mtime = os.path.getmtime(index_path)
+            with self._lock:
+                cached = self._indexes.get((kind, variant))
+            if cached and cached[0] == mtime:
+                return cached[1]
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            index["url"] = _static_url(sheet_path)
+            index["url_2x"] = _static_url(sheet_2x_path)
+        except (OSError, ValueError):
+            return None  # Not built yet
+        index["css_class"] = f"sprite-{kind}-{variant}"
+        with self._lock:
+            self._indexes[(kind, variant)] = (mtime, index)
+        return index
+
+
+@st.cache_resource(show_spinner=False)
+def _get_sprite_sheets():
+    """The process-wide _SpriteSheets (starts the background build)."""
+    return _SpriteSheets()
+
+
+def load_sprite_sheet(kind, variant="card"):
+    """
+    The sheet's index with its static URLs attached, or None while it is not
+    built yet (or cannot be). Never builds on the calling thread.
+    """
+    return _get_sprite_sheets().get(kind, variant)
+
+
+def sprite_css(kind, variant="card"):
+    """<style> block defining the background of one sprite sheet's cards."""
+    index = load_sprite_sheet(kind, variant)
+    if not index:
+        return ""
+    w, h = index["size"]
+    return (
+        f'<style>.{index["css_class"]}{{'
+        f'background-image:url("{index["url"]}");'
+        f'background-image:image-set(url("{index["url"]}") 1x,url("{index["url_2x"]}") 2x);'
+        f'background-size:{w}px {h}px;background-repeat:no-repeat;display:block;}}</style>'
+    )
+
+
+def _fallback_card_src(src_path):
+    """
+    Image src for a card the sprite sheet does not cover: the static URL of
+    its full-card thumbnail if one has been built, else the source image as
+    a data URI. Nothing is written here; thumbnails come from the background
+    build or a prebuild.
+    """
+    thumb_path = thumbnail_path(src_path, "card")
+    if os.path.exists(thumb_path):
+        return _static_url(thumb_path)
+    return _data_uri(src_path)
+
+
+@st.cache_resource(show_spinner=False)
+def _data_uri(src_path):
+    ext = os.path.splitext(src_path)[1].lower().lstrip(".")
+    mime = {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "gif": "gif", "webp": "webp"}.get(ext, "jpeg")
+    with open(src_path, "rb") as f:
+        return f"data:image/{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def _fallback_card_html(kind, variant, name, extra_style=""):
+    """A single card as a plain <img> (cropped for compact variants), or "" if it has no source image."""
+    src_path = _subject_images(kind).get(name)
+    if not src_path or not os.path.exists(src_path):
+        return ""
+    height, crop = THUMB_VARIANTS[variant]
+    safe_name = html_escape(name, quote=True)
+    return (
+        f'<div class="card-sprite" style="height:{crop or height}px;overflow:hidden;{extra_style}">'
+        f'<img src="{_fallback_card_src(src_path)}" alt="{safe_name}" '
+        f'style="display:block;height:{height}px;width:auto;"></div>'
+    )
+
+
+def sprite_card_html(kind, variant, name, extra_style=""):
+    """
+    A single card as a CSS slice of the sprite sheet, or "" if it has no image.
+    Include sprite_css(kind, variant) once in the same markup. Falls back to a
+    plain <img> if the sheet is unavailable or does not contain the card.
+    """
+    index = load_sprite_sheet(kind, variant)
+    cell = index["cells"].get(name) if index else None
+    if not cell:
+        return _fallback_card_html(kind, variant, name, extra_style)
+    x, y, w, h = cell
+    safe_name = html_escape(name, quote=True)
+    return (
+        f'<div class="card-sprite {index["css_class"]}" role="img" aria-label="{safe_name}" '
+        f'style="width:{w}px;height:{h}px;background-position:-{x}px -{y}px;{extra_style}"></div>'
+    )
+
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv
+    count = build_thumbnails(force=force)
+    sheets = build_sprite_sheets(force=force)
+    print(f"Wrote {count} thumbnail(s) and {sheets} sprite sheet(s) to {os.path.join(STATIC_DIR, THUMBS_SUBDIR)}")
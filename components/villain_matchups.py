@@ -0,0 +1,94 @@
+"""
+Villain Matchups - Precomputed villain x hero score matrix.
+Every hero's score against every villain is one matrix product of the
+(n_villains x 15) villain weight table and the (n_heroes x 15) hero matrix,
+with each villain's tier assignment over the full roster computed alongside.
+The result depends only on the hero stats and the weight table, so it is
+computed once per fingerprint and shared across sessions (see
+scoring.shared_by_fingerprint); it is rebuilt only when hero stats change or
+a villain's weights are overridden (the Villain Tier List sliders).
+"""
+
+import numpy as np
+from data.villain_weights import villain_weights
+from components.scoring import (
+    HeroMatrix, TIERS, TIERS_WORST_FIRST, shared_by_fingerprint, tier_indices, tier_lists,
+)
+
+
+# Lower bound of each villain-specific tier in std devs from the mean, D to S (F is the rest)
+VILLAIN_TIER_STD_BOUNDS = [-2.0, -1.5, -0.5, 0.5, 1.5]
+# The std is not floored: when every hero scores the same (e.g. all weights
+# zero) every threshold equals the mean and the whole roster is S tier.
+VILLAIN_TIER_MIN_STD = 0.0
+
+_MAX_CACHED_MATRICES = 16
+
+
+class VillainMatchups:
+    """Scores, tiers and z-scores of every hero against every villain."""
+
+    def __init__(self, hero_matrix, villain_names, weight_table):
+        self.heroes = hero_matrix
+        self.villain_names = tuple(villain_names)
+        self.villain_index = {name: i for i, name in enumerate(self.villain_names)}
+        self.weights = np.array(weight_table, dtype=float).reshape(len(self.villain_names), -1)
+        self.scores = hero_matrix.scores(self.weights)
+        self.tiers = tier_indices(self.scores, VILLAIN_TIER_STD_BOUNDS, VILLAIN_TIER_MIN_STD)
+        # Standing of each hero within a villain's row, comparable across villains
+        mean = self.scores.mean(axis=1, keepdims=True)
+        std = np.maximum(self.scores.std(axis=1, keepdims=True), 1e-6)
+        self.zscores = (self.scores - mean) / std
+        for arr in (self.weights, self.scores, self.tiers, self.zscores):
+            arr.setflags(write=False)
+
+    def score_dict(self, villain, heroes=None):
+        """{hero: score} against villain, for every hero or only heroes."""
+        row = self.scores[self.villain_index[villain]]
+        if heroes is None:
+            return dict(zip(self.heroes.names, row.tolist()))
+        return dict(zip(heroes, row[self.heroes.rows(heroes)].tolist()))
+
+    def tier_lists(self, villain, heroes=None):
+        """
+        {tier: [(hero, score), ...]} against villain. Over the full roster this
+        reads the precomputed tiers; a subset of heroes is tiered on its own.
+        """
+        if heroes is not None and len(heroes) != len(self.heroes):
+            return tier_lists(self.score_dict(villain, heroes), VILLAIN_TIER_STD_BOUNDS, VILLAIN_TIER_MIN_STD)
+        v = self.villain_index[villain]
+        tiers = {t: [] for t in TIERS}
+        for hero, score, idx in zip(self.heroes.names, self.scores[v].tolist(), self.tiers[v].tolist()):
+            tiers[TIERS_WORST_FIRST[idx]].append((hero, score))
+        for members in tiers.values():
+            members.sort(key=lambda x: (-x[1], x[0]))
+        return tiers
+
+    def best_villains_for(self, hero, limit=None):
+        """
+        Villains ranked by how well hero stands against them relative to the
+        rest of the roster. Returns [(villain, zscore, tier letter)].
+        """
+        h = self.heroes.index[hero]
+        order = np.argsort(-self.zscores[:, h], kind="stable")[:limit]
+        return [
+            (self.villain_names[v], float(self.zscores[v, h]), TIERS_WORST_FIRST[int(self.tiers[v, h])])
+            for v in order
+        ]
+
+
+@shared_by_fingerprint(max_entries=_MAX_CACHED_MATRICES)
+def _build_matchups(hero_matrix, villain_names, weight_table):
+    return VillainMatchups(hero_matrix, villain_names, weight_table)
+
+
+def get_villain_matchups(heroes, overrides=None):
+    """
+    Shared, read-only VillainMatchups for the hero stats ({name: stats}) and
+    villain_weights, with overrides ({villain: weights}) replacing table rows.
+    """
+    villain_names = tuple(villain_weights)
+    table = np.array(
+        [(overrides or {}).get(v, villain_weights[v]) for v in villain_names], dtype=float
+    )
+    return _build_matchups(HeroMatrix(heroes), villain_names, table)
@@ -3,10 +3,13 @@ Community Tier List — Build your own tier list by placing heroes into tiers,
 reorder them within each tier, then submit. Scores interpolate within tiers.
 """
 
+from components.startup import page_started
+page_started("home")
+
 import streamlit as st
 import numpy as np
 import json
-import os
+from functools import partial
 from data.default_heroes import default_heroes
 from data.hero_image_urls import hero_image_urls
 from data.villain_image_urls import villain_image_urls
@@ -14,20 +17,21 @@ from data.constants import TIER_COLORS, HERO_ALTER_EGOS
 from data.preset_options import preset_options
 from data.hero_release_order import HERO_RELEASE_INDEX, HERO_WAVE, WAVE_ORDER, HERO_LEGACY, LEGACY_WAVE_ORDER
 from data.villain_release_order import VILLAIN_RELEASE_INDEX, VILLAIN_WAVE, VILLAIN_WAVE_ORDER, VILLAIN_LEGACY
-from components.github_storage import load_json, save_json
+from components.submission_store import (
+    PLAYER_COUNTS, PLAYER_COUNT_TYPES, submissions_key as _subs_key, merge_aggregates,
+)
+from components.community_snapshot import get_community_snapshot
+from components.submission_writer import get_submission_writer
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.hero_card_viewer import render_hero_card_viewer, show_hero_cards_button
 from components import supabase_saved_lists as saved_lists
+from components.thumbnails import sprite_css, sprite_card_html
+from components.image_cache import get_card_tile
+from components.community_aggregates import TIERS, add_submission, subject_averages, community_tiers
 
 render_nav_banner("home")
 
-TIERS = ["S", "A", "B", "C", "D", "F"]
-TIER_POINTS = {"S": 6, "A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
-RATINGS_FILE = "community_tier_lists.json"
 
-# Player count options (hero_power and villain_difficulty only)
-PLAYER_COUNTS = ["Any", "Solo", "2-Player", "3-4 Player"]
-PLAYER_COUNT_TYPES = {"hero_power", "villain_difficulty"}  # types that support player count
 
 # Tier list type options
 TIER_LIST_TYPES = {
@@ -45,12 +49,6 @@ _light = st.session_state.get("_light_mode", False)
 _tier_label_extra = "color:#fff !important;text-shadow:2px 2px 0 #000,-1px -1px 0 rgba(0,0,0,0.3);" if _light else ""
 
 # ─── Persistence helpers ───
-def _subs_key(player_count):
-    """Return the submissions key for a player count (e.g. 'submissions_solo')."""
-    if player_count == "Any":
-        return "submissions"
-    return f"submissions_{player_count.lower().replace('-', '')}"
-
 def _draft_key(tl_type, player_count="Any"):
     """Return the session-state key for a draft/undo bucket."""
     if tl_type in PLAYER_COUNT_TYPES:
@@ -64,89 +62,59 @@ def _draft_keys_for_type(tl_type):
     return [_draft_key(tl_type)]
 
 
-def _normalize_data(data):
-    """Ensure the community data matches the current schema."""
-    # Migrate old format to new format if needed
-    if "submissions" in data and not any(k in data for k in TIER_LIST_TYPES.keys()):
-        # Old format: {"submissions": [...]} -> move to hero_power
-        old_submissions = data.get("submissions", [])
-        data = {k: {"submissions": []} for k in TIER_LIST_TYPES.keys()}
-        data["hero_power"]["submissions"] = old_submissions
-    # Ensure all keys exist
-    for k in TIER_LIST_TYPES.keys():
-        if k not in data:
-            data[k] = {"submissions": []}
-        elif "submissions" not in data[k]:
-            data[k] = {"submissions": []}
-        # Ensure player-count sub-keys for applicable types
-        if k in PLAYER_COUNT_TYPES:
-            for pc in PLAYER_COUNTS:
-                sk = _subs_key(pc)
-                if sk not in data[k]:
-                    data[k][sk] = []
-    return data
-
-
-def load_data(include_sha=False):
-    data, sha = load_json(RATINGS_FILE, default={})
-    data = _normalize_data(data)
-    if include_sha:
-        return data, sha
-    return data
-
-
-def save_data(data, sha=None):
-    return save_json(data, RATINGS_FILE, sha=sha)
-
-
 def submit_data(tl_type, player_count, submission):
-    """Load the latest community data, merge the new submission, and save it."""
+    """
+    Queue the new submission with the process-wide writer, which batches it
+    with any concurrent submissions into its tier-list type / player-count
+    shard. Returns a SubmissionTicket immediately.
+    """
     supports_player_count = tl_type in PLAYER_COUNT_TYPES
     active_subs_key = _subs_key(player_count) if supports_player_count else "submissions"
-    last_error = "Could not save your submission."
-
-    for _ in range(3):
-        all_data, data_sha = load_data(include_sha=True)
-        data = all_data.get(tl_type, {"submissions": []})
-        data.setdefault(active_subs_key, []).append(submission)
-        if supports_player_count and active_subs_key != "submissions":
-            data.setdefault("submissions", []).append(submission)
-        all_data[tl_type] = data
-
-        saved, error_message, retryable = save_data(all_data, sha=data_sha)
-        if saved:
-            return True, all_data, None
+    return get_submission_writer().submit(tl_type, active_subs_key, submission)
 
-        last_error = error_message or last_error
-        if not retryable:
-            break
 
-    return False, None, last_error
-
-
-def interpolate_scores(submission):
-    """Given a submission {tier: [ordered heroes]}, return {hero: float score}.
-
-    Within each tier the top hero gets tier_base + 0.4 and the bottom gets
-    tier_base - 0.4, linearly interpolated. A single hero in a tier gets the
-    base value exactly.
+def _with_pending_submissions(aggregate, tl_type, player_count):
     """
-    hero_scores = {}
-    for tier in TIERS:
-        heroes = submission.get(tier, [])
-        base = TIER_POINTS[tier]
-        n = len(heroes)
-        for i, hero in enumerate(heroes):
-            if n == 1:
-                hero_scores[hero] = float(base)
-            else:
-                # i=0 is the best in the tier, i=n-1 is the worst
-                hero_scores[hero] = base + 0.4 - 0.8 * (i / (n - 1))
-    return hero_scores
+    Optimistically fold this session's not-yet-written submissions for the
+    shown list into aggregate. The shared snapshot aggregate is returned
+    as-is when nothing is pending, and copied before anything is added.
+    """
+    pending = [
+        ticket for ticket in st.session_state.pending_submissions.values()
+        if not ticket.done() and ticket.tl_type == tl_type
+        and (player_count == "Any" or ticket.subs_key == _subs_key(player_count))
+    ]
+    if not pending:
+        return aggregate
+    aggregate = merge_aggregates([aggregate])
+    for ticket in pending:
+        add_submission(aggregate, ticket.submission)
+    return aggregate
+
+
+@st.fragment(run_every=1.0)
+def _submission_status(submit_key):
+    """Poll a queued submission; rerun the page once it has been written or has failed."""
+    ticket = st.session_state.pending_submissions.get(submit_key)
+    if ticket is None:
+        return
+    if not ticket.done():
+        st.info("⏳ Saving your submission…")
+        return
+    del st.session_state.pending_submissions[submit_key]
+    if not ticket.ok:
+        st.session_state.submitted_types.discard(submit_key)
+    st.session_state.submit_results[submit_key] = (ticket.ok, ticket.error)
+    st.rerun()
 
 
+@st.cache_data(max_entries=32, show_spinner=False)
 def build_community_tier_png(tiers, tier_colors, subject_images, title="Community Tier List", compact=False):
-    """Render a tier list as a PNG image and return the bytes."""
+    """Render a tier list as a PNG image and return the bytes.
+
+    Memoized on the tier assignment and compact flag, so it only runs when a
+    download is requested for a list that hasn't been exported yet.
+    """
     from PIL import Image, ImageDraw, ImageFont
     import io as _io
 
@@ -197,21 +165,11 @@ def build_community_tier_png(tiers, tier_colors, subject_images, title="Communit
 
     tier_rgb = {t: color_to_rgb(c) for t, c in tier_colors.items()}
 
-    card_cache = {}
-    for _, _, names_in_row in all_rows:
-        for name in names_in_row:
-            if name in card_cache:
-                continue
-            img_path = subject_images.get(name, "")
-            if img_path and os.path.exists(img_path):
-                try:
-                    card_img = Image.open(img_path).convert("RGB")
-                    card_img = card_img.resize((card_w, full_card_h), Image.LANCZOS)
-                    if compact:
-                        card_img = card_img.crop((0, 0, card_w, card_h))
-                    card_cache[name] = card_img
-                except Exception:
-                    pass
+    card_crop = (0, 0, card_w, card_h) if compact else None
+    card_cache = {
+        name: get_card_tile(subject_images.get(name, ""), (card_w, full_card_h), card_crop)
+        for _, _, names_in_row in all_rows for name in names_in_row
+    }
 
     y = 0
     for tier_label, tier_letter, names_in_row in all_rows:
@@ -240,9 +198,6 @@ def build_community_tier_png(tiers, tier_colors, subject_images, title="Communit
 
 
 # ─── Session init ───
-if "community_tl_data" not in st.session_state:
-    st.session_state.community_tl_data = load_data()
-
 if "tier_list_type" not in st.session_state:
     st.session_state.tier_list_type = "hero_power"
 
@@ -268,6 +223,12 @@ if "player_count" not in st.session_state:
 if "submitted_types" not in st.session_state:
     st.session_state.submitted_types = set()
 
+# Submissions still being written by the background writer, and finished outcomes to report
+if "pending_submissions" not in st.session_state:
+    st.session_state.pending_submissions = {}  # submit key -> SubmissionTicket
+if "submit_results" not in st.session_state:
+    st.session_state.submit_results = {}  # submit key -> (ok, error_message)
+
 if "tl_undo_stack" not in st.session_state:
     st.session_state.tl_undo_stack = {}  # keyed by tier_list_type
 for tl_type in TIER_LIST_TYPES.keys():
@@ -322,6 +283,7 @@ if saved_lists.is_enabled():
                 st.session_state["_loaded_list_slug"] = _qp_slug
                 st.warning("Shared tier list not found. It may have been deleted.")
             else:
+                saved_lists.increment_view_count(_qp_slug)
                 _saved_type = row.get("tier_list_type") or "hero_power"
                 _saved_pc = row.get("player_count") or "Any"
                 _payload = row.get("payload_json") or {}
@@ -406,13 +368,14 @@ if supports_player_count:
 
 current_player_count = st.session_state.player_count if supports_player_count else "Any"
 current_draft_key = _draft_key(current_tl_type, current_player_count)
+_submit_key = f"{current_tl_type}_{current_player_count}" if supports_player_count else current_tl_type
 
-# Get data and placement for current tier list type
-all_data = st.session_state.community_tl_data
-data = all_data.get(current_tl_type, {"submissions": []})
-# Resolve the active submissions list for the current player count
-active_subs_key = _subs_key(current_player_count) if supports_player_count else "submissions"
-active_submissions = data.get(active_subs_key, [])
+# Get community results (the shared snapshot plus our own queued submissions) and placement for current tier list type
+active_aggregate = _with_pending_submissions(
+    get_community_snapshot(current_tl_type, current_player_count).aggregate,
+    current_tl_type, current_player_count,
+)
+active_count = active_aggregate["submissions"]
 placement = st.session_state.my_tier_placement[current_draft_key]
 undo_stack = st.session_state.tl_undo_stack[current_draft_key]
 
@@ -546,68 +509,35 @@ if st.session_state.page_mode == "view":
     """ % _community_row_h, unsafe_allow_html=True)
     
     st.markdown("### 🏆 Community Tier List")
-    if not active_submissions:
+    _view_submit_result = st.session_state.submit_results.pop(_submit_key, None)
+    if _view_submit_result:
+        if _view_submit_result[0]:
+            st.success("Your submission has been saved.")
+        else:
+            st.error(_view_submit_result[1] or "Could not save your submission.")
+    if _submit_key in st.session_state.pending_submissions:
+        _submission_status(_submit_key)
+    if not active_count:
         st.info("No submissions yet — be the first to contribute!")
     else:
-        # Compute interpolated average per subject across all submissions
-        subject_scores_all = {s: [] for s in all_subjects}
-        for sub in active_submissions:
-            if isinstance(sub, dict) and any(isinstance(v, list) for v in sub.values()):
-                scores = interpolate_scores(sub)
-            else:
-                scores = {}
-                for subj, tier in sub.items():
-                    if tier in TIER_POINTS:
-                        scores[subj] = float(TIER_POINTS[tier])
-            for subj, score in scores.items():
-                if subj in subject_scores_all:
-                    subject_scores_all[subj].append(score)
-
-        subject_avg = {}
-        for subj, scores_list in subject_scores_all.items():
-            if scores_list:
-                subject_avg[subj] = np.mean(scores_list)
+        # Per-subject averages from the running aggregate (O(subjects))
+        subject_avg = subject_averages(active_aggregate, all_subjects)
 
         if not subject_avg:
             st.write(f"No {subject_name_plural} have been rated yet.")
         else:
-            vals = np.array(list(subject_avg.values()))
-            mean, std = vals.mean(), max(vals.std(), 1e-6)
-
-            comm_tiers = {"S": [], "A": [], "B": [], "C": [], "D": [], "F": []}
-            for subj, avg in subject_avg.items():
-                if avg >= mean + 1.0 * std:
-                    comm_tiers["S"].append((subj, avg))
-                elif avg >= mean + 0.3 * std:
-                    comm_tiers["A"].append((subj, avg))
-                elif avg >= mean - 0.3 * std:
-                    comm_tiers["B"].append((subj, avg))
-                elif avg >= mean - 1.0 * std:
-                    comm_tiers["C"].append((subj, avg))
-                elif avg >= mean - 1.5 * std:
-                    comm_tiers["D"].append((subj, avg))
-                else:
-                    comm_tiers["F"].append((subj, avg))
-
-            for tier in TIERS:
-                comm_tiers[tier].sort(key=lambda x: x[1], reverse=True)
+            comm_tiers = community_tiers(subject_avg)
 
             _pc_label = f" ({current_player_count})" if supports_player_count and current_player_count != "Any" else ""
-            st.caption(f"Based on **{len(active_submissions)}** community submission(s){_pc_label}")
-
-            import base64 as _b64_view, os as _os_view
-            @st.cache_data(show_spinner=False)
-            def _img_data_uri_view(path):
-                if not path or not _os_view.path.exists(path):
-                    return ""
-                ext = _os_view.path.splitext(path)[1].lower().lstrip(".")
-                mime = {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "gif": "gif", "webp": "webp"}.get(ext, "jpeg")
-                with open(path, "rb") as f:
-                    return f"data:image/{mime};base64,{_b64_view.b64encode(f.read()).decode()}"
+            st.caption(f"Based on **{active_count}** community submission(s){_pc_label}")
 
             _comm_compact_cls = " compact-view" if st.session_state.get("tl_compact", True) else ""
             _comm_card_h = "74px" if st.session_state.get("tl_compact", True) else "120px"
-            comm_html = [f'<div class="tier-view-wrap{_comm_compact_cls}" style="display:flex;flex-direction:column;gap:0;">']
+            _comm_thumb_variant = "compact" if st.session_state.get("tl_compact", True) else "card"
+            comm_html = [
+                sprite_css(subject_name_plural, _comm_thumb_variant),
+                f'<div class="tier-view-wrap{_comm_compact_cls}" style="display:flex;flex-direction:column;gap:0;">',
+            ]
             for tier in TIERS:
                 members = comm_tiers[tier]
                 if not members:
@@ -616,11 +546,11 @@ if st.session_state.page_mode == "view":
                 comm_html.append(f'<div class="tier-label-block" style="--tier-color:{TIER_COLORS[tier]};min-width:52px;max-width:52px;flex-shrink:0;{_tier_label_extra}">{tier}</div>')
                 comm_html.append('<div style="display:flex;flex-wrap:wrap;gap:0;flex:1;align-items:flex-start;">')
                 for subj, avg in members:
-                    uri = _img_data_uri_view(subject_images.get(subj, ""))
-                    if uri:
+                    card_html = sprite_card_html(subject_name_plural, _comm_thumb_variant, subj)
+                    if card_html:
                         comm_html.append(
                             f'<div class="hero-card" style="position:relative;height:{_comm_card_h};overflow:hidden;cursor:pointer;" title="{subj}">'
-                            f'<img src="{uri}" alt="{subj}" style="display:block;height:120px;width:auto;">'
+                            f'{card_html}'
                             f'</div>'
                         )
                 comm_html.append('</div></div>')
@@ -637,10 +567,14 @@ if st.session_state.page_mode == "view":
 
             # PNG download for community tier list
             tl_label = TIER_LIST_TYPES[current_tl_type]["label"]
-            png_bytes = build_community_tier_png(comm_tiers, TIER_COLORS, subject_images, title=f"{tl_label} — Community", compact=st.session_state.get("tl_compact", False))
-            if png_bytes:
-                st.download_button("⬇️ Download as PNG", png_bytes,
-                                   file_name=f"community_{current_tl_type}.png", mime="image/png")
+            comm_png = partial(
+                build_community_tier_png,
+                {t: [subj for subj, _ in comm_tiers[t]] for t in TIERS},
+                TIER_COLORS, subject_images, title=f"{tl_label} — Community",
+                compact=st.session_state.get("tl_compact", False),
+            )
+            st.download_button("⬇️ Download as PNG", comm_png,
+                               file_name=f"community_{current_tl_type}.png", mime="image/png")
 
             st.markdown("---")
             st.markdown("**Want to contribute?** Switch to **Build Your Tier List** mode above to create and submit your own rankings!")
@@ -651,7 +585,7 @@ if st.session_state.page_mode == "view":
 # ════════════════════════════════════════════════════════════════════════════
 # BUILD MODE: Let users create their tier list
 # ════════════════════════════════════════════════════════════════════════════
-st.info(f"**{len(active_submissions)}** community submission(s) on file. Build yours below!")
+st.info(f"**{active_count}** community submission(s) on file. Build yours below!")
 
 # ─── Build Your Tier List ───
 st.markdown("### Build Your Tier List")
@@ -753,10 +687,6 @@ st.markdown("""
 .compact-view .hero-card {
     overflow: hidden;
 }
-.compact-view .hero-card img {
-    object-fit: cover;
-    object-position: top;
-}
 </style>
 """, unsafe_allow_html=True)
 
@@ -783,34 +713,24 @@ if placed_count > 0:
 
     if st.session_state.tl_view_mode:
         # ─── Pure HTML view mode ───
-        import base64 as _b64v
-        @st.cache_data(show_spinner=False)
-        def _build_uri_map(_urls):
-            out = {}
-            for subj, path in _urls.items():
-                if not path or not os.path.exists(path):
-                    continue
-                ext = os.path.splitext(path)[1].lower().lstrip(".")
-                mime = {"jpg":"jpeg","jpeg":"jpeg","png":"png","gif":"gif","webp":"webp"}.get(ext,"jpeg")
-                with open(path, "rb") as f:
-                    out[subj] = f"data:image/{mime};base64,{_b64v.b64encode(f.read()).decode()}"
-            return out
-        _uri_map = _build_uri_map(dict(subject_images))
-
         _compact_cls = " compact-view" if st.session_state.tl_compact else ""
-        view_parts = [f'<div class="tier-view-wrap{_compact_cls}" style="display:flex;flex-direction:column;gap:0;">']
         _view_card_h = "74px" if st.session_state.tl_compact else "120px"
+        _view_thumb_variant = "compact" if st.session_state.tl_compact else "card"
+        view_parts = [
+            sprite_css(subject_name_plural, _view_thumb_variant),
+            f'<div class="tier-view-wrap{_compact_cls}" style="display:flex;flex-direction:column;gap:0;">',
+        ]
         for tier in TIERS:
             members = placement[tier]
             view_parts.append('<div style="display:flex;align-items:stretch;gap:0;">')
             view_parts.append(f'<div class="tier-label-block" style="--tier-color:{TIER_COLORS[tier]};min-width:52px;max-width:52px;flex-shrink:0;{_tier_label_extra}">{tier}</div>')
             view_parts.append('<div style="display:flex;flex-wrap:wrap;gap:0;flex:1;align-items:flex-start;">')
             for subj in members:
-                uri = _uri_map.get(subj, "")
-                if uri:
+                card_html = sprite_card_html(subject_name_plural, _view_thumb_variant, subj)
+                if card_html:
                     view_parts.append(
                         f'<div class="hero-card" style="position:relative;height:{_view_card_h};overflow:hidden;">'
-                        f'<img src="{uri}" alt="{subj}" style="display:block;height:120px;width:auto;">'
+                        f'{card_html}'
                         f'</div>'
                     )
             view_parts.append('</div></div>')
@@ -1161,25 +1081,29 @@ else:
 
 # ─── Submit / Export ───
 st.markdown("---")
-_submit_key = f"{current_tl_type}_{current_player_count}" if supports_player_count else current_tl_type
 already_submitted = _submit_key in st.session_state.submitted_types
+submit_result = st.session_state.submit_results.pop(_submit_key, None)
 
 col_sub, col_clear, col_png = st.columns(3)
 with col_sub:
-    if already_submitted:
+    if submit_result and not submit_result[0]:
+        st.error(submit_result[1] or "Could not save your submission.")
+    if _submit_key in st.session_state.pending_submissions:
+        _submission_status(_submit_key)
+    elif submit_result and submit_result[0]:
+        st.success("Submitted!")
+    elif already_submitted:
         st.info("✅ Already submitted this session")
     elif placed_count == 0:
         st.button("Place at least 1 to submit", disabled=True, width="stretch")
     elif st.button("✅ Submit My Tier List", type="primary", width="stretch"):
-        # Store as {tier: [ordered subjects]}
+        # Store as {tier: [ordered subjects]}; the writer saves it in the background
         submission = {t: list(placement[t]) for t in TIERS}
-        saved, updated_data, error_message = submit_data(current_tl_type, current_player_count, submission)
-        if saved:
-            st.session_state.community_tl_data = updated_data
-            st.session_state.submitted_types.add(_submit_key)
-            st.success("Submitted!")
-        else:
-            st.error(error_message)
+        st.session_state.pending_submissions[_submit_key] = submit_data(
+            current_tl_type, current_player_count, submission
+        )
+        st.session_state.submitted_types.add(_submit_key)
+        st.rerun()
 with col_clear:
     if st.button("🗑️ Clear My Placements", width="stretch"):
         st.session_state.my_tier_placement[current_draft_key] = {t: [] for t in TIERS}
@@ -1189,10 +1113,9 @@ with col_png:
     if placed_count > 0:
         my_tiers = {t: list(placement[t]) for t in TIERS}
         tl_label = TIER_LIST_TYPES[current_tl_type]["label"]
-        my_png = build_community_tier_png(my_tiers, TIER_COLORS, subject_images, title=f"My {tl_label}", compact=st.session_state.get("tl_compact", False))
-        if my_png:
-            st.download_button("⬇️ Download as PNG", my_png,
-                               file_name=f"my_{current_tl_type}.png", mime="image/png")
+        my_png = partial(build_community_tier_png, my_tiers, TIER_COLORS, subject_images, title=f"My {tl_label}", compact=st.session_state.get("tl_compact", False))
+        st.download_button("⬇️ Download as PNG", my_png,
+                           file_name=f"my_{current_tl_type}.png", mime="image/png")
 
 # ─── Save & Share (Supabase) ─────────────────────────────────────────────────
 if saved_lists.is_enabled():
@@ -2,25 +2,33 @@
 The Limited Card Pool Marvel Champions Tier List
 
 """
+
+from components.startup import page_started
+page_started("hero-tier-list")
+
 #%%
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
-import copy
 import io
 import json
+from functools import partial
 from html import escape as html_escape
 from data.hero_image_urls import hero_image_urls
-from data.default_heroes import default_heroes
 from data.preset_options import preset_options
 from data.help_tips import help_tips
 from data.constants import STAT_NAMES, TIER_COLORS, DEFAULT_WEIGHTS, HERO_ALTER_EGOS
-from components.github_storage import load_json
+from components.community_snapshot import get_community_snapshot
+from components.community_aggregates import TIER_POINTS, subject_averages
 from components.weighting_utils import update_preset
 from data.hero_release_order import HERO_WAVE, WAVE_ORDER, HERO_LEGACY, LEGACY_WAVE_ORDER
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.hero_card_viewer import render_hero_card_viewer
+from components.thumbnails import sprite_css, sprite_card_html
+from components.image_cache import get_card_tile
+from components.hero_stats_manager import initialize_hero_stats, reset_hero_stats, load_hero_stats
+from components.scoring import HeroMatrix, HERO_TIER_STD_BOUNDS, tier_lists
 
 # Use shared hero_alter_egos from constants
 hero_alter_egos = HERO_ALTER_EGOS
@@ -53,9 +61,7 @@ render_page_header("Out of the Box Tier List", "Card-pool and deck agnostic hero
 # ----------------------------------------
 # Initialize hero stats if not set
 # ----------------------------------------
-if "heroes" not in st.session_state:
-    st.session_state.heroes = copy.deepcopy(default_heroes)
-    st.session_state.default_heroes = copy.deepcopy(default_heroes)
+initialize_hero_stats()
 
 # ----------------------------------------
 # Compact top bar: preset selector + customize toggle
@@ -249,7 +255,7 @@ Changes here carry over to all pages in your session.
 
             # Button to reset all heroes to default
             if st.button("Reset All Heroes to Default"):
-                st.session_state.heroes = copy.deepcopy(st.session_state.default_heroes)
+                reset_hero_stats()
                 st.success("All heroes have been reset to their default stats.")
 
             # Download button to save hero stats settings
@@ -265,8 +271,8 @@ Changes here carry over to all pages in your session.
 # ----------------------------------------
 heroes = st.session_state.heroes
 
-# Compute raw dot products once for the current weight vector.
-raw_scores = {hero: float(np.dot(stats, weighting)) for hero, stats in heroes.items()}
+# Score every hero with one matrix-vector product for the current weight vector.
+raw_scores = HeroMatrix(heroes).score_dict(weighting)
 
 # Format filter (primary) + Wave filter (secondary — Legacy-aware)
 fmt_col, wave_col, _ = st.columns([1, 1, 1])
@@ -299,32 +305,7 @@ else:
 scores = {hero: raw_scores[hero] for hero in heroes}
 sorted_scores = dict(sorted(scores.items(), key=lambda item: (item[1], item[0])))
 
-hero_scores = np.array(list(scores.values()), dtype=float)
-mean_score = np.mean(hero_scores)
-std_score = max(np.std(hero_scores), 1e-6)
-threshold_S = mean_score + 1.5 * std_score
-threshold_A = mean_score + 0.5 * std_score
-threshold_B_lower = mean_score - 0.5 * std_score
-threshold_C = mean_score - 1.0 * std_score
-threshold_D = mean_score - 1.5 * std_score
-
-tiers = {"S": [], "A": [], "B": [], "C": [], "D": [], "F": []}
-for hero, score in scores.items():
-    if score >= threshold_S:
-        tiers["S"].append((hero, score))
-    elif score >= threshold_A:
-        tiers["A"].append((hero, score))
-    elif score >= threshold_B_lower:
-        tiers["B"].append((hero, score))
-    elif score >= threshold_C:
-        tiers["C"].append((hero, score))
-    elif score >= threshold_D:
-        tiers["D"].append((hero, score))
-    else:
-        tiers["F"].append((hero, score))
-
-for tier in tiers:
-    tiers[tier] = sorted(tiers[tier], key=lambda x: (-x[1], x[0]))
+tiers = tier_lists(scores, HERO_TIER_STD_BOUNDS)
 
 hero_to_tier = {}
 for tier, heroes_list in tiers.items():
@@ -374,12 +355,7 @@ if st.session_state.hd_view:
     flex: 1;
     min-height: 0;
 }
-.tier-heroes img {
-    display: block;
-    height: 120px;
-    width: auto;
-    object-fit: cover;
-    object-position: top;
+.tier-heroes .card-sprite {
     cursor: pointer;
 }
 .tier-heroes .hero-card {
@@ -412,23 +388,7 @@ if st.session_state.hd_view:
 </style>
 """, unsafe_allow_html=True)
 
-    import base64, os
-
-    @st.cache_resource(show_spinner=False)
-    def _build_data_uri_map():
-        result = {}
-        for hero, path in hero_image_urls.items():
-            if not path or not os.path.exists(path):
-                continue
-            ext = os.path.splitext(path)[1].lower().lstrip(".")
-            mime = {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "gif": "gif", "webp": "webp"}.get(ext, "jpeg")
-            with open(path, "rb") as f:
-                result[hero] = f"data:image/{mime};base64,{base64.b64encode(f.read()).decode()}"
-        return result
-
-    _data_uri_map = _build_data_uri_map()
-
-    tier_html_parts = ['<div class="home-tier-section">']
+    tier_html_parts = [sprite_css("heroes", "compact"), '<div class="home-tier-section">']
     for tier in ["S", "A", "B", "C", "D", "F"]:
         members = tiers[tier]
         tier_html_parts.append('<div class="tier-row">')
@@ -438,13 +398,13 @@ if st.session_state.hd_view:
         tier_html_parts.append('<div class="tier-heroes">')
         for hero, score in members:
             alter = hero_alter_egos.get(hero, "")
-            data_uri = _data_uri_map.get(hero, "")
-            if data_uri:
+            card_html = sprite_card_html("heroes", "compact", hero)
+            if card_html:
                 safe_hero = html_escape(hero, quote=True)
                 safe_alter = html_escape(alter, quote=True)
                 tier_html_parts.append(
                     f'<div class="hero-card" data-hero="{safe_hero}" data-alter="{safe_alter}">'
-                    f'<img src="{data_uri}" alt="{safe_hero}">'
+                    f'{card_html}'
                     f'<div class="hero-name-overlay">{safe_hero}</div>'
                     f'</div>'
                 )
@@ -482,11 +442,15 @@ if all_hero_names:
     render_hero_card_viewer(all_hero_names, alter_egos=hero_alter_egos, key_prefix="tier_hcv")
 
 # ── Download tier list as PNG ──
-def build_tier_list_image(tiers, tier_colors, plot_title):
-    """Render the tier list as a vertical image with hero card thumbnails."""
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_tier_list_image(tier_assignment, tier_colors):
+    """Render the tier list as a vertical image with hero card thumbnails.
+
+    *tier_assignment* maps each tier to its ordered hero names. Memoized on the
+    assignment, so it only runs when a download is requested for a tier list
+    that hasn't been exported yet.
+    """
     from PIL import Image
-    import urllib.request
-    import os
 
     tier_order = ["S", "A", "B", "C", "D", "F"]
     cards_per_row = 6
@@ -498,10 +462,9 @@ def build_tier_list_image(tiers, tier_colors, plot_title):
     # Gather rows: list of (tier_label_for_display, tier_letter, [hero_names])
     all_rows = []  # (display_label, tier_letter, [hero_name, ...])
     for t in tier_order:
-        members = tiers[t]
-        if not members:
+        hero_names = tier_assignment.get(t, [])
+        if not hero_names:
             continue
-        hero_names = [h for h, _ in members]
         for chunk_start in range(0, len(hero_names), cards_per_row):
             chunk = hero_names[chunk_start:chunk_start + cards_per_row]
             label = t if chunk_start == 0 else ""
@@ -541,20 +504,11 @@ def build_tier_list_image(tiers, tier_colors, plot_title):
 
     tier_rgb = {t: color_to_rgb(c) for t, c in tier_colors.items()}
 
-    # Load hero card images (cached)
-    card_cache = {}
-    for _, _, heroes_in_row in all_rows:
-        for hero in heroes_in_row:
-            if hero in card_cache:
-                continue
-            img_path = hero_image_urls.get(hero, "")
-            if img_path and os.path.exists(img_path):
-                try:
-                    card_img = Image.open(img_path).convert("RGB")
-                    card_img = card_img.resize((card_w, card_h), Image.LANCZOS)
-                    card_cache[hero] = card_img
-                except Exception:
-                    pass
+    # Resized hero card tiles (shared process-wide)
+    card_cache = {
+        hero: get_card_tile(hero_image_urls.get(hero, ""), (card_w, card_h))
+        for _, _, heroes_in_row in all_rows for hero in heroes_in_row
+    }
 
     y = 0
     for tier_label, tier_letter, heroes_in_row in all_rows:
@@ -584,11 +538,16 @@ def build_tier_list_image(tiers, tier_colors, plot_title):
     buf.seek(0)
     return buf.getvalue()
 
-png_bytes = build_tier_list_image(tiers, tier_colors, plot_title)
+tier_assignment = {t: [hero for hero, _ in tiers[t]] for t in ["S", "A", "B", "C", "D", "F"]}
 dl_col, share_col = st.columns([1, 1])
 with dl_col:
-    if png_bytes:
-        st.download_button("⬇️ Download Tier List as PNG", png_bytes, file_name="tier_list.png", mime="image/png")
+    if all_hero_names:
+        st.download_button(
+            "⬇️ Download Tier List as PNG",
+            partial(build_tier_list_image, tier_assignment, tier_colors),
+            file_name="tier_list.png",
+            mime="image/png",
+        )
 with share_col:
     weight_vals = ",".join(str(st.session_state.get(k, 0)) for k in _WEIGHT_KEYS)
     share_url = f"?w={weight_vals}"
@@ -605,25 +564,18 @@ with share_col:
 # Hot Takes — compare user tier list vs community average
 # ----------------------------------------
 try:
-    _community_data, _ = load_json("community_tier_lists.json", default={})
-    _submissions = _community_data.get("hero_power", {}).get("submissions", [])
-    if len(_submissions) >= 2:
-        _TIER_PTS = {"S": 6, "A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
-        _hero_scores_community = {}
-        for sub in _submissions:
-            for tier_name, hero_list in sub.items():
-                for h in hero_list:
-                    _hero_scores_community.setdefault(h, []).append(_TIER_PTS.get(tier_name, 3))
-        _community_avg = {h: np.mean(scores_list) for h, scores_list in _hero_scores_community.items()}
+    _community_aggregate = get_community_snapshot("hero_power").aggregate
+    if _community_aggregate["submissions"] >= 2:
+        _community_avg = subject_averages(_community_aggregate)
 
         _hot_takes = []
         for hero, user_tier in hero_to_tier.items():
             if hero in _community_avg:
-                user_pts = _TIER_PTS[user_tier]
+                user_pts = TIER_POINTS[user_tier]
                 comm_pts = _community_avg[hero]
                 diff = user_pts - comm_pts
                 if abs(diff) >= 1.0:
-                    comm_tier = min(_TIER_PTS.keys(), key=lambda t: abs(_TIER_PTS[t] - comm_pts))
+                    comm_tier = min(TIER_POINTS.keys(), key=lambda t: abs(TIER_POINTS[t] - comm_pts))
                     _hot_takes.append((hero, user_tier, comm_tier, diff))
 
         if _hot_takes:
@@ -730,10 +682,8 @@ with st.expander("📂 Upload Saved Settings"):
             raw_bytes = uploaded_hero_stats.read()
             if raw_bytes:
                 hero_stats_settings = json.loads(raw_bytes)
-                if "heroes" in hero_stats_settings:
-                    st.session_state.heroes = {hero: np.array(stats) for hero, stats in hero_stats_settings["heroes"].items()}
-                if "default_heroes" in hero_stats_settings:
-                    st.session_state.default_heroes = {hero: np.array(stats) for hero, stats in hero_stats_settings["default_heroes"].items()}
+                if "heroes" in hero_stats_settings or "default_heroes" in hero_stats_settings:
+                    load_hero_stats(hero_stats_settings.get("heroes"), hero_stats_settings.get("default_heroes"))
                 st.success("Hero stats loaded successfully!")
 
 render_footer(show_card_credits=True)
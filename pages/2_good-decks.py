@@ -2,6 +2,9 @@
 Deck Lists - Browse MarvelCDB deck lists for every hero
 """
 
+from components.startup import page_started
+page_started("good-decks")
+
 import streamlit as st
 import requests
 import json
@@ -11,8 +14,9 @@ from html import escape as html_escape
 from data.hero_decks import hero_decks
 from data.hero_image_urls import hero_image_urls
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
-from components.hero_card_viewer import get_obligation_nemesis
-from components.marvelcdb_decks import get_deck_age_label
+from components.hero_card_viewer import get_obligation_nemesis, ENCOUNTER_LOADING_TEXT
+from components.card_database import get_card_database
+from components.marvelcdb_decks import get_deck_age_label, get_deck_store
 from data.hero_release_order import HERO_RELEASE_INDEX, HERO_WAVE, WAVE_ORDER
 
 render_nav_banner("good-decks")
@@ -265,15 +269,6 @@ st.markdown("""
 
 # ─── API helpers ───
 
-@st.cache_data(ttl=3600, show_spinner="Loading card database...")
-def fetch_all_cards():
-    """Fetch the full card database from MarvelCDB and index by code."""
-    resp = requests.get("https://marvelcdb.com/api/public/cards/", timeout=30)
-    resp.raise_for_status()
-    cards = resp.json()
-    return {card["code"]: card for card in cards}
-
-
 @st.cache_data(ttl=3600, show_spinner="Loading deck...")
 def fetch_deck(deck_id, api_type):
     """Fetch a single deck or decklist from MarvelCDB."""
@@ -614,6 +609,7 @@ def render_deck(deck_data, card_db, show_header=True):
     # ── Deck title + aspect badge + stats + link ──
     if show_header:
         link_html = f' &nbsp; <a class="mcdb-link" href="{deck_url}" target="_blank">MarvelCDB ↗</a>' if deck_url else ""
+        get_deck_store().put(deck_data.get("id"), deck_data.get("api_type", "deck"), deck_data)
         deck_age_label = get_deck_age_label(deck_data.get("id"), deck_data.get("api_type", "deck"))
         age_html = f'<div class="deck-stat">Edited <strong>{deck_age_label}</strong></div>' if deck_age_label else ""
         st.markdown(
@@ -690,7 +686,10 @@ def render_deck(deck_data, card_db, show_header=True):
     hero_code = deck_data.get("hero_code", "")
     if hero_code:
         obligation_cards, nemesis_cards = get_obligation_nemesis(hero_code, card_db)
-        if obligation_cards or nemesis_cards:
+        if obligation_cards is None:
+            with st.expander("Obligation & Nemesis (loading…)"):
+                st.caption(ENCOUNTER_LOADING_TEXT)
+        elif obligation_cards or nemesis_cards:
             total_enc = (sum(c.get("quantity", 1) for c in obligation_cards)
                          + sum(c.get("quantity", 1) for c in nemesis_cards))
             with st.expander(f"Obligation & Nemesis ({total_enc})"):
@@ -803,7 +802,7 @@ if selected_hero:
     else:
         # Load card database
         try:
-            card_db = fetch_all_cards()
+            card_db = get_card_database()
         except requests.RequestException as e:
             st.error(f"Failed to load card database from MarvelCDB: {e}")
             st.stop()
@@ -864,7 +863,7 @@ with st.expander("📋 Import any deck by URL"):
             _api_type = "decklist" if _url_match.group(1) == "decklist" else "deck"
             _import_id = _url_match.group(2)
             try:
-                _card_db = fetch_all_cards()
+                _card_db = get_card_database()
                 _import_deck = fetch_deck(_import_id, _api_type)
                 if not _import_deck.get("url"):
                     _import_deck["url"] = deck_url_input
@@ -2,51 +2,25 @@
 Hero Pairings — Mutually Aware, Direction-Aware UX Version
 """
 
+from components.startup import page_started
+page_started("hero-pairings")
+
 # ----------------------------------------
 # Tuning Variables
 # ----------------------------------------
-TARGET = 2
-BASE_STAT_COUNT = 8
-
-PRIMARY_WEIGHT = 0.6
-SECONDARY_WEIGHT = 0.4
-
-MIN_RECIPROCITY_RATIO = 0.35
-S_TIER_RECIPROCITY_BOOST = 0.15
-
-# Baseline indices
-ECONOMY_INDEX = 0
-TEMPO_INDEX = 1
-CARD_VALUE_INDEX = 2
-SURVIVABILITY_INDEX = 3
-VILLAIN_DAMAGE_INDEX = 4
-THWART_INDEX = 5
-RELIABILITY_INDEX = 6
-MINION_CONTROL_INDEX = 7
-
-# Boon indices
-CONTROL_INDEX = 8
-SUPPORT_INDEX = 9
-LATE_GAME_INDEX = 11
-
-LATE_GAME_TRIGGER = 1.0
-
-TEMPO_PAIR_BONUS = 0.25
-LATE_GAME_THWART_BONUS = 0.20
-BLOCKING_SUPPORT_BONUS = 0.25
-
-POWER_DISINCENTIVE = 0.3
-WEAK_PAIR_DISINCENTIVE = 0.5
-
 WEAK_TEXT_THRESHOLD = 2
 STRONG_TEXT_THRESHOLD = 3
 
+BEST_PAIRS_SHOWN = 10
+
+# Lower bound of each partner tier in std devs from the mean, D to S (F is the rest)
+PAIRING_TIER_STD_BOUNDS = [-1.65, -1.25, -0.4, 0.4, 1.25]
+
 
 # ----------------------------------------
 # Imports
 # ----------------------------------------
 import streamlit as st
-import numpy as np
 import random
 
 from data.hero_image_urls import hero_image_urls
@@ -54,6 +28,11 @@ from data.constants import TIER_COLORS
 from components.weighting_utils import initialize_weighting_stats, get_weighting_array, render_weighting_sliders
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.hero_stats_manager import get_heroes
+from components.scoring import HeroMatrix, TIERS, tier_labels
+from components.pairings import (
+    BASE_STAT_COUNT, SUPPORT_INDEX, TEMPO_INDEX, VILLAIN_DAMAGE_INDEX, THWART_INDEX,
+    RELIABILITY_INDEX, MINION_CONTROL_INDEX, power_thresholds, get_pairing_matrices,
+)
 from data.hero_release_order import HERO_WAVE, WAVE_ORDER, HERO_LEGACY, LEGACY_WAVE_ORDER
 
 render_nav_banner("hero-pairings")
@@ -84,83 +63,11 @@ hero_names = list(heroes.keys())
 # ----------------------------------------
 general_weights = get_weighting_array()
 
-general_scores = {
-    hero: float(np.dot(stats, general_weights))
-    for hero, stats in heroes.items()
-}
-
-gp_vals = np.array(list(general_scores.values()))
-gp_mean = gp_vals.mean()
-gp_std = gp_vals.std()
-
-STRONG_HERO_THRESHOLD = gp_mean + 0.5 * gp_std
-WEAK_HERO_THRESHOLD = gp_mean - 0.5 * gp_std
-
-
-# ----------------------------------------
-# Directional Synergy
-# ----------------------------------------
-def directional_synergy(hero_A, hero_B):
-    stats_A = heroes[hero_A]
-    stats_B = heroes[hero_B]
-
-    base_A = stats_A[:BASE_STAT_COUNT]
-    base_B = stats_B[:BASE_STAT_COUNT]
-
-    power_A = general_scores[hero_A]
-    power_B = general_scores[hero_B]
-
-    score = 0.0
-
-    # Weakness coverage
-    needs = np.maximum(0, TARGET - base_A)
-    usable = np.minimum(np.maximum(0, base_B), needs)
-
-    if np.sum(needs) > 0:
-        score += np.dot(needs, usable) / np.sum(needs)
-
-    # Tempo contrast
-    score += TEMPO_PAIR_BONUS * abs(
-        base_A[TEMPO_INDEX] - base_B[TEMPO_INDEX]
-    )
-
-    # Late game + thwart
-    if stats_A[LATE_GAME_INDEX] >= LATE_GAME_TRIGGER:
-        if base_B[THWART_INDEX] > TARGET:
-            score += LATE_GAME_THWART_BONUS * base_B[THWART_INDEX]
-
-    # Survivability + support
-    if base_A[SURVIVABILITY_INDEX] < TARGET:
-        score += BLOCKING_SUPPORT_BONUS * (
-            max(0, base_B[SURVIVABILITY_INDEX]) +
-            max(0, stats_B[SUPPORT_INDEX])
-        )
-
-    # Power disincentives
-    if power_A >= STRONG_HERO_THRESHOLD and power_B >= STRONG_HERO_THRESHOLD:
-        score *= POWER_DISINCENTIVE
-
-    if power_A <= WEAK_HERO_THRESHOLD and power_B <= WEAK_HERO_THRESHOLD:
-        score *= WEAK_PAIR_DISINCENTIVE
-
-    return score
-
-
-# ----------------------------------------
-# Pairing Classification
-# ----------------------------------------
-def classify_pairing(a_to_b, b_to_a):
-    if max(a_to_b, b_to_a) == 0:
-        return "neutral"
-
-    ratio = min(a_to_b, b_to_a) / max(a_to_b, b_to_a)
-
-    if ratio >= MIN_RECIPROCITY_RATIO:
-        return "mutual"
-    elif a_to_b > b_to_a:
-        return "b_helps_a"
-    else:
-        return "a_helps_b"
+hero_matrix = HeroMatrix(heroes)
+gp_vals = hero_matrix.scores(general_weights)
+general_scores = dict(zip(hero_matrix.names, gp_vals.tolist()))
+WEAK_HERO_THRESHOLD, STRONG_HERO_THRESHOLD = power_thresholds(gp_vals)
+pairings = get_pairing_matrices(hero_matrix.matrix, general_weights)
 
 
 # ----------------------------------------
@@ -215,52 +122,18 @@ with st.expander(f"▸ {hero_A} — tap to change hero", expanded=False):
 # ----------------------------------------
 # Score Partners
 # ----------------------------------------
-scores = {}
-details = {}
-
-for hero_B in hero_names:
-    if hero_B == hero_A:
-        continue
-
-    a_to_b = directional_synergy(hero_A, hero_B)
-    b_to_a = directional_synergy(hero_B, hero_A)
-
-    blended = PRIMARY_WEIGHT * a_to_b + SECONDARY_WEIGHT * b_to_a
-    pairing_type = classify_pairing(a_to_b, b_to_a)
-
-    if pairing_type == "mutual":
-        blended *= (1 + S_TIER_RECIPROCITY_BOOST)
-
-    scores[hero_B] = blended
-    details[hero_B] = {"type": pairing_type}
+row_A = hero_matrix.index[hero_A]
+partner_rows = [i for i in range(len(hero_matrix)) if i != row_A]
+scores = {hero_matrix.names[i]: float(pairings.blended[row_A, i]) for i in partner_rows}
+details = {hero_matrix.names[i]: {"type": str(pairings.types[row_A, i])} for i in partner_rows}
 
 
 # ----------------------------------------
 # Tiering
 # ----------------------------------------
-vals = np.array(list(scores.values()))
-mean, std = vals.mean(), max(vals.std(), 1e-6)
-
-thr_S = mean + 1.25 * std
-thr_A = mean + 0.4 * std
-thr_B = mean - 0.4 * std
-thr_C = mean - 1.25 * std
-
-tiers = {"S": [], "A": [], "B": [], "C": [], "D": [], "F": []}
-
-for hero, sc in scores.items():
-    if sc >= thr_S:
-        tiers["S"].append(hero)
-    elif sc >= thr_A:
-        tiers["A"].append(hero)
-    elif sc >= thr_B:
-        tiers["B"].append(hero)
-    elif sc >= thr_C:
-        tiers["C"].append(hero)
-    elif sc >= thr_C - 0.4 * std:
-        tiers["D"].append(hero)
-    else:
-        tiers["F"].append(hero)
+partner_names = list(scores)
+partner_tiers = tier_labels(list(scores.values()), PAIRING_TIER_STD_BOUNDS)
+tiers = {t: [h for h, ht in zip(partner_names, partner_tiers) if ht == t] for t in TIERS}
 
 
 # ----------------------------------------
@@ -388,4 +261,35 @@ for tier in ["S", "A", "B", "C", "D", "F"]:
                 else:
                     st.caption("—")
 
+
+# ----------------------------------------
+# Best Pairs Overall
+# ----------------------------------------
+st.markdown("---")
+
+with st.expander("🏆 Best pairs overall (click to expand)", expanded=False):
+    st.caption(
+        "Every pair among the heroes in the picker's format/wave filter, "
+        "ranked by both heroes' view of the partnership."
+    )
+    for row_a, row_b, pair_score in pairings.best_pairs(hero_matrix.rows(picker_heroes), BEST_PAIRS_SHOWN):
+        name_a, name_b = hero_matrix.names[row_a], hero_matrix.names[row_b]
+        col_a, col_b, col_text = st.columns([1, 1, 4])
+        for col, name in ((col_a, name_a), (col_b, name_b)):
+            with col:
+                img = hero_image_urls.get(name)
+                if img:
+                    st.image(img, width="stretch")
+        with col_text:
+            st.markdown(f"**{name_a}** + **{name_b}** &nbsp; (Score: {pair_score:.2f})")
+            t = pairings.types[row_a, row_b]
+            if t == "mutual":
+                st.caption("🤝 Mutual synergy")
+            elif t == "b_helps_a":
+                st.caption(f"⬆️ {name_b} supports {name_a}")
+            elif t == "a_helps_b":
+                st.caption(f"⬆️ {name_a} supports {name_b}")
+            else:
+                st.caption("—")
+
 render_footer()
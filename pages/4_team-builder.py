@@ -2,20 +2,26 @@
 Team Builder - Build a team of 1-4 heroes and analyze their combined strengths/weaknesses
 """
 
+from components.startup import page_started, lazy_import
+page_started("team-builder")
+
 import streamlit as st
 import numpy as np
-import pandas as pd
-from itertools import combinations
-import matplotlib.pyplot as plt
 from data.hero_image_urls import hero_image_urls
 from data.villain_image_urls import villain_image_urls
 from data.constants import STAT_NAMES
 from components.hero_stats_manager import initialize_hero_stats, get_heroes, render_hero_stats_editor
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.marvelcdb_decks import format_deck_link
+from components.scoring import HeroMatrix
+from components.team_scoring import get_preset_for_team_size, score_teams
+from components.team_score_cache import get_team_score_distribution
+from components.villain_matchups import get_villain_matchups
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
 
 render_nav_banner("team-builder")
-from data.preset_options import preset_options
 from data.help_tips import help_tips
 from data.villain_weights import villain_weights
 from data.villain_strategies import villain_strategies
@@ -25,70 +31,15 @@ from data.hero_release_order import HERO_WAVE, WAVE_ORDER, HERO_LEGACY
 # Initialize hero stats in session state
 initialize_hero_stats()
 
-def get_preset_for_team_size(team_size):
-    """Get the appropriate preset based on team size."""
-    if team_size == 1:
-        return np.array(preset_options["Solo (No Rush)"])
-    elif team_size == 2:
-        return np.array(preset_options["General Power: 2 Player"])
-    elif team_size == 3:
-        return np.array(preset_options["Multiplayer: 3 Player"])
-    else:  # 4 player
-        return np.array(preset_options["Multiplayer: 4 Player"])
-
-def calculate_team_synergy(team_heroes, heroes_dict, team_size):
-    """
-    Calculate team synergy bonus (0-40% multiplier).
-    Synergy is based on how well heroes complement each other's strengths and weaknesses.
-    
-    Returns: synergy_multiplier (0.0 to 0.4)
-    """
-    if len(team_heroes) == 1:
-        return 0.0  # No synergy for solo teams
-    
-    team_stats = np.array([heroes_dict[hero] for hero in team_heroes])
-    
-    # 1. Support synergy: Support heroes pair well with late game heroes
-    # Support heroes enable other heroes to scale into late game
-    support_boon_idx = 9  # Support Boon index
-    late_game_idx = 11  # Late Game Power Boon index
-    
-    support_levels = team_stats[:, support_boon_idx]
-    late_game_levels = team_stats[:, late_game_idx]
-    
-    avg_support = np.mean(support_levels)
-    avg_late_game = np.mean(late_game_levels)
-    
-    # Synergy bonus if team has both support AND late game power
-    support_synergy = min((avg_support + avg_late_game) / 100 * 0.12, 0.12)  # Cap at 12%
-    
-    # 2. Reliability synergy: Consistent heroes boost team stability
-    reliability_idx = 6
-    reliability = team_stats[:, reliability_idx]
-    avg_reliability = np.mean(reliability)
-    reliability_synergy = (avg_reliability / 6.0) * 0.08  # Up to 8%
-    
-    # 3. Multiplayer consistency synergy: Bonus for teams designed for multi-player
-    multiplayer_idx = 14
-    multiplayer_stats = team_stats[:, multiplayer_idx]
-    
-    if team_size >= 3:
-        multiplayer_synergy = np.mean(multiplayer_stats) * 0.01  # 1% per multiplayer point
-        multiplayer_synergy = min(multiplayer_synergy, 0.12)  # Cap at 12%
-    else:
-        multiplayer_synergy = 0.0
-    
-    # 4. Balance synergy: Diverse stat profiles work better together
-    stat_variance = np.std(team_stats[:, :8])  # Variance across core stats
-    balance_synergy = min((stat_variance / 3.0) * 0.08, 0.08)  # Up to 8%
-    
-    # Combine all synergies (cap at 40%)
-    total_synergy = min(
-        support_synergy + reliability_synergy + multiplayer_synergy + balance_synergy,
-        0.40
-    )
-    
-    return total_synergy
+# Tier -> (heading color, description) for the team tier ranking
+TEAM_TIER_DISPLAY = {
+    "S": ("red", "Exceptional - Top 5%"),
+    "A": ("orange", "Excellent - Top 25%"),
+    "B": ("green", "Good - Average"),
+    "C": ("blue", "Below Average"),
+    "D": ("purple", "Weak - Bottom 10%"),
+    "F": ("gray", "Very Weak - Bottom 5%"),
+}
 
 render_page_header("Team Builder", "Build a team of 1-4 heroes and analyze their combined strengths and weaknesses")
 
@@ -278,62 +229,29 @@ if st.session_state.show_tier:
         team_stats.append(heroes[hero])
 
     combined_stats = np.mean(team_stats, axis=0)
-    base_team_score = float(np.dot(combined_stats, weighting))
-
-    # Calculate synergy bonus
-    synergy_multiplier = calculate_team_synergy(st.session_state.team, heroes, len(st.session_state.team))
-    team_score = base_team_score * (1.0 + synergy_multiplier)
-
-    # Calculate all possible team combinations and their scores
-    same_size_combinations = []
 
+    # Score the user's team (base score, synergy bonus and final score)
     current_team_size = len(st.session_state.team)
-    for combo in combinations(hero_names, current_team_size):
-        combo_stats = np.mean([heroes[hero] for hero in combo], axis=0)
-        combo_weighting = get_preset_for_team_size(current_team_size)
-        combo_base_score = float(np.dot(combo_stats, combo_weighting))
-        combo_synergy = calculate_team_synergy(list(combo), heroes, current_team_size)
-        combo_score = combo_base_score * (1.0 + combo_synergy)
-        same_size_combinations.append(combo_score)
-
-    same_size_combinations = np.array(same_size_combinations)
-    mean_score = np.mean(same_size_combinations)
-    std_score = max(np.std(same_size_combinations), 1e-6)
+    hero_matrix = HeroMatrix(heroes, hero_names)
+    team_idx = np.array([[hero_names.index(hero) for hero in st.session_state.team]])
+    base_scores, synergies, final_scores = score_teams(
+        hero_matrix, team_idx, weighting, current_team_size
+    )
+    base_team_score = float(base_scores[0])
+    synergy_multiplier = float(synergies[0])
+    team_score = float(final_scores[0])
+
+    # Distribution of every same-size team score (shared across sessions)
+    distribution = get_team_score_distribution(
+        hero_matrix, get_preset_for_team_size(current_team_size), current_team_size
+    )
 
     # Calculate rank among same-size teams
-    if len(same_size_combinations) > 0:
-        teams_with_higher_score = np.sum(same_size_combinations > team_score)
-        team_rank = teams_with_higher_score + 1
-        total_teams = len(same_size_combinations)
-    else:
-        team_rank = 1
-        total_teams = 1
+    team_rank, total_teams, team_percentile = distribution.rank(team_score)
 
     # Determine tier based on standard deviations
-    if team_score >= mean_score + 1.5 * std_score:
-        tier = "S"
-        tier_color = "red"
-        tier_text = "Exceptional - Top 5%"
-    elif team_score >= mean_score + 0.5 * std_score:
-        tier = "A"
-        tier_color = "orange"
-        tier_text = "Excellent - Top 25%"
-    elif team_score >= mean_score - 0.5 * std_score:
-        tier = "B"
-        tier_color = "green"
-        tier_text = "Good - Average"
-    elif team_score >= mean_score - 1.0 * std_score:
-        tier = "C"
-        tier_color = "blue"
-        tier_text = "Below Average"
-    elif team_score >= mean_score - 1.5 * std_score:
-        tier = "D"
-        tier_color = "purple"
-        tier_text = "Weak - Bottom 10%"
-    else:
-        tier = "F"
-        tier_color = "gray"
-        tier_text = "Very Weak - Bottom 5%"
+    tier = distribution.tier_of(team_score)
+    tier_color, tier_text = TEAM_TIER_DISPLAY[tier]
 
     col1, col2 = st.columns([1, 2])
 
@@ -347,16 +265,19 @@ if st.session_state.show_tier:
         st.write(f"Synergy Bonus: +{synergy_multiplier*100:.1f}%")
         st.write(f"**Final Score: {team_score:.1f}**")
         st.write(f"Rank: {team_rank}/{total_teams} {len(st.session_state.team)}-player teams")
+        st.write(f"Percentile: {team_percentile:.1f}")
 
     st.markdown("---")
 
     # Individual hero scores
     st.subheader("⚡ Individual Hero Scores")
 
-    hero_scores = []
-    for hero in st.session_state.team:
-        score = float(np.dot(heroes[hero], weighting))
-        hero_scores.append({"Hero": hero, "Score": f"{score:.1f}"})
+    if villain_choice != "No villain selected":
+        # Row lookup in the shared villain x hero score matrix
+        team_hero_scores = get_villain_matchups(heroes).score_dict(villain_choice, st.session_state.team)
+    else:
+        team_hero_scores = hero_matrix.score_dict(weighting, st.session_state.team)
+    hero_scores = [{"Hero": hero, "Score": f"{score:.1f}"} for hero, score in team_hero_scores.items()]
 
     df_scores = pd.DataFrame(hero_scores)
     st.dataframe(df_scores, width="stretch", hide_index=True)
@@ -2,17 +2,22 @@
 Team Generator - Generate random teams from specific tiers with optional hero locks
 """
 
+from components.startup import page_started, lazy_import
+page_started("team-generator")
+
 import streamlit as st
 import numpy as np
-from itertools import combinations
-import random
-import matplotlib.pyplot as plt
 
 from data.hero_image_urls import hero_image_urls
 from data.villain_image_urls import villain_image_urls
 from data.constants import TIER_COLORS
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.marvelcdb_decks import format_deck_link
+from components.scoring import HeroMatrix
+from components.team_score_cache import get_team_score_distribution
+from components.villain_matchups import get_villain_matchups
+
+plt = lazy_import("matplotlib.pyplot")
 
 render_nav_banner("team-generator")
 from components.hero_stats_manager import initialize_hero_stats, get_heroes, render_hero_stats_editor
@@ -121,73 +126,22 @@ st.markdown("---")
 
 # Generate button
 if st.button("🎲 Generate Random Team", type="primary", width="stretch", key="generate_button"):
-    # Calculate all possible team combinations (including ALL heroes, not just available)
+    # Score distribution of all possible teams (including ALL heroes, not just available)
     # This ensures tier boundaries are consistent regardless of locked heroes
-    all_possible_teams = []
-    
-    for combo in combinations(hero_names, team_size):
-        team = list(combo)
-        
-        # Calculate team score
-        team_stats = [heroes[hero] for hero in team]
-        combined_stats = np.mean(team_stats, axis=0)
-        team_score = float(np.dot(combined_stats, weighting))
-        
-        all_possible_teams.append((team, team_score))
-    
-    # Calculate mean and std for tier determination (from ALL possible teams)
-    all_scores = [score for _, score in all_possible_teams]
-    mean_score = np.mean(all_scores)
-    std_score = max(np.std(all_scores), 1e-6)
-    
-    # Now filter for teams that include locked heroes
-    available_heroes = [h for h in hero_names if h not in locked_heroes]
-    remaining_slots = team_size - len(locked_heroes)
-    
-    # Generate all combinations of remaining slots
-    valid_teams = []
-    
-    for combo in combinations(available_heroes, remaining_slots):
-        team = list(locked_heroes) + list(combo)
-        
-        # Calculate team score
-        team_stats = [heroes[hero] for hero in team]
-        combined_stats = np.mean(team_stats, axis=0)
-        team_score = float(np.dot(combined_stats, weighting))
-        
-        valid_teams.append((team, team_score))
+    distribution = get_team_score_distribution(
+        HeroMatrix(heroes, hero_names), weighting, team_size, synergy=False
+    )
     
-    # Filter teams by tier
-    tier_teams = []
-    for team, score in valid_teams:
-        if tier_choice == "S":
-            if score >= mean_score + 1.5 * std_score:
-                tier_teams.append(team)
-        elif tier_choice == "A":
-            if mean_score + 0.5 * std_score <= score < mean_score + 1.5 * std_score:
-                tier_teams.append(team)
-        elif tier_choice == "B":
-            if mean_score - 0.5 * std_score <= score < mean_score + 0.5 * std_score:
-                tier_teams.append(team)
-        elif tier_choice == "C":
-            if mean_score - 1.0 * std_score <= score < mean_score - 0.5 * std_score:
-                tier_teams.append(team)
-        elif tier_choice == "D":
-            if mean_score - 1.5 * std_score <= score < mean_score - 1.0 * std_score:
-                tier_teams.append(team)
-        elif tier_choice == "F":
-            if score < mean_score - 1.5 * std_score:
-                tier_teams.append(team)
+    # Sample one team from the tier band that contains the locked heroes
+    locked_idx = [hero_names.index(hero) for hero in locked_heroes]
+    team_idx, tier_team_count = distribution.sample_team(tier_choice, locked_idx)
     
-    if not tier_teams:
+    if team_idx is None:
         st.error(f"❌ No {tier_choice} tier teams found with those constraints! Try a different tier or fewer locked heroes.")
         st.stop()
     
-    # Pick random team from tier
-    random_team = random.choice(tier_teams)
-    
-    st.session_state.generated_team = list(random_team)
-    st.success(f"✅ Generated {tier_choice} tier team! ({len(tier_teams)} total teams in this tier)")
+    st.session_state.generated_team = [hero_names[i] for i in team_idx]
+    st.success(f"✅ Generated {tier_choice} tier team! ({tier_team_count} total teams in this tier)")
 
 # Display generated team if one exists
 if "generated_team" in st.session_state:
@@ -199,7 +153,11 @@ if "generated_team" in st.session_state:
     # Calculate stats for display
     team_stats = [heroes[hero] for hero in team]
     combined_stats = np.mean(team_stats, axis=0)
-    team_score = float(np.dot(combined_stats, weighting))
+    if villain_choice != "No villain selected":
+        # Mean of the team's rows in the shared villain x hero score matrix
+        team_score = float(np.mean(list(get_villain_matchups(heroes).score_dict(villain_choice, team).values())))
+    else:
+        team_score = float(np.dot(combined_stats, weighting))
     
     # Display team
     cols_per_row = 5
@@ -2,6 +2,9 @@
 Hero Recommender — Tell us what matters to you and we'll find the best hero for your playstyle.
 """
 
+from components.startup import page_started
+page_started("hero-recommender")
+
 import streamlit as st
 import numpy as np
 from data.hero_image_urls import hero_image_urls
@@ -9,6 +12,7 @@ from data.hero_decks import hero_decks
 from data.help_tips import help_tips
 from data.constants import STAT_NAMES
 from components.hero_stats_manager import get_heroes
+from components.scoring import HeroMatrix
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.marvelcdb_decks import format_deck_link
 
@@ -103,20 +107,15 @@ else:  # Strong / Top-tier
 
 # ─── Score heroes ───
 if st.button("🔍 Find My Heroes!", type="primary", width="stretch"):
-    all_heroes = get_heroes()
-    heroes_pool = dict(all_heroes)
+    hero_matrix = HeroMatrix(get_heroes())
 
-    # Compute raw stat sum for each hero to blend with strength preference
-    raw_sums = {h: float(np.sum(s)) for h, s in heroes_pool.items()}
-    sum_vals = np.array(list(raw_sums.values()))
-    sum_mean, sum_std = sum_vals.mean(), max(sum_vals.std(), 1e-6)
+    # Score with the answers' weights and, in the same product, a flat weight
+    # of 1 per stat (each hero's raw stat total) to blend with strength preference
+    weighted, sum_vals = hero_matrix.scores(np.vstack([w, np.ones_like(w)]))
     # z-score of each hero's total stats
-    norm_sums = {h: (raw_sums[h] - sum_mean) / sum_std for h in heroes_pool}
+    norm_sums = (sum_vals - sum_vals.mean()) / max(sum_vals.std(), 1e-6)
 
-    scores = {
-        hero: float(np.dot(stats, w)) + strength_bias * norm_sums[hero] * 10
-        for hero, stats in heroes_pool.items()
-    }
+    scores = dict(zip(hero_matrix.names, (weighted + strength_bias * norm_sums * 10).tolist()))
     ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     st.session_state.rec_results = ranked[:5]
     st.session_state.rec_weights = w.copy()
@@ -135,7 +134,7 @@ if st.session_state.get("rec_results"):
         with col_info:
             st.markdown(f"**#{rank} — {hero}** &nbsp; (Score: {int(score)})")
 
-            stats = all_heroes.get(hero, get_heroes()[hero])
+            stats = get_heroes()[hero]
             top_stats = sorted(
                 [(FACTORS[i], int(stats[i])) for i in range(len(FACTORS)) if stats[i] > 0],
                 key=lambda x: x[1], reverse=True,
@@ -2,13 +2,17 @@
 Hero Comparison Tool - Compare two heroes side-by-side
 """
 
+from components.startup import page_started
+page_started("hero-comparison")
+
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Patch
+import pandas as pd
 
 from data.hero_image_urls import hero_image_urls
 from components.hero_stats_manager import initialize_hero_stats, get_heroes, render_hero_stats_editor
+from components.scoring import HeroMatrix
 from data.preset_options import preset_options
 from data.hero_decks import hero_decks
 from data.constants import STAT_NAMES
@@ -201,7 +205,6 @@ for i, factor in enumerate(factor_names):
         "Difference": diff
     })
 
-import pandas as pd
 df = pd.DataFrame(comparison_data)
 
 # Color code the difference column
@@ -279,8 +282,7 @@ st.markdown("---")
 st.subheader("⚡ Overall Power Analysis")
 
 # Calculate scores with selected weighting
-power_1 = float(np.dot(stats_1, weighting))
-power_2 = float(np.dot(stats_2, weighting))
+power_1, power_2 = HeroMatrix(heroes, [hero_1, hero_2]).scores(weighting).tolist()
 
 col1, col2, col3 = st.columns(3)
 
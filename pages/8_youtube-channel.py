@@ -2,13 +2,14 @@
 YouTube Channel - Watch videos from Daring Lime
 """
 
+from components.startup import page_started, lazy_import
+page_started("youtube-channel")
+
 import streamlit as st
-try:
-    import yt_dlp
-except ImportError:
-    yt_dlp = None
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 
+yt_dlp = lazy_import("yt_dlp", optional=True)
+
 render_nav_banner("youtube-channel")
 
 render_page_header("Daring Lime Videos", "Marvel Champions gameplay, strategy, and tier list breakdowns")
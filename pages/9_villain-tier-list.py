@@ -1,3 +1,6 @@
+from components.startup import page_started
+page_started("villain-tier-list")
+
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
@@ -13,6 +16,7 @@ from data.constants import STAT_NAMES, TIER_COLORS
 import re
 from components.nav_banner import render_nav_banner, render_page_header, render_footer
 from components.marvelcdb_decks import format_deck_link
+from components.villain_matchups import get_villain_matchups
 from data.villain_release_order import VILLAIN_RELEASE_INDEX, VILLAIN_WAVE, VILLAIN_WAVE_ORDER, VILLAIN_LEGACY
 from data.hero_release_order import HERO_WAVE, WAVE_ORDER, HERO_LEGACY, LEGACY_WAVE_ORDER
 
@@ -123,8 +127,9 @@ weights = np.array([st.session_state.get(f"villain_{name}", 0) for name in facto
 # ----------------------------------------
 heroes = get_heroes()
 
-# Compute raw dot products once for the current villain weighting.
-raw_scores = {name: float(np.dot(stats, weights)) for name, stats in heroes.items()}
+# One shared villain x hero score matrix, with this villain's row from the sliders.
+matchups = get_villain_matchups(heroes, {villain: weights})
+raw_scores = matchups.score_dict(villain)
 
 # Format filter (primary) + Wave filter (secondary — Legacy-aware)
 fmt_col, wave_col, _ = st.columns([1, 1, 1])
@@ -156,31 +161,7 @@ sorted_scores = dict(sorted(scores.items(), key=lambda kv: (kv[1], kv[0])))
 # ----------------------------------------
 # Tier thresholds
 # ----------------------------------------
-all_scores = np.array(list(scores.values()), dtype=float)
-mean, std = all_scores.mean(), all_scores.std()
-
-thr_S = mean + 1.5 * std
-thr_A = mean + 0.5 * std
-thr_B = mean - 0.5 * std
-thr_C = mean - 1.5 * std
-
-tiers = {"S": [], "A": [], "B": [], "C": [], "D": [], "F": []}
-for hero, sc in scores.items():
-    if sc >= thr_S:
-        tiers["S"].append((hero, sc))
-    elif sc >= thr_A:
-        tiers["A"].append((hero, sc))
-    elif sc >= thr_B:
-        tiers["B"].append((hero, sc))
-    elif sc >= thr_C:
-        tiers["C"].append((hero, sc))
-    elif sc >= thr_C - 0.5 * std:
-        tiers["D"].append((hero, sc))
-    else:
-        tiers["F"].append((hero, sc))
-
-for tier in tiers:
-    tiers[tier].sort(key=lambda x: (-x[1], x[0]))
+tiers = matchups.tier_lists(villain, list(scores))
 
 hero_to_tier = {h: t for t, lst in tiers.items() for h, _ in lst}
 
@@ -300,6 +281,51 @@ ax.legend(handles=handles, title="Tiers", loc="upper left", fontsize=12, title_f
 st.pyplot(fig)
 plt.close(fig)
 
+# ----------------------------------------
+# Best villains for a hero (reverse lookup)
+# ----------------------------------------
+with st.expander("🎯 Best villains for a hero"):
+    lookup_hero = st.selectbox("Hero", sorted(scores), key="vtl_lookup_hero")
+    ranked_villains = matchups.best_villains_for(lookup_hero)
+    st.caption(
+        "Standing is how far the hero scores above (+) or below (−) the average hero "
+        "against that villain, in standard deviations."
+    )
+    best_col, worst_col = st.columns(2)
+    with best_col:
+        st.markdown("**Best matchups**")
+        st.dataframe(
+            [{"Villain": v, "Tier": t, "Standing": f"{z:+.2f}"} for v, z, t in ranked_villains[:8]],
+            hide_index=True, width="stretch",
+        )
+    with worst_col:
+        st.markdown("**Worst matchups**")
+        st.dataframe(
+            [{"Villain": v, "Tier": t, "Standing": f"{z:+.2f}"} for v, z, t in ranked_villains[::-1][:8]],
+            hide_index=True, width="stretch",
+        )
+
+# ----------------------------------------
+# Matchup heatmap
+# ----------------------------------------
+if st.toggle("Show villain × hero matchup heatmap", key="vtl_show_heatmap"):
+    heat_heroes = [h for h, _ in sorted(scores.items(), key=lambda kv: kv[0])]
+    heat = matchups.zscores[:, matchups.heroes.rows(heat_heroes)]
+
+    fig, ax = plt.subplots(
+        figsize=(max(10, len(heat_heroes) * 0.28), max(8, len(matchups.villain_names) * 0.28)), dpi=120
+    )
+    fig.patch.set_facecolor(_bg)
+    im = ax.imshow(heat, cmap="RdYlGn", vmin=-2.5, vmax=2.5, aspect="auto")
+    ax.set_xticks(range(len(heat_heroes)), heat_heroes, rotation=90, fontsize=7, color=_txt)
+    ax.set_yticks(range(len(matchups.villain_names)), matchups.villain_names, fontsize=7, color=_txt)
+    ax.set_title("Hero Standing Against Each Villain (std devs from average)", fontsize=12, color=_txt)
+    cbar = fig.colorbar(im, ax=ax, fraction=0.02, pad=0.01)
+    cbar.ax.tick_params(colors=_txt)
+    fig.tight_layout()
+    st.pyplot(fig)
+    plt.close(fig)
+
 render_footer(show_card_credits=True)
 
 
@@ -0,0 +1,9 @@
+-- Atomic, batched view-count increments for community_saved_lists
+-- (called by components/supabase_saved_lists.py through /rest/v1/rpc).
+create or replace function increment_saved_list_views(slugs text[], counts int[])
+returns void language sql as $$
+  update community_saved_lists l
+     set view_count = coalesce(l.view_count, 0) + v.n, last_viewed_at = now()
+    from unnest(slugs, counts) as v(slug, n)
+   where l.slug = v.slug;
+$$;
@@ -0,0 +1,125 @@
+"""
+PostgREST stand-in for the saved-list view counter tests.
+Serves just the endpoints components/supabase_saved_lists.py uses to count
+views, over real HTTP on localhost:
+
+    POST  /rest/v1/rpc/increment_saved_list_views   batched increment (404 with rpc=False)
+    GET   /rest/v1/community_saved_lists?slug=eq.X  read a row's view_count
+    PATCH /rest/v1/community_saved_lists?slug=eq.X&view_count=eq.N   compare-and-set write
+
+conflicts[slug] = n makes the next n conditional PATCHes of slug lose a race:
+another writer bumps the count just before the PATCH is matched.
+With reply_delay set, every write (POST or PATCH) is applied and then answered
+only after that many seconds, so a client timeout leaves it committed.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TABLE_PATH = "/rest/v1/community_saved_lists"
+RPC_PATH = "/rest/v1/rpc/increment_saved_list_views"
+
+
+class PostgrestStub:
+    """A tiny in-memory community_saved_lists table behind an HTTP server."""
+
+    def __init__(self, rows=None, rpc=True):
+        self.rows = {slug: dict(row) for slug, row in (rows or {}).items()}
+        self.rpc = rpc
+        self.fail_status = None  # Answer every request with this status when set
+        self.conflicts = {}
+        self.reply_delay = 0  # Seconds to wait after applying a write before answering
+        self.requests = []  # (method, path) of every request served
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def cfg(self):
+        """A client config in the shape of supabase_saved_lists._cfg()."""
+        return {
+            "url": self.url,
+            "key": "test-key",
+            "headers": {"apikey": "test-key", "Content-Type": "application/json"},
+        }
+
+    def view_count(self, slug):
+        return self.rows[slug].get("view_count")
+
+    def calls(self, method, path):
+        return sum(1 for m, p in self.requests if m == method and p == path)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, method, path, query, body):
+        """Return (status, json body) for one request."""
+        self.requests.append((method, path))
+        if self.fail_status:
+            return self.fail_status, {"message": "stub failure"}
+        slug = query.get("slug", [""])[0].removeprefix("eq.")
+        if method == "POST" and path == RPC_PATH:
+            if not self.rpc:
+                return 404, {"message": "Could not find the function"}
+            for s, n in zip(body["slugs"], body["counts"]):
+                if s in self.rows:
+                    self.rows[s]["view_count"] = (self.rows[s].get("view_count") or 0) + n
+            return 204, None
+        if method == "GET" and path == TABLE_PATH:
+            row = self.rows.get(slug)
+            return 200, [] if row is None else [{"view_count": row.get("view_count")}]
+        if method == "PATCH" and path == TABLE_PATH:
+            row = self.rows.get(slug)
+            if row is None:
+                return 200, []
+            if self.conflicts.get(slug):
+                self.conflicts[slug] -= 1
+                row["view_count"] = (row.get("view_count") or 0) + 1
+            expected = query.get("view_count", [""])[0]
+            current = row.get("view_count")
+            if expected != ("is.null" if current is None else f"eq.{current}"):
+                return 200, []
+            row.update(body)
+            return 200, [dict(row)]
+        return 404, {"message": "not found"}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                with stub._lock:
+                    status, payload = stub._handle(self.command, parts.path, parse_qs(parts.query), body)
+                if stub.reply_delay and self.command != "GET":
+                    time.sleep(stub.reply_delay)
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except OSError:
+                    pass  # The client gave up waiting (reply_delay)
+
+            do_GET = do_POST = do_PATCH = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
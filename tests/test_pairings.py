@@ -0,0 +1,106 @@
+"""Pairing matrices against the baseline Hero Pairings per-pair loop."""
+
+import numpy as np
+import pytest
+
+from components import pairings as p
+from components.scoring import HeroMatrix
+from data.default_heroes import default_heroes
+from data.preset_options import preset_options
+
+
+def _baseline_directional(a, b, stats, power, strong, weak):
+    """directional_synergy(hero_A, hero_B) from the original Hero Pairings page."""
+    base_a, base_b = stats[a][:p.BASE_STAT_COUNT], stats[b][:p.BASE_STAT_COUNT]
+    score = 0.0
+    needs = np.maximum(0, p.TARGET - base_a)
+    usable = np.minimum(np.maximum(0, base_b), needs)
+    if np.sum(needs) > 0:
+        score += np.dot(needs, usable) / np.sum(needs)
+    score += p.TEMPO_PAIR_BONUS * abs(base_a[p.TEMPO_INDEX] - base_b[p.TEMPO_INDEX])
+    if stats[a][p.LATE_GAME_INDEX] >= p.LATE_GAME_TRIGGER and base_b[p.THWART_INDEX] > p.TARGET:
+        score += p.LATE_GAME_THWART_BONUS * base_b[p.THWART_INDEX]
+    if base_a[p.SURVIVABILITY_INDEX] < p.TARGET:
+        score += p.BLOCKING_SUPPORT_BONUS * (
+            max(0, base_b[p.SURVIVABILITY_INDEX]) + max(0, stats[b][p.SUPPORT_INDEX])
+        )
+    if power[a] >= strong and power[b] >= strong:
+        score *= p.POWER_DISINCENTIVE
+    if power[a] <= weak and power[b] <= weak:
+        score *= p.WEAK_PAIR_DISINCENTIVE
+    return score
+
+
+def _baseline_classify(a_to_b, b_to_a):
+    if max(a_to_b, b_to_a) == 0:
+        return "neutral"
+    ratio = min(a_to_b, b_to_a) / max(a_to_b, b_to_a)
+    if ratio >= p.MIN_RECIPROCITY_RATIO:
+        return "mutual"
+    return "b_helps_a" if a_to_b > b_to_a else "a_helps_b"
+
+
+@pytest.fixture(scope="module", params=["General Power: 2 Player", "Solo (No Rush)"])
+def case(request):
+    stats = HeroMatrix(default_heroes).matrix
+    weights = np.array(preset_options[request.param], dtype=float)
+    return stats, weights, p.PairingMatrices(stats, weights)
+
+
+def test_matrices_match_the_baseline_per_pair_loop(case):
+    stats, weights, pairings = case
+    power = stats @ weights
+    gp_mean, gp_std = power.mean(), power.std()
+    strong, weak = gp_mean + 0.5 * gp_std, gp_mean - 0.5 * gp_std
+
+    for a in range(len(stats)):
+        for b in range(len(stats)):
+            if a == b:
+                continue
+            a_to_b = _baseline_directional(a, b, stats, power, strong, weak)
+            b_to_a = _baseline_directional(b, a, stats, power, strong, weak)
+            kind = _baseline_classify(a_to_b, b_to_a)
+            blended = p.PRIMARY_WEIGHT * a_to_b + p.SECONDARY_WEIGHT * b_to_a
+            if kind == "mutual":
+                blended *= 1 + p.S_TIER_RECIPROCITY_BOOST
+
+            assert pairings.directional[a, b] == pytest.approx(a_to_b, abs=1e-12)
+            assert pairings.types[a, b] == kind
+            assert pairings.blended[a, b] == pytest.approx(blended, abs=1e-12)
+
+
+def test_best_pairs_rank_unordered_pairs_by_mean_blended_score(case):
+    _, _, pairings = case
+    rows = [0, 3, 5, 8, 13]
+
+    best = pairings.best_pairs(rows, 4)
+
+    expected = sorted(
+        ((a, b, (pairings.blended[a, b] + pairings.blended[b, a]) / 2)
+         for i, a in enumerate(rows) for b in rows[i + 1:]),
+        key=lambda x: -x[2],
+    )[:4]
+    assert [(a, b) for a, b, _ in best] == [(a, b) for a, b, _ in expected]
+    assert [s for _, _, s in best] == pytest.approx([s for _, _, s in expected])
+    assert pairings.best_pairs(rows[:1], 4) == []
+
+
+def test_equal_power_counts_every_hero_as_weak_and_strong():
+    assert p.power_thresholds(np.full(5, 3.0)) == (3.0, 3.0)
+    stats = HeroMatrix(default_heroes).matrix
+    pairings = p.PairingMatrices(stats, np.zeros(stats.shape[1]))
+    unweighted = p.directional_synergy_matrix(stats, np.zeros(len(stats)), np.inf, -np.inf)
+
+    assert pairings.directional == pytest.approx(
+        unweighted * p.POWER_DISINCENTIVE * p.WEAK_PAIR_DISINCENTIVE
+    )
+
+
+def test_pairing_matrices_are_shared_and_read_only():
+    stats = HeroMatrix(default_heroes).matrix
+    weights = np.array(preset_options["General Power: 2 Player"], dtype=float)
+
+    pairings = p.get_pairing_matrices(stats, weights)
+
+    assert p.get_pairing_matrices(stats.copy(), weights.tolist()) is pairings
+    assert not pairings.blended.flags.writeable
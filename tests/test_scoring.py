@@ -0,0 +1,116 @@
+"""Shared hero-matrix scoring and tiering against the baseline per-page code."""
+
+import numpy as np
+import pytest
+
+from components.scoring import (
+    HERO_TIER_STD_BOUNDS, TIERS, TIERS_WORST_FIRST, HeroMatrix,
+    tier_indices, tier_labels, tier_lists, tier_thresholds,
+)
+from data.default_heroes import default_heroes
+from data.preset_options import preset_options
+
+
+def _baseline_hero_tiers(scores):
+    """The Hero Tier List's original if/elif tiering (std floored at 1e-6)."""
+    values = np.array(list(scores.values()), dtype=float)
+    mean, std = np.mean(values), max(np.std(values), 1e-6)
+    tiers = {}
+    for hero, score in scores.items():
+        if score >= mean + 1.5 * std:
+            tiers[hero] = "S"
+        elif score >= mean + 0.5 * std:
+            tiers[hero] = "A"
+        elif score >= mean - 0.5 * std:
+            tiers[hero] = "B"
+        elif score >= mean - 1.0 * std:
+            tiers[hero] = "C"
+        elif score >= mean - 1.5 * std:
+            tiers[hero] = "D"
+        else:
+            tiers[hero] = "F"
+    return tiers
+
+
+@pytest.mark.parametrize("preset", sorted(preset_options))
+def test_tier_lists_match_the_baseline_hero_tier_list(preset):
+    weights = np.array(preset_options[preset], dtype=float)
+    scores = {hero: float(np.dot(stats, weights)) for hero, stats in default_heroes.items()}
+
+    tiers = tier_lists(HeroMatrix(default_heroes).score_dict(weights), HERO_TIER_STD_BOUNDS)
+
+    assert {hero: tier for tier, members in tiers.items() for hero, _ in members} == _baseline_hero_tiers(scores)
+    for members in tiers.values():
+        assert members == sorted(members, key=lambda x: (-x[1], x[0]))
+
+
+def test_hero_matrix_scores_match_per_hero_dot_products():
+    matrix = HeroMatrix(default_heroes)
+    weights = np.array(preset_options[sorted(preset_options)[0]], dtype=float)
+    batch = matrix.scores(np.vstack([weights, np.ones_like(weights)]))
+
+    for hero, stats in default_heroes.items():
+        row = matrix.index[hero]
+        assert batch[0, row] == pytest.approx(np.dot(stats, weights))
+        assert batch[1, row] == pytest.approx(np.sum(stats))
+    assert not matrix.matrix.flags.writeable
+
+
+def test_tier_thresholds_are_mean_plus_bounds_times_std():
+    scores = np.array([1.0, 2.0, 3.0, 4.0, 10.0])
+    expected = scores.mean() + np.array(HERO_TIER_STD_BOUNDS) * scores.std()
+
+    assert tier_thresholds(scores) == pytest.approx(expected)
+    batch = tier_thresholds(np.vstack([scores, scores * 2]))
+    assert batch.shape == (2, len(HERO_TIER_STD_BOUNDS))
+    assert batch[1] == pytest.approx(expected * 2)
+
+
+def test_a_score_on_a_threshold_belongs_to_the_higher_tier():
+    # mean 0, std 1: -1.0 sits exactly on the C bound and 1.5 on the S bound
+    scores = np.array([-1.0, 1.5, -1.5, 1.0])
+    scores = (scores - scores.mean()) / scores.std()
+
+    labels = tier_labels(scores).tolist()
+    assert labels == [_baseline_hero_tiers(dict(enumerate(scores)))[i] for i in range(len(scores))]
+    assert [TIERS_WORST_FIRST[i] for i in tier_indices(scores)] == labels
+
+
+def test_tier_indices_tier_each_batch_row_on_its_own_thresholds():
+    weights = np.array([preset_options[p] for p in sorted(preset_options)], dtype=float)
+    batch = HeroMatrix(default_heroes).scores(weights)
+
+    indices = tier_indices(batch)
+
+    assert indices.shape == batch.shape
+    for row, scores in zip(indices, batch):
+        assert (row == tier_indices(scores)).all()
+
+
+def test_zero_variance_floored_std_puts_everyone_in_b():
+    scores = np.zeros(6)
+
+    assert tier_thresholds(scores) == pytest.approx(np.array(HERO_TIER_STD_BOUNDS) * 1e-6)
+    assert set(tier_labels(scores).tolist()) == {"B"}
+
+
+def test_zero_variance_unfloored_std_puts_everyone_in_s():
+    scores = np.full(6, 3.5)
+
+    assert tier_thresholds(scores, min_std=0.0) == pytest.approx(np.full(5, 3.5))
+    assert set(tier_labels(scores, min_std=0.0).tolist()) == {"S"}
+    assert [h for h, _ in tier_lists(dict(zip("abcdef", scores)), min_std=0.0)["S"]] == list("abcdef")
+
+
+def test_min_std_only_matters_below_the_floor():
+    scores = np.array([1.0, 2.0, 3.0, 4.0])
+
+    assert tier_thresholds(scores, min_std=0.0) == pytest.approx(tier_thresholds(scores))
+    assert tier_thresholds(scores, min_std=10.0) == pytest.approx(
+        scores.mean() + np.array(HERO_TIER_STD_BOUNDS) * 10.0
+    )
+
+
+def test_empty_scores():
+    assert tier_thresholds(np.array([])).shape == (len(HERO_TIER_STD_BOUNDS),)
+    assert tier_lists({}) == {t: [] for t in TIERS}
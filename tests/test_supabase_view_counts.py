@@ -0,0 +1,121 @@
+"""Buffered saved-list view counts against a local PostgREST stand-in."""
+
+import pytest
+
+from components import supabase_saved_lists as saved_lists
+from tests.postgrest_stub import RPC_PATH, TABLE_PATH, PostgrestStub
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(saved_lists, "HTTP_BACKOFF", 0)
+
+
+def _counter(stub, views):
+    counter = saved_lists._ViewCounter(interval=3600)  # Flushed by the test, not the thread
+    for slug, n in views.items():
+        for _ in range(n):
+            counter.add(slug, stub.cfg())
+    return counter
+
+
+def test_rpc_flushes_every_slug_in_one_request():
+    with PostgrestStub({"abc123": {"view_count": 5}, "def456": {"view_count": None}}) as stub:
+        counter = _counter(stub, {"abc123": 3, "def456": 1})
+
+        assert counter.flush() == 4
+
+        assert stub.view_count("abc123") == 8
+        assert stub.view_count("def456") == 1
+        assert stub.calls("POST", RPC_PATH) == 1
+        assert stub.calls("PATCH", TABLE_PATH) == 0
+        assert counter.pending() == {}
+
+
+def test_missing_rpc_falls_back_to_compare_and_set():
+    with PostgrestStub({"abc123": {"view_count": 5}, "def456": {"view_count": None}}, rpc=False) as stub:
+        counter = _counter(stub, {"abc123": 2, "def456": 1})
+
+        assert counter.flush() == 3
+
+        assert stub.view_count("abc123") == 7
+        assert stub.view_count("def456") == 1
+        assert stub.calls("PATCH", TABLE_PATH) == 2
+        assert counter.pending() == {}
+
+        # The RPC is not tried again once it is known to be missing
+        counter.add("abc123", stub.cfg())
+        assert counter.flush() == 1
+        assert stub.view_count("abc123") == 8
+        assert stub.calls("POST", RPC_PATH) == 1
+
+
+def test_compare_and_set_conflict_rereads_and_retries():
+    with PostgrestStub({"abc123": {"view_count": 5}}, rpc=False) as stub:
+        stub.conflicts["abc123"] = 2  # Another replica writes before each of our first two PATCHes
+        counter = _counter(stub, {"abc123": 3})
+
+        assert counter.flush() == 3
+
+        assert stub.view_count("abc123") == 5 + 2 + 3
+        assert stub.calls("PATCH", TABLE_PATH) == 3
+        assert counter.pending() == {}
+
+
+def test_compare_and_set_gives_up_and_requeues_after_repeated_conflicts():
+    with PostgrestStub({"abc123": {"view_count": 5}}, rpc=False) as stub:
+        stub.conflicts["abc123"] = saved_lists.VIEW_CAS_ATTEMPTS
+        counter = _counter(stub, {"abc123": 2})
+
+        assert counter.flush() == 0
+        assert counter.pending() == {"abc123": 2}
+
+        assert counter.flush() == 2
+        assert stub.view_count("abc123") == 5 + saved_lists.VIEW_CAS_ATTEMPTS + 2
+
+
+def test_failed_flush_requeues_counts():
+    with PostgrestStub({"abc123": {"view_count": 5}}) as stub:
+        stub.fail_status = 503
+        counter = _counter(stub, {"abc123": 2})
+
+        assert counter.flush() == 0
+        assert counter.pending() == {"abc123": 2}
+
+        stub.fail_status = None
+        counter.add("abc123", stub.cfg())
+        assert counter.flush() == 3
+        assert stub.view_count("abc123") == 8
+
+
+@pytest.mark.parametrize("rpc", [True, False])
+def test_write_applied_before_a_timeout_is_not_counted_twice(monkeypatch, rpc):
+    monkeypatch.setattr(saved_lists, "HTTP_TIMEOUT", 0.2)
+    with PostgrestStub({"abc123": {"view_count": 5}}, rpc=rpc) as stub:
+        counter = _counter(stub, {"abc123": 2})
+        if not rpc:
+            counter.flush()  # Learn that the RPC is missing
+            assert stub.view_count("abc123") == 7
+            counter.add("abc123", stub.cfg())
+            counter.add("abc123", stub.cfg())
+        before = stub.view_count("abc123")
+        stub.reply_delay = 0.5  # Applied, but answered after the client timed out
+
+        counter.flush()
+
+        stub.reply_delay = 0
+        assert stub.view_count("abc123") == before + 2
+        assert counter.pending() == {}
+        counter.flush()
+        assert stub.view_count("abc123") == before + 2
+
+
+def test_view_counter_flushes_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(saved_lists.atexit, "register", registered.append)
+    saved_lists._get_view_counter.clear()
+    try:
+        counter = saved_lists._get_view_counter()
+        assert registered == [counter.flush]
+    finally:
+        saved_lists._get_view_counter.clear()
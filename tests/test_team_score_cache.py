@@ -0,0 +1,115 @@
+"""Team-score distributions and tier sampling against the baseline Team Generator."""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from components.scoring import TIERS, HeroMatrix
+from components.team_score_cache import TeamScoreDistribution, get_team_score_distribution
+from components.team_scoring import get_preset_for_team_size
+from data.default_heroes import default_heroes
+
+ROSTER = {name: default_heroes[name] for name in list(default_heroes)[:14]}
+
+
+def _baseline_tier_teams(heroes, weighting, team_size, tier, locked):
+    """The original Team Generator: every team holding locked, filtered to tier."""
+    def score(team):
+        return float(np.dot(np.mean([heroes[hero] for hero in team], axis=0), weighting))
+
+    all_scores = [score(combo) for combo in combinations(heroes, team_size)]
+    mean, std = np.mean(all_scores), max(np.std(all_scores), 1e-6)
+    bounds = {
+        "S": (mean + 1.5 * std, np.inf),
+        "A": (mean + 0.5 * std, mean + 1.5 * std),
+        "B": (mean - 0.5 * std, mean + 0.5 * std),
+        "C": (mean - 1.0 * std, mean - 0.5 * std),
+        "D": (mean - 1.5 * std, mean - 1.0 * std),
+        "F": (-np.inf, mean - 1.5 * std),
+    }
+    lo, hi = bounds[tier]
+    available = [h for h in heroes if h not in locked]
+    teams = [list(locked) + list(combo) for combo in combinations(available, team_size - len(locked))]
+    return {frozenset(team) for team in teams if lo <= score(team) < hi}
+
+
+@pytest.fixture(scope="module")
+def distribution():
+    return TeamScoreDistribution(HeroMatrix(ROSTER), get_preset_for_team_size(3), 3, synergy=False)
+
+
+def _team_names(distribution, rows):
+    return frozenset(distribution.hero_matrix.names[i] for i in rows)
+
+
+def test_tier_bands_partition_the_sorted_population(distribution):
+    bands = [distribution.tier_band(tier) for tier in reversed(TIERS)]
+
+    assert bands[0][0] == 0 and bands[-1][1] == len(distribution)
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(bands, bands[1:]))
+    for tier, (start, stop) in zip(reversed(TIERS), bands):
+        assert {distribution.tier_of(s) for s in distribution.sorted_scores[start:stop]} <= {tier}
+
+
+@pytest.mark.parametrize("tier", TIERS)
+def test_tier_band_matches_the_baseline_filter(distribution, tier):
+    start, stop = distribution.tier_band(tier)
+
+    expected = _baseline_tier_teams(ROSTER, distribution.weighting, 3, tier, ())
+
+    assert stop - start == len(expected)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        team, count = distribution.sample_team(tier, rng=rng)
+        if not expected:
+            assert team is None and count == 0
+            break
+        assert count == len(expected)
+        assert _team_names(distribution, team) in expected
+
+
+@pytest.mark.parametrize("tier", TIERS)
+@pytest.mark.parametrize("locked", [("Thor",), ("Spider-Man (Peter)", "Hulk")])
+def test_locked_sample_matches_the_baseline_filter(distribution, tier, locked):
+    locked_idx = distribution.hero_matrix.rows(locked)
+
+    expected = _baseline_tier_teams(ROSTER, distribution.weighting, 3, tier, locked)
+
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        team, count = distribution.sample_team(tier, locked_idx, rng=rng)
+        assert count == len(expected)
+        if team is None:
+            assert not expected
+            break
+        names = _team_names(distribution, team)
+        assert set(locked) <= names and names in expected
+
+
+def test_rank_and_tier_of_a_team_in_the_population(distribution):
+    best, worst = distribution.sorted_scores[-1], distribution.sorted_scores[0]
+
+    assert distribution.rank(best) == (1, len(distribution), 100.0)
+    assert distribution.rank(worst)[0] == len(distribution)
+    assert distribution.tier_of(best) == "S"
+    assert distribution.tier_of(distribution.thresholds[-1]) == "S"  # On the threshold: higher tier
+    assert distribution.tier_of(np.nextafter(distribution.thresholds[-1], -np.inf)) == "A"
+
+
+def test_zero_weights_put_every_team_in_b():
+    distribution = TeamScoreDistribution(HeroMatrix(ROSTER), np.zeros(15), 2, synergy=False)
+
+    assert distribution.tier_band("B") == (0, len(distribution))
+    assert all(distribution.tier_band(tier)[0] == distribution.tier_band(tier)[1] for tier in "SACDF")
+    assert distribution.sample_team("S") == (None, 0)
+    assert distribution.rank(0.0) == (1, len(distribution), 100.0)
+
+
+def test_distributions_are_shared_per_fingerprint():
+    weighting = get_preset_for_team_size(2)
+    first = get_team_score_distribution(HeroMatrix(ROSTER), weighting, 2)
+
+    assert get_team_score_distribution(HeroMatrix(dict(ROSTER)), weighting.tolist(), 2) is first
+    assert get_team_score_distribution(HeroMatrix(ROSTER), weighting, 2, synergy=False) is not first
+    assert not first.sorted_scores.flags.writeable
@@ -0,0 +1,93 @@
+"""Vectorized team scoring against the baseline Team Builder itertools loop."""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from components.scoring import HeroMatrix
+from components.team_scoring import (
+    combination_indices, get_preset_for_team_size, rank_team, score_all_teams, score_teams, team_synergy,
+)
+from data.default_heroes import default_heroes
+
+ROSTER = {name: default_heroes[name] for name in list(default_heroes)[:14]}
+
+
+def _baseline_synergy(team, heroes, team_size):
+    """calculate_team_synergy from the original Team Builder page."""
+    if len(team) == 1:
+        return 0.0
+    stats = np.array([heroes[hero] for hero in team])
+    support_synergy = min((np.mean(stats[:, 9]) + np.mean(stats[:, 11])) / 100 * 0.12, 0.12)
+    reliability_synergy = (np.mean(stats[:, 6]) / 6.0) * 0.08
+    if team_size >= 3:
+        multiplayer_synergy = min(np.mean(stats[:, 14]) * 0.01, 0.12)
+    else:
+        multiplayer_synergy = 0.0
+    balance_synergy = min((np.std(stats[:, :8]) / 3.0) * 0.08, 0.08)
+    return min(support_synergy + reliability_synergy + multiplayer_synergy + balance_synergy, 0.40)
+
+
+def _baseline_score(team, heroes, weighting, synergy=True):
+    base = float(np.dot(np.mean([heroes[hero] for hero in team], axis=0), weighting))
+    if not synergy:
+        return base
+    return base * (1.0 + _baseline_synergy(list(team), heroes, len(team)))
+
+
+@pytest.mark.parametrize("n_heroes, team_size", [(1, 1), (5, 1), (6, 2), (7, 3), (9, 4), (4, 4)])
+def test_combination_indices_match_itertools(n_heroes, team_size):
+    combos = combination_indices(n_heroes, team_size)
+
+    assert combos.tolist() == [list(c) for c in combinations(range(n_heroes), team_size)]
+    assert not combos.flags.writeable
+
+
+@pytest.mark.parametrize("team_size", [1, 2, 3, 4])
+def test_team_synergy_matches_the_baseline(team_size):
+    hero_matrix = HeroMatrix(ROSTER)
+    combos = combination_indices(len(hero_matrix), team_size)
+
+    synergy = team_synergy(hero_matrix, combos, team_size)
+
+    expected = [
+        _baseline_synergy([hero_matrix.names[i] for i in combo], ROSTER, team_size) for combo in combos
+    ]
+    assert synergy == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("synergy", [True, False])
+@pytest.mark.parametrize("team_size", [1, 2, 3, 4])
+def test_all_team_scores_match_the_baseline(team_size, synergy):
+    hero_matrix = HeroMatrix(ROSTER)
+    weighting = get_preset_for_team_size(team_size)
+
+    scores = score_all_teams(hero_matrix, weighting, team_size, synergy=synergy)
+
+    expected = [
+        _baseline_score(combo, ROSTER, weighting, synergy) for combo in combinations(hero_matrix.names, team_size)
+    ]
+    assert scores == pytest.approx(expected, rel=1e-9)
+
+
+def test_score_teams_splits_base_and_synergy():
+    hero_matrix = HeroMatrix(ROSTER)
+    weighting = get_preset_for_team_size(3)
+    team = list(hero_matrix.names[:3])
+
+    base, multipliers, final = score_teams(hero_matrix, [hero_matrix.rows(team)], weighting, 3)
+
+    assert base[0] == pytest.approx(_baseline_score(team, ROSTER, weighting, synergy=False))
+    assert multipliers[0] == pytest.approx(_baseline_synergy(team, ROSTER, 3))
+    assert final[0] == pytest.approx(_baseline_score(team, ROSTER, weighting))
+
+
+def test_rank_team_counts_strictly_higher_scores():
+    sorted_scores = np.array([1.0, 2.0, 2.0, 3.0, 5.0])
+
+    assert rank_team(sorted_scores, 2.0) == (3, 5, 60.0)  # Ties share the better rank
+    assert rank_team(sorted_scores, 5.0) == (1, 5, 100.0)
+    assert rank_team(sorted_scores, 9.0) == (1, 5, 100.0)
+    assert rank_team(sorted_scores, 0.0) == (6, 5, 0.0)  # Baseline: every team scores higher
+    assert rank_team(np.array([]), 1.0) == (1, 1, 100.0)
@@ -0,0 +1,94 @@
+"""Villain matchups against the baseline Villain Tier List per-villain loop."""
+
+import numpy as np
+import pytest
+
+from components.villain_matchups import get_villain_matchups
+from data.default_heroes import default_heroes
+from data.villain_weights import villain_weights
+
+
+def _baseline_tiers(heroes, weights):
+    """Score and tier every hero as the original Villain Tier List page did."""
+    scores = {name: float(np.dot(stats, weights)) for name, stats in heroes.items()}
+    all_scores = np.array(list(scores.values()), dtype=float)
+    mean, std = all_scores.mean(), all_scores.std()
+    thr_s, thr_a, thr_b, thr_c = mean + 1.5 * std, mean + 0.5 * std, mean - 0.5 * std, mean - 1.5 * std
+    tiers = {"S": [], "A": [], "B": [], "C": [], "D": [], "F": []}
+    for hero, sc in scores.items():
+        if sc >= thr_s:
+            tiers["S"].append((hero, sc))
+        elif sc >= thr_a:
+            tiers["A"].append((hero, sc))
+        elif sc >= thr_b:
+            tiers["B"].append((hero, sc))
+        elif sc >= thr_c:
+            tiers["C"].append((hero, sc))
+        elif sc >= thr_c - 0.5 * std:
+            tiers["D"].append((hero, sc))
+        else:
+            tiers["F"].append((hero, sc))
+    for tier in tiers:
+        tiers[tier].sort(key=lambda x: (-x[1], x[0]))
+    return tiers
+
+
+def _names(tiers):
+    return {tier: [hero for hero, _ in members] for tier, members in tiers.items()}
+
+
+@pytest.fixture(scope="module")
+def matchups():
+    return get_villain_matchups(default_heroes)
+
+
+def test_every_villain_matches_the_baseline_tier_list(matchups):
+    for villain, weights in villain_weights.items():
+        expected = _baseline_tiers(default_heroes, np.array(weights, dtype=float))
+
+        tiers = matchups.tier_lists(villain)
+
+        assert _names(tiers) == _names(expected), villain
+        for tier in tiers:
+            assert [s for _, s in tiers[tier]] == pytest.approx([s for _, s in expected[tier]])
+
+
+def test_a_hero_subset_is_tiered_on_its_own(matchups):
+    villain = next(iter(villain_weights))
+    subset = list(default_heroes)[:12]
+
+    tiers = matchups.tier_lists(villain, subset)
+
+    expected = _baseline_tiers({h: default_heroes[h] for h in subset}, np.array(villain_weights[villain]))
+    assert _names(tiers) == _names(expected)
+
+
+def test_zero_weights_put_the_whole_roster_in_s():
+    villain = next(iter(villain_weights))
+
+    matchups = get_villain_matchups(default_heroes, {villain: [0.0] * 15})
+
+    assert len(matchups.tier_lists(villain)["S"]) == len(default_heroes)
+    assert _names(matchups.tier_lists(villain)) == _names(_baseline_tiers(default_heroes, np.zeros(15)))
+
+
+def test_best_villains_for_a_hero_are_ordered_by_zscore(matchups):
+    hero = next(iter(default_heroes))
+
+    ranked = matchups.best_villains_for(hero)
+
+    assert len(ranked) == len(villain_weights)
+    assert [z for _, z, _ in ranked] == sorted((z for _, z, _ in ranked), reverse=True)
+    for villain, _, tier in ranked[:5]:
+        assert hero in [h for h, _ in matchups.tier_lists(villain)[tier]]
+
+
+def test_overrides_rebuild_and_identical_inputs_share(matchups):
+    villain = next(iter(villain_weights))
+    override = {villain: [1.0] * 15}
+
+    assert get_villain_matchups(dict(default_heroes)) is matchups
+    overridden = get_villain_matchups(default_heroes, override)
+    assert overridden is not matchups
+    assert get_villain_matchups(default_heroes, override) is overridden
+    assert not overridden.scores.flags.writeable